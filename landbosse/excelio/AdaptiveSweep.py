@@ -0,0 +1,330 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from ..model import CostRecords, DetailRecords, CraneSelectionRecords
+from .XlsxReader import XlsxReader
+
+
+class AdaptiveSweep:
+    """
+    This class runs a sweep of one project over a few parametric values,
+    such as hub height and turbine rating, with more runs where the costs
+    change than where they are flat.
+
+    The sweep starts with a coarse grid of initial_points values on each
+    axis. The cells between neighboring points of the grid are then
+    halved along each axis on which the total BOS cost at the ends of an
+    edge of the cell differs by more than the tolerance or the cranes
+    chosen by ErectionCost differ, by running the new points this makes.
+    Axes along which nothing changes are not halved, so runs are not
+    spent on them. Cells with the largest change are subdivided first,
+    until no cell needs it, the cells are max_depth halvings smaller than
+    the coarse grid, or the next subdivision would take more runs than
+    run_budget.
+
+    The runs of each round of subdivision are made at once with a manager
+    runner, so they run in parallel with an XlsxParallelManagerRunner. It
+    is used in the following manner:
+
+    sweep = AdaptiveSweep(
+        manager_runner=XlsxParallelManagerRunner(file_ops),
+        project_id='ge15_public',
+        axes={'project list/x/Hub height m': (80, 120), 'project list/x/Turbine rating MW': (1.5, 3.0)},
+        run_budget=200
+    )
+    final_result = sweep.run()
+
+    The axes are cell specifications, as in the Parametric list sheet, with
+    their minimum and maximum values. The Parametric list sheet itself is
+    not used.
+    """
+
+    def __init__(self, manager_runner, project_id, axes, initial_points=3, tolerance=0.01, run_budget=100,
+                 max_depth=6, project_parameters=None, enable_cost_and_scaling_modifications=False):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner of the projects. It must not have a result sink,
+            because the sweep needs the costs of every run.
+
+        project_id : str
+            The Project ID of the project to sweep, in the project list.
+
+        axes : dict
+            The (minimum, maximum) values of each cell specification.
+
+        initial_points : int
+            The number of values of each axis in the coarse grid.
+
+        tolerance : float
+            The difference of the total BOS cost at the ends of an edge of a
+            cell, as a fraction of their mean, above which the cell is
+            halved along that edge.
+
+        run_budget : int
+            The maximum number of runs, including the coarse grid.
+
+        max_depth : int
+            The maximum number of times a cell of the coarse grid is halved.
+
+        project_parameters : pandas.Series
+            The row of the project list of the project. If None, it is read
+            from the project list xlsx.
+
+        enable_cost_and_scaling_modifications : bool
+            Passed to the runner. See run_from_project_list_xlsx().
+
+        Raises
+        ------
+        ValueError
+            If the runner has a result sink, or if the run budget is smaller
+            than the coarse grid.
+        """
+        if manager_runner.result_sink is not None:
+            raise ValueError('AdaptiveSweep needs the costs of each run. Use a runner without a result sink.')
+        if initial_points < 2:
+            raise ValueError('initial_points must be at least 2.')
+        if initial_points ** len(axes) > run_budget:
+            raise ValueError(f'The run budget of {run_budget} is smaller than the {initial_points ** len(axes)} runs of the coarse grid.')
+
+        self.manager_runner = manager_runner
+        self.project_id = project_id
+        self.cell_specifications = list(axes)
+        self.axes = axes
+        self.initial_points = initial_points
+        self.tolerance = tolerance
+        self.run_budget = run_budget
+        self.max_depth = max_depth
+        self.project_parameters = project_parameters
+        self.enable_cost_and_scaling_modifications = enable_cost_and_scaling_modifications
+
+        # Points are indices on a lattice that is max_depth halvings finer
+        # than the coarse grid, so that midpoints are exact.
+        self.lattice_intervals = (initial_points - 1) * 2 ** max_depth
+
+    def run(self):
+        """
+        Runs the sweep.
+
+        Returns
+        -------
+        dict
+            The final result of all the runs, with the keys of the final
+            result of the runner. Under the additional key 'points' is a
+            dataframe with a row for each run, in the order of the runs,
+            with the columns 'Project ID with serial', one for each axis,
+            'Total BOS cost USD', 'Crane choice' and 'Iteration', which is 0
+            for the coarse grid and counts the rounds of subdivision.
+        """
+        project_parameters = self.project_parameters
+        if project_parameters is None:
+            project_list, _ = self.manager_runner.read_project_and_parametric_sheets()
+            project_parameters = project_list[project_list['Project ID'] == self.project_id].iloc[0]
+
+        self._points = dict()
+        self._results = {key: [] for key in ['details_list', 'module_type_operation_list', 'crane_selection_list',
+                                             'extended_project_list', 'points']}
+        self._lcoe = None
+
+        step = 2 ** self.max_depth
+        coarse = range(0, self.lattice_intervals + 1, step)
+        self._run_points(project_parameters, list(itertools.product(coarse, repeat=len(self.axes))), iteration=0)
+        cells = [tuple((low, low + step) for low in corner)
+                 for corner in itertools.product(coarse[:-1], repeat=len(self.axes))]
+
+        iteration = 0
+        while True:
+            iteration += 1
+            candidates = [(self._change(cell), cell, self._split_axes(cell)) for cell in cells]
+            candidates = sorted((candidate for candidate in candidates if any(candidate[2])),
+                                key=lambda candidate: candidate[0], reverse=True)
+            new_points = dict()
+            refined = dict()
+            for _, cell, split_axes in candidates:
+                cell_points = [point for point in self._cell_points(cell, split_axes)
+                               if point not in self._points and point not in new_points]
+                if len(self._points) + len(new_points) + len(cell_points) > self.run_budget:
+                    continue
+                new_points.update(dict.fromkeys(cell_points))
+                refined[cell] = split_axes
+
+            if len(refined) == 0:
+                break
+
+            self._run_points(project_parameters, list(new_points), iteration)
+            cells = [child for cell in cells
+                     for child in (self._children(cell, refined[cell]) if cell in refined else [cell])]
+
+        final_result = {
+            'details_list': DetailRecords.concatenate(self._results['details_list']),
+            'module_type_operation_list': CostRecords.concatenate(self._results['module_type_operation_list']),
+            'crane_selection_list': CraneSelectionRecords.concatenate(self._results['crane_selection_list']),
+            'extended_project_list': pd.concat(self._results['extended_project_list']),
+            'points': pd.concat(self._results['points'], ignore_index=True),
+        }
+        if self._lcoe is not None:
+            final_result['lcoe'] = self._lcoe
+        return final_result
+
+    def _run_points(self, project_parameters, points, iteration):
+        """
+        Runs the project at lattice points and records the total BOS cost
+        and crane choice of each point.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The row of the project list of the project.
+
+        points : list
+            The lattice points, as tuples of indices.
+
+        iteration : int
+            The round of subdivision.
+        """
+        xlsx_reader = XlsxReader()
+        first_index = len(self._points)
+        serials = [xlsx_reader.create_serial_number(self.project_id, first_index + i, self.run_budget)
+                   for i in range(len(points))]
+
+        extended_project_list = pd.DataFrame([project_parameters] * len(points)).reset_index(drop=True)
+        values = self._values(points)
+        for column, cell_specification in enumerate(self.cell_specifications):
+            extended_project_list[cell_specification] = values[:, column]
+        extended_project_list['Project ID with serial'] = serials
+        extended_project_list.index = pd.RangeIndex(first_index, first_index + len(points))
+
+        result = self.manager_runner.run_extended_project_list([extended_project_list],
+                                                               self.enable_cost_and_scaling_modifications)
+        for key in ['details_list', 'module_type_operation_list', 'crane_selection_list', 'extended_project_list']:
+            self._results[key].append(result[key])
+        if 'lcoe' in result:
+            self._lcoe = result['lcoe']
+
+        total_costs = _total_costs(result['module_type_operation_list'])
+        crane_choices = _crane_choices(result['crane_selection_list'])
+        points_df = pd.DataFrame(values, columns=self.cell_specifications)
+        points_df.insert(0, 'Project ID with serial', serials)
+        points_df['Total BOS cost USD'] = [total_costs.get(serial, np.nan) for serial in serials]
+        points_df['Crane choice'] = [crane_choices.get(serial, '') for serial in serials]
+        points_df['Iteration'] = iteration
+        self._results['points'].append(points_df)
+
+        for point, total_cost, crane_choice in zip(points, points_df['Total BOS cost USD'], points_df['Crane choice']):
+            self._points[point] = (total_cost, crane_choice)
+
+    def _values(self, points):
+        """
+        Converts lattice points to the values of the axes.
+
+        Parameters
+        ----------
+        points : list
+            The lattice points, as tuples of indices.
+
+        Returns
+        -------
+        np.ndarray
+            One row for each point and one column for each axis.
+        """
+        fractions = np.array(points, dtype=float).reshape(len(points), len(self.axes)) / self.lattice_intervals
+        low = np.array([self.axes[cell_specification][0] for cell_specification in self.cell_specifications], dtype=float)
+        high = np.array([self.axes[cell_specification][1] for cell_specification in self.cell_specifications], dtype=float)
+        return low + fractions * (high - low)
+
+    def _change(self, cell):
+        """
+        Returns the range of the total BOS costs at the corners of a cell
+        as a fraction of their mean.
+        """
+        total_costs = np.array([self._points[corner][0] for corner in itertools.product(*cell)])
+        mean = np.abs(total_costs).mean()
+        return 0.0 if mean == 0 else (total_costs.max() - total_costs.min()) / mean
+
+    def _split_axes(self, cell):
+        """
+        Decides along which axes a cell is halved: those that can still be
+        halved and along which the total BOS cost or the crane choice
+        changes between the ends of an edge of the cell.
+
+        Returns
+        -------
+        list
+            True for each axis along which the cell is halved.
+        """
+        split_axes = []
+        for axis, (low, high) in enumerate(cell):
+            split = False
+            if high - low >= 2:
+                other_sides = [side for other_axis, side in enumerate(cell) if other_axis != axis]
+                for corner in itertools.product(*other_sides):
+                    start = self._points[corner[:axis] + (low,) + corner[axis:]]
+                    end = self._points[corner[:axis] + (high,) + corner[axis:]]
+                    mean = (abs(start[0]) + abs(end[0])) / 2
+                    change = 0.0 if mean == 0 else abs(end[0] - start[0]) / mean
+                    if start[1] != end[1] or change > self.tolerance:
+                        split = True
+                        break
+            split_axes.append(split)
+        return split_axes
+
+    def _cell_points(self, cell, split_axes):
+        """
+        Returns the lattice points of a cell halved along the split axes.
+        """
+        return list(itertools.product(*[(low, (low + high) // 2, high) if split else (low, high)
+                                        for (low, high), split in zip(cell, split_axes)]))
+
+    def _children(self, cell, split_axes):
+        """
+        Returns the cells of a cell halved along the split axes.
+        """
+        halves = [((low, (low + high) // 2), ((low + high) // 2, high)) if split else ((low, high),)
+                  for (low, high), split in zip(cell, split_axes)]
+        return list(itertools.product(*halves))
+
+
+def _total_costs(costs):
+    """
+    Sums the costs of each project.
+
+    Parameters
+    ----------
+    costs : CostRecords
+        The costs of the projects.
+
+    Returns
+    -------
+    dict
+        The total cost of each project, keyed by project name.
+    """
+    codes, projects = pd.factorize(np.asarray(costs['project_id_with_serial'], dtype=object))
+    totals = np.bincount(codes, weights=np.asarray(costs['cost_per_project'], dtype=float), minlength=len(projects))
+    return dict(zip(projects, totals))
+
+
+def _crane_choices(crane_selection):
+    """
+    Describes the cranes chosen for each project as text, such as
+    'Offload: LR1500 SL3F; Top: LR1500 SL3F', so that crane choices can be
+    compared.
+
+    Parameters
+    ----------
+    crane_selection : CraneSelectionRecords
+        The crane selection of the projects.
+
+    Returns
+    -------
+    dict
+        The crane choice of each project, keyed by project name.
+    """
+    choices = dict()
+    for row in crane_selection.iter_rows():
+        choices.setdefault(row['project_id_with_serial'], []).append(
+            f"{row['operation']}: {row['crane_name']} {row['boom_system']}"
+        )
+    return {project: '; '.join(sorted(choice)) for project, choice in choices.items()}
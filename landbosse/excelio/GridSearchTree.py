@@ -2,27 +2,24 @@ import numpy as np
 import pandas as pd
 
 """
-This module contains the logic to handle a tree to compute
-points in an N-dimensional parametric search space.
+This module contains the logic to compute points in an N-dimensional
+parametric search space.
 """
 
-class GridSearchTreeNode:
-    """
-    This just contains information about a node in the grid
-    search tree.
-    """
-
-    def __init__(self):
-        self.cell_specification = None
-        self.children = []
-        self.value = None
-
 
 class GridSearchTree:
     """
-    This class implements a k-ary tree to compute possible
-    combinations of points in a N-dimensional parametric
-    search space.
+    This class computes the combinations of points in a N-dimensional
+    parametric search space. Each row of the parametric list is one axis
+    of the grid, and the grid is the Cartesian product of the values of
+    the axes.
+
+    The points are in the order of a depth first traversal of a k-ary tree
+    with one level per axis: the last axis changes fastest. Rather than
+    building that tree, the points are calculated directly from their
+    position in the grid, either all at once with grid_dataframe() or in
+    chunks with iter_grid_chunks(), so that grids
+    too large to hold in memory can still be enumerated.
     """
 
     def __init__(self, parametric_list):
@@ -36,127 +33,169 @@ class GridSearchTree:
             The dataframe of the parametrics list.
         """
         self.parametric_list = parametric_list
+        self._axes = None
 
-    def build_grid_tree_and_return_grid(self):
+    def axes(self):
         """
-        See the dataframes in XlsxReader.create_parametric_value_list()
-        for context.
-
-        This builds a tree of points in the search space and traverse
-        it to find points on the grid.
+        Makes the cell specification and the values of each row of the
+        parametric list. The values are either the 'Value list' or the
+        range from 'Min' to 'Max' (inclusive) by 'Step'.
 
         Returns
         -------
+        list
+            (cell_specification, values) tuples, one for each row of the
+            parametric list. values is a 1-D array.
         """
+        if self._axes is None:
+            self._axes = []
+            for _, row in self.parametric_list.iterrows():
+                cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+                if 'Value list' in row and not pd.isnull(row['Value list']):
+                    values = np.array([float(value) for value in row['Value list'].split(',')])
+                else:
+                    # Putting the stop at end + step ensures the end value
+                    # is in the sequence
+                    start = row['Min']
+                    end = row['Max']
+                    step = row['Step']
+                    values = np.arange(start, end + step, step)
+                self._axes.append((cell_specification, values))
+        return self._axes
+
+    def cell_specifications(self):
+        """
+        Returns
+        -------
+        list
+            The cell specification of each axis, which are the columns of
+            the grid.
+        """
+        return [cell_specification for cell_specification, _ in self.axes()]
 
-        # Build the tree. Its leaf nodes contain the values for each
-        # point in the grid.
-        root = self.build_tree()
-
-        # Recursions of the traversal method needs to start with an empty
-        # list.
-        grid = self.dfs_search_tree(root, traversal=[])
-        return grid
-
-    def build_tree(self, depth=0, root=None):
+    def grid_size(self):
         """
-        This method builds a k-ary tree to contain cell_specifications and
-        their values.
+        Returns
+        -------
+        int
+            The number of points in the grid.
+        """
+        return int(np.prod([len(values) for _, values in self.axes()], dtype=np.int64))
 
-        Callers from outside this method shouldn't override the defaults
-        for the parameters. These parameters are to manage the recursion,
-        and are supplied by this method when it invokes itself.
+    def grid_columns(self, start=0, stop=None):
+        """
+        Calculates points of the grid from their positions. The position
+        of a point is unravelled into the index of the value of each axis,
+        so no other points need to be calculated.
 
         Parameters
         ----------
-        root : GridSearchTreeNode
-            The root of the subtree. At the start of iteration, at the
-            root of the whole tree, this should be None.
+        start : int
+            The position of the first point.
 
-        depth : int
-            The level of the tree currently being built. This is
-            also the row number in the dataframe from which the tree
-            is being built.
+        stop : int
+            The position after the last point. If None, the end of the
+            grid.
 
         Returns
         -------
-        GridSearchTreeNode
-            The root of the tree just built.
+        list
+            One 1-D array for each axis, with the value of the axis at
+            each point.
+        """
+        axes = self.axes()
+        grid_size = self.grid_size()
+        stop = grid_size if stop is None else min(stop, grid_size)
+        positions = np.arange(start, max(start, stop), dtype=np.int64)
+        shape = [len(values) for _, values in axes]
+        indices = np.unravel_index(positions, shape) if len(positions) > 0 else [positions] * len(axes)
+        return [values[index] for (_, values), index in zip(axes, indices)]
+
+    def grid_array(self, start=0, stop=None):
         """
-        row = self.parametric_list.iloc[depth]
-        cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+        Same as grid_columns(), but as a 2-D array.
 
-        # First, make an iterable of the range we are going to be using.
-        if 'Value list' in row and not pd.isnull(row['Value list']):
-            values = [float(value) for value in row['Value list'].split(',')]
-        else:
-            start = row['Min']
-            end = row['Max']
-            step = row['Step']
-            values = np.arange(start, end + step, step)
+        Parameters
+        ----------
+        start : int
+            The position of the first point.
 
-        if root == None:
-            root = GridSearchTreeNode()
+        stop : int
+            The position after the last point. If None, the end of the
+            grid.
 
-        # Putting the stop at end + step ensures the end value is in the sequence
-        #
-        # Append children for each value in the parametric step sequence.
+        Returns
+        -------
+        np.ndarray
+            A 2-D array with one row for each point and one column for
+            each axis.
+        """
+        columns = self.grid_columns(start, stop)
+        if len(columns) == 0:
+            return np.empty((0, 0))
+        return np.column_stack(columns)
 
-        for value in values:
-            child = GridSearchTreeNode()
-            child.value = value
-            child.cell_specification = cell_specification
-            root.children.append(child)
+    def grid_dataframe(self, start=0, stop=None):
+        """
+        Same as grid_array(), but as a dataframe whose columns are the
+        cell specifications.
 
-            # If there are more levels of variables to add, recurse
-            # down 1 level.
-            if len(self.parametric_list) > depth + 1:
-                self.build_tree(depth + 1, child)
+        Parameters
+        ----------
+        start : int
+            The position of the first point.
 
-        return root
+        stop : int
+            The position after the last point. If None, the end of the
+            grid.
 
-    def dfs_search_tree(self, root, traversal, path=None):
+        Returns
+        -------
+        pd.DataFrame
+            One row for each point and one column for each axis.
         """
-        This does a depth first search traversal of the GridSearchTree
-        specified by the root parameter. It stores the node it encounters
-        in the list referenced by traversal.
+        columns = self.grid_columns(start, stop)
+        return pd.DataFrame(dict(zip(self.cell_specifications(), columns)))
 
-        There is a distinction from normal DFS traversals: Only leaf nodes
-        are recorded in the traversal. This means that only nodes that have
-        a complete list of cell specifications and values are returned.
+    def iter_grid_chunks(self, chunk_size=100000):
+        """
+        Yields the grid in chunks of points, in order. Only one chunk is
+        in memory at a time.
 
         Parameters
         ----------
-        root : GridSearchTreeNode
-            The root of the
+        chunk_size : int
+            The maximum number of points in each chunk.
 
-        traversal : list
-            The nodes traversed on the tree. When this method is called
-            by an external caller, this should be an empty list ([])
+        Yields
+        ------
+        pd.DataFrame
+            The points of one chunk, as returned by grid_dataframe().
+        """
+        grid_size = self.grid_size()
+        for start in range(0, grid_size, chunk_size):
+            yield self.grid_dataframe(start, start + chunk_size)
+
+    def build_grid_tree_and_return_grid(self):
+        """
+        See the dataframes in XlsxReader.create_parametric_value_list()
+        for context.
 
-        path : list
-            This shouldn't be manipulated except by this method itself.
-            It is for storing the paths to the leaf nodes.
+        This returns the points of the grid in the format of the k-ary
+        tree traversal this class used to make. New code should use
+        grid_dataframe() or iter_grid_chunks() instead.
 
         Returns
         -------
         list
-            A list of dictionaries that hold the cell specifications and
-            values of each leaf node.
+            A list with one element for each point. Each element is a list
+            of dictionaries that hold the cell specification and value of
+            each axis.
         """
-
-        path = [] if path is None else path[:]
-
-        if root.cell_specification is not None:
-            path.append({
-                'cell_specification': root.cell_specification,
-                'value': root.value,
-            })
-
-        if len(root.children) == 0:
-            traversal.append(path)
-
-        for child in root.children:
-            self.dfs_search_tree(child, traversal, path)
-
-        return traversal
+        cell_specifications = self.cell_specifications()
+        columns = self.grid_columns()
+        return [
+            [{'cell_specification': cell_specification, 'value': column[position]}
+             for cell_specification, column in zip(cell_specifications, columns)]
+            for position in range(self.grid_size())
+        ]
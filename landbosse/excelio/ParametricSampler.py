@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .GridSearchTree import GridSearchTree
+from .XlsxOperationException import XlsxOperationException
+
+"""
+This module contains the logic to sample points in an N-dimensional
+parametric search space, instead of computing every point of a grid.
+"""
+
+
+class ParametricSampler(GridSearchTree):
+    """
+    This class samples points in a N-dimensional parametric search space.
+    It is used in place of GridSearchTree for projects whose rows of the
+    parametric list have a 'Sampling' method, so that the number of runs
+    is the number of samples rather than the product of the number of
+    values of every axis.
+
+    The rows of the parametric list of a project have the following
+    columns, in addition to those of GridSearchTree:
+
+    'Sampling': 'latin hypercube', 'sobol' or 'random'
+
+    'Samples': The number of points to sample.
+
+    'Seed': The seed of the random number generator, so that the same
+        points are sampled every time. If it is missing, different points
+        are sampled every time.
+
+    The method, number of samples and seed are those of the first row of
+    the project that has them. Axes with a 'Value list' are sampled from
+    its values, each equally likely. Other axes are sampled uniformly
+    from 'Min' to 'Max'; 'Step' is not used.
+
+    The points are the same as for GridSearchTree: one column for each
+    cell specification, made with grid_dataframe() or iter_grid_chunks().
+    """
+
+    sampling_methods = ('latin hypercube', 'sobol', 'random')
+
+    def __init__(self, parametric_list):
+        """
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The dataframe of the parametrics list of one project.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the sampling method is unknown or the number of samples is
+            not a positive integer.
+        """
+        super().__init__(parametric_list)
+        self.sampling = str(_first_value(parametric_list, 'Sampling')).strip().lower()
+        samples = _first_value(parametric_list, 'Samples')
+        seed = _first_value(parametric_list, 'Seed')
+
+        if self.sampling not in self.sampling_methods:
+            raise XlsxOperationException(
+                f'Sampling {self.sampling} is not one of {", ".join(self.sampling_methods)}. Please check the parametric list.')
+        if pd.isnull(samples) or float(samples) < 1 or float(samples) != int(float(samples)):
+            raise XlsxOperationException(
+                f'Samples must be a positive integer for {self.sampling} sampling. Please check the parametric list.')
+
+        self.samples = int(float(samples))
+        self.seed = None if pd.isnull(seed) else int(seed)
+        self._unit_samples = None
+
+    def axes(self):
+        """
+        Makes the cell specification and the values or range of each row
+        of the parametric list.
+
+        Returns
+        -------
+        list
+            (cell_specification, values) tuples, one for each row of the
+            parametric list. values is a 1-D array of the values of the
+            'Value list', or the array [Min, Max] if the row has no value
+            list.
+        """
+        if self._axes is None:
+            self._axes = []
+            self._value_list_axes = []
+            for _, row in self.parametric_list.iterrows():
+                cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+                if 'Value list' in row and not pd.isnull(row['Value list']):
+                    values = np.array([float(value) for value in row['Value list'].split(',')])
+                    self._value_list_axes.append(True)
+                else:
+                    values = np.array([row['Min'], row['Max']], dtype=float)
+                    self._value_list_axes.append(False)
+                self._axes.append((cell_specification, values))
+        return self._axes
+
+    def grid_size(self):
+        """
+        Returns
+        -------
+        int
+            The number of samples.
+        """
+        return self.samples
+
+    def unit_samples(self):
+        """
+        Samples the unit hypercube once and keeps the samples, so that all
+        the chunks of the points come from the same samples.
+
+        Returns
+        -------
+        np.ndarray
+            A 2-D array with one row for each sample and one column for
+            each axis, with values from 0 to 1.
+        """
+        if self._unit_samples is None:
+            dimensions = len(self.axes())
+            if self.sampling == 'latin hypercube':
+                self._unit_samples = qmc.LatinHypercube(d=dimensions, seed=self.seed).random(self.samples)
+            elif self.sampling == 'sobol':
+                self._unit_samples = qmc.Sobol(d=dimensions, seed=self.seed).random(self.samples)
+            else:
+                self._unit_samples = np.random.default_rng(self.seed).random((self.samples, dimensions))
+        return self._unit_samples
+
+    def grid_columns(self, start=0, stop=None):
+        """
+        Scales samples to the values of the axes.
+
+        Parameters
+        ----------
+        start : int
+            The first sample.
+
+        stop : int
+            The sample after the last sample. If None, the last sample.
+
+        Returns
+        -------
+        list
+            One 1-D array for each axis, with the value of the axis at
+            each sample.
+        """
+        axes = self.axes()
+        unit_samples = self.unit_samples()[start:stop]
+        columns = []
+        for (_, values), is_value_list, unit in zip(axes, self._value_list_axes, unit_samples.T):
+            if is_value_list:
+                indices = np.minimum((unit * len(values)).astype(int), len(values) - 1)
+                columns.append(values[indices])
+            else:
+                low, high = values
+                columns.append(low + unit * (high - low))
+        return columns
+
+
+def _first_value(parametric_list, column):
+    """
+    Returns the first value of a column of the parametric list that is not
+    missing, or None.
+    """
+    if column not in parametric_list.columns:
+        return None
+    values = parametric_list[column].dropna()
+    return values.iloc[0] if len(values) > 0 else None
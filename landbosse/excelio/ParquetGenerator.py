@@ -0,0 +1,211 @@
+import os
+import shutil
+
+import pandas as pd
+
+from .CsvGenerator import CsvGenerator
+
+
+class ParquetGenerator:
+    """
+    This class writes the costs, details and extended project list as
+    typed Parquet files.
+
+    The costs and details are written as datasets (directories of Parquet
+    files) partitioned by 'Project ID' and 'Module', in the Hive layout of
+    'Project ID=.../Module=.../*.parquet'. Readers such as
+    pd.read_parquet(path, filters=[('Project ID', '=', 'ge15_dist_01')])
+    only read the files of the partitions they select.
+
+    The extended project list is written as a single file. It joins to the
+    costs and details on 'Project ID with serial', which is filled with
+    the Project ID for projects without parametric modifications.
+
+    This needs pyarrow, which is imported only when an instance is made.
+    """
+
+    def __init__(self, file_ops):
+        """
+        Parameters
+        ----------
+        file_ops : XlsxFileOperations
+            An instance of XlsxFileOperations to manage file names.
+        """
+        self.file_ops = file_ops
+        self.pa, self.pq = import_pyarrow()
+        self._csv_generator = CsvGenerator(file_ops)
+
+    def costs_schema(self):
+        """
+        Returns
+        -------
+        pyarrow.Schema
+            The schema of the costs. The columns are the same as in
+            landbosse-costs.csv.
+        """
+        pa = self.pa
+        return pa.schema([
+            ('Project ID with serial', pa.string()),
+            ('Number of turbines', pa.int64()),
+            ('Turbine rating MW', pa.float64()),
+            ('Rotor diameter m', pa.float64()),
+            ('Module', pa.string()),
+            ('Type of cost', pa.string()),
+            ('Cost per turbine', pa.float64()),
+            ('Cost per project', pa.float64()),
+            ('Cost per kW', pa.float64()),
+        ])
+
+    def details_schema(self):
+        """
+        Returns
+        -------
+        pyarrow.Schema
+            The schema of the details. The columns are the same as in
+            landbosse-details.csv.
+        """
+        pa = self.pa
+        return pa.schema([
+            ('Project ID with serial', pa.string()),
+            ('Module', pa.string()),
+            ('Variable name', pa.string()),
+            ('Unit', pa.string()),
+            ('Numeric value', pa.float64()),
+            ('Non-numeric value', pa.string()),
+        ])
+
+    def write_results(self, costs, details, extended_project_list, output_dir=None):
+        """
+        Writes the landbosse-costs and landbosse-details datasets and
+        extended_project_list.parquet.
+
+        Parameters
+        ----------
+        costs : CostRecords
+            The cost records of all the projects.
+
+        details : DetailRecords
+            The detail records of all the projects. If empty, no details
+            dataset is written, and one left by an earlier run is deleted.
+
+        extended_project_list : pd.DataFrame
+            The extended project list of the run.
+
+        output_dir : str
+            The directory to write to. If None, it is the LandBOSSE output
+            directory from file_ops.
+        """
+        if output_dir is None:
+            output_dir = self.file_ops.landbosse_output_dir()
+
+        project_ids = self.project_ids_by_serial(extended_project_list)
+
+        costs_df = self._csv_generator.create_costs_dataframe(costs)
+        self.write_partitioned_dataset(costs_df, self.costs_schema(), project_ids, os.path.join(output_dir, 'landbosse-costs'))
+
+        details_path = os.path.join(output_dir, 'landbosse-details')
+        if len(details) > 0:
+            details_df = self._csv_generator.create_details_dataframe(details)
+            self.write_partitioned_dataset(details_df, self.details_schema(), project_ids, details_path)
+        elif os.path.isdir(details_path):
+            shutil.rmtree(details_path)
+
+        self.write_extended_project_list(extended_project_list, os.path.join(output_dir, 'extended_project_list.parquet'))
+
+    def write_partitioned_dataset(self, df, schema, project_ids, path):
+        """
+        Writes costs or details as a dataset partitioned by 'Project ID'
+        and 'Module'. A dataset already at path is deleted first, because
+        pyarrow adds files to existing partitions rather than replacing
+        them.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The costs or details, with the columns of schema.
+
+        schema : pyarrow.Schema
+            The schema of df.
+
+        project_ids : pd.Series
+            The Project ID of each Project ID with serial, which is the
+            index of the series.
+
+        path : str
+            The directory of the dataset.
+        """
+        df = df.assign(**{'Project ID': df['Project ID with serial'].map(project_ids).fillna(df['Project ID with serial'])})
+        schema = schema.append(self.pa.field('Project ID', self.pa.string()))
+        table = self.pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        number_of_partitions = len(df[['Project ID', 'Module']].drop_duplicates())
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        self.pq.write_to_dataset(
+            table,
+            root_path=path,
+            partition_cols=['Project ID', 'Module'],
+            max_partitions=max(number_of_partitions, 1024)
+        )
+
+    def write_extended_project_list(self, extended_project_list, path):
+        """
+        Writes the extended project list as one Parquet file. Missing
+        values of 'Project ID with serial' are filled with the Project ID
+        so that every project joins to the costs and details. Columns that
+        mix text and numbers, as columns read from Excel can, are written
+        as text.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The extended project list.
+
+        path : str
+            The path of the .parquet file.
+        """
+        df = extended_project_list.reset_index(drop=True)
+        if 'Project ID with serial' in df.columns:
+            df['Project ID with serial'] = df['Project ID with serial'].fillna(df['Project ID']).astype(str)
+
+        columns = dict()
+        for column_name in df.columns:
+            column = df[column_name]
+            try:
+                columns[column_name] = self.pa.array(column, from_pandas=True)
+            except (self.pa.ArrowInvalid, self.pa.ArrowTypeError):
+                columns[column_name] = self.pa.array(column.where(column.isnull(), column.astype(str)), from_pandas=True)
+        self.pq.write_table(self.pa.table(columns), path)
+
+    def project_ids_by_serial(self, extended_project_list):
+        """
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The extended project list.
+
+        Returns
+        -------
+        pd.Series
+            The Project ID of each project, indexed by Project ID with
+            serial.
+        """
+        project_id_with_serial = extended_project_list['Project ID with serial'].fillna(extended_project_list['Project ID'])
+        project_ids = pd.Series(extended_project_list['Project ID'].values, index=project_id_with_serial.values)
+        return project_ids[~project_ids.index.duplicated()]
+
+
+def import_pyarrow():
+    """
+    Imports pyarrow, which is an optional dependency of LandBOSSE.
+
+    Returns
+    -------
+    module, module
+        pyarrow and pyarrow.parquet
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError('Parquet output needs pyarrow. Install it with "pip install pyarrow".') from error
+    return pyarrow, pyarrow.parquet
@@ -0,0 +1,319 @@
+import numbers
+
+import numpy as np
+import pandas as pd
+
+from ..model.DefaultMasterInputDict import add_derived_inputs
+from .XlsxOperationException import XlsxOperationException
+
+"""
+This module contains the record of the inputs of one project that come
+from the project list, as opposed to the project data sheets.
+"""
+
+# The inputs read from the project list: the key in the master input
+# dictionary, the column of the project list and the kind of value, which
+# is how the value is validated:
+#
+# 'text': Any value that is not missing.
+# 'number': A number that is not NaN.
+# 'non-negative': A number that is 0 or more.
+# 'positive': A number that is more than 0.
+# 'count': A whole number that is 1 or more.
+# 'fraction': A number from 0 to 1.
+# '0/1': The number 0 or 1.
+# 'y/n': The text 'y' or 'n', kept as True or False.
+FIELDS = [
+    ('project_id', 'Project ID', 'text'),
+    ('crane_breakdown_fraction', 'Crane breakdown fraction', 'fraction'),
+    ('num_turbines', 'Number of turbines', 'count'),
+    ('construct_duration', 'Total project construction time (months)', 'positive'),
+    ('hub_height_meters', 'Hub height m', 'positive'),
+    ('rotor_diameter_m', 'Rotor diameter m', 'positive'),
+    ('wind_shear_exponent', 'Wind shear exponent', 'number'),
+    ('turbine_rating_MW', 'Turbine rating MW', 'positive'),
+    ('breakpoint_between_base_and_topping_percent', 'Breakpoint between base and topping (percent)', 'fraction'),
+    ('fuel_usd_per_gal', 'Fuel cost USD per gal', 'non-negative'),
+    ('rate_of_deliveries', 'Rate of deliveries (turbines per week)', 'positive'),
+    ('turbine_spacing_rotor_diameters', 'Turbine spacing (times rotor diameter)', 'positive'),
+    ('depth', 'Foundation depth m', 'positive'),
+    ('rated_thrust_N', 'Rated Thrust (N)', 'number'),
+    ('bearing_pressure_n_m2', 'Bearing Pressure (n/m2)', 'positive'),
+    ('gust_velocity_m_per_s', '50-year Gust Velocity (m/s)', 'number'),
+    ('road_distributed_wind', 'Calculate road cost for distributed wind? (y/n)', 'y/n'),
+    ('site_prep_area_m2', 'Site prep area for Distributed wind (m2)', 'non-negative'),
+    ('road_length_adder_m', 'Road length adder (m)', 'number'),
+    ('fraction_new_roads', 'Percent of roads that will be constructed', 'fraction'),
+    ('road_quality', 'Road Quality (0-1)', 'fraction'),
+    ('line_frequency_hz', 'Line Frequency (Hz)', 'positive'),
+    ('row_spacing_rotor_diameters', 'Row spacing (times rotor diameter)', 'positive'),
+    ('user_defined_distance_to_grid_connection', 'Flag for user-defined home run trench length (0 = no; 1 = yes)', '0/1'),
+    ('distance_to_grid_connection_km', 'Combined Homerun Trench Length to Substation (km)', 'non-negative'),
+    ('distance_to_interconnect_mi', 'Distance to interconnect (miles)', 'non-negative'),
+    ('interconnect_voltage_kV', 'Interconnect Voltage (kV)', 'positive'),
+    ('new_switchyard', 'New Switchyard (y/n)', 'y/n'),
+    ('critical_speed_non_erection_wind_delays_m_per_s', 'Non-Erection Wind Delay Critical Speed (m/s)', 'number'),
+    ('critical_height_non_erection_wind_delays_m', 'Non-Erection Wind Delay Critical Height (m)', 'number'),
+    ('road_width_ft', 'Road width (ft)', 'non-negative'),
+    ('road_thickness', 'Road thickness (in)', 'non-negative'),
+    ('crane_width', 'Crane width (m)', 'non-negative'),
+    ('num_hwy_permits', 'Number of highway permits', 'non-negative'),
+    ('num_access_roads', 'Number of access roads', 'non-negative'),
+    ('overtime_multiplier', 'Overtime multiplier', 'non-negative'),
+    ('allow_same_flag', 'Allow same flag', 'y/n'),
+    ('labor_cost_multiplier', 'Labor cost multiplier', 'non-negative'),
+]
+
+# The markups of the management cost, which are needed unless the total
+# management cost is overridden.
+MARKUP_FIELDS = [
+    ('markup_contingency', 'Markup contingency', 'number'),
+    ('markup_warranty_management', 'Markup warranty management', 'number'),
+    ('markup_sales_and_use_tax', 'Markup sales and use tax', 'number'),
+    ('markup_overhead', 'Markup overhead', 'number'),
+    ('markup_profit_margin', 'Markup profit margin', 'number'),
+]
+
+DEVELOPMENT_LABOR_COST_COLUMN = 'Development labor cost USD'
+OVERRIDE_TOTAL_MANAGEMENT_COST_COLUMN = 'Override total management cost for distributed (0 does not override)'
+
+# Every column of the project list that is read
+COLUMNS = [column for _, column, _ in FIELDS + MARKUP_FIELDS] + \
+    [DEVELOPMENT_LABOR_COST_COLUMN, OVERRIDE_TOTAL_MANAGEMENT_COST_COLUMN]
+
+
+class ProjectInputRecord:
+    """
+    This class holds the inputs of one project that come from its row of
+    the project list, validated once, before any cost module runs.
+
+    Each input is an attribute named by its key in the master input
+    dictionary (see FIELDS). Values are kept as they are in the project
+    list, except that 'y'/'n' columns become True/False. The optional
+    inputs, development_labor_cost_usd, override_total_management_cost
+    and the markups, are only set when the project list gives them, as in
+    the master input dictionary. It is used in the following manner:
+
+    record = ProjectInputRecord.from_project_parameters(project_parameters)
+    incomplete_input_dict.update(record.to_master_input_dict())
+
+    Records for many projects are made at once, column by column, with
+    from_extended_project_list().
+    """
+
+    __slots__ = tuple(name for name, _, _ in FIELDS + MARKUP_FIELDS) + \
+        ('development_labor_cost_usd', 'override_total_management_cost')
+
+    @classmethod
+    def from_project_parameters(cls, project_parameters):
+        """
+        Makes the record of one project.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The row of the project list of the project, after its
+            parametric modifications.
+
+        Returns
+        -------
+        ProjectInputRecord
+            The record.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a column is missing or a value is not valid.
+        """
+        columns = {column: np.array([project_parameters[column]], dtype=object)
+                   for column in COLUMNS if column in project_parameters.index}
+        return cls.from_columns(columns, 1)[0]
+
+    @classmethod
+    def from_extended_project_list(cls, extended_project_list):
+        """
+        Makes the records of every row of an extended project list. The
+        values are validated one column at a time rather than one project
+        at a time.
+
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The rows of the projects, after their parametric
+            modifications.
+
+        Returns
+        -------
+        list
+            One ProjectInputRecord for each row, in order.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a column is missing or a value is not valid.
+        """
+        columns = {column: extended_project_list[column].to_numpy()
+                   for column in COLUMNS if column in extended_project_list.columns}
+        return cls.from_columns(columns, len(extended_project_list))
+
+    @classmethod
+    def from_columns(cls, columns, count):
+        """
+        Validates the columns of the project list and makes a record for
+        each row.
+
+        Parameters
+        ----------
+        columns : dict
+            The values of each column of the project list, as 1-D arrays.
+
+        count : int
+            The number of rows.
+
+        Returns
+        -------
+        list
+            One ProjectInputRecord for each row.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a column is missing or a value is not valid. The message
+            lists every problem, not only the first.
+        """
+        project_ids = columns.get('Project ID', np.full(count, '?', dtype=object))
+
+        if OVERRIDE_TOTAL_MANAGEMENT_COST_COLUMN in columns:
+            override = _numbers(columns[OVERRIDE_TOTAL_MANAGEMENT_COST_COLUMN]) > 0
+        else:
+            override = np.zeros(count, dtype=bool)
+
+        problems = []
+        missing = [column for _, column, _ in FIELDS if column not in columns]
+        if not override.all():
+            missing += [column for _, column, _ in MARKUP_FIELDS if column not in columns]
+        if len(missing) > 0:
+            raise XlsxOperationException(f'The project list has no column {", ".join(missing)}.')
+
+        values = dict()
+        for name, column, kind in FIELDS:
+            values[name], invalid = _validate(columns[column], kind)
+            problems += _describe(project_ids, invalid, column, kind)
+        for name, column, kind in MARKUP_FIELDS:
+            if column in columns:
+                values[name], invalid = _validate(columns[column], kind)
+                problems += _describe(project_ids, invalid & ~override, column, kind)
+        if len(problems) > 0:
+            raise XlsxOperationException('Invalid project list: ' + '; '.join(problems))
+
+        # Split the columns into rows. tolist() turns NumPy scalars into
+        # Python ones, as in a row of the project list.
+        values = {name: np.asarray(column).tolist() for name, column in values.items()}
+        override_totals = np.asarray(columns.get(OVERRIDE_TOTAL_MANAGEMENT_COST_COLUMN, [])).tolist()
+        development_labor_costs = np.asarray(columns.get(DEVELOPMENT_LABOR_COST_COLUMN, [])).tolist()
+
+        records = []
+        for row in range(count):
+            record = cls()
+            for name, _, _ in FIELDS:
+                setattr(record, name, values[name][row])
+            if override[row]:
+                record.override_total_management_cost = override_totals[row]
+            else:
+                for name, _, _ in MARKUP_FIELDS:
+                    setattr(record, name, values[name][row])
+            if DEVELOPMENT_LABOR_COST_COLUMN in columns:
+                record.development_labor_cost_usd = development_labor_costs[row]
+            records.append(record)
+        return records
+
+    def to_master_input_dict(self):
+        """
+        Returns
+        -------
+        dict
+            The inputs for the master input dictionary, including those
+            calculated from the project list, such as
+            project_size_megawatts, and those stored under two keys (see
+            DERIVED_INPUTS).
+        """
+        input_dict = {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+        del input_dict['labor_cost_multiplier']
+        add_derived_inputs(input_dict)
+        return input_dict
+
+
+def _numbers(values):
+    """
+    Converts values to floats, with NaN for values that are not numbers.
+    """
+    numbers_only = [value if isinstance(value, numbers.Real) and not isinstance(value, (bool, np.bool_)) else np.nan
+                    for value in values]
+    return np.array(numbers_only, dtype=float)
+
+
+def _validate(values, kind):
+    """
+    Checks the values of one column.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values of the column.
+
+    kind : str
+        The kind of value. See FIELDS.
+
+    Returns
+    -------
+    np.ndarray, np.ndarray
+        The values to keep, which are the values themselves except for
+        'y/n' columns, and which values are not valid.
+    """
+    if kind == 'text':
+        return values, pd.isnull(values)
+    if kind == 'y/n':
+        return np.array([value == 'y' for value in values], dtype=object), ~np.isin(values, ['y', 'n'])
+
+    if values.dtype.kind in 'iuf':
+        as_numbers = values.astype(float)
+    else:
+        as_numbers = _numbers(values)
+    with np.errstate(invalid='ignore'):
+        if kind == 'number':
+            valid = ~np.isnan(as_numbers)
+        elif kind == 'non-negative':
+            valid = as_numbers >= 0
+        elif kind == 'positive':
+            valid = as_numbers > 0
+        elif kind == 'count':
+            valid = (as_numbers >= 1) & (as_numbers == np.round(as_numbers))
+        elif kind == 'fraction':
+            valid = (as_numbers >= 0) & (as_numbers <= 1)
+        else:
+            valid = (as_numbers == 0) | (as_numbers == 1)
+    return values, ~valid
+
+
+def _describe(project_ids, invalid, column, kind):
+    """
+    Describes the invalid values of one column.
+    """
+    if not invalid.any():
+        return []
+    projects = ', '.join(str(project_id) for project_id in np.asarray(project_ids)[invalid][:5])
+    if invalid.sum() > 5:
+        projects += f' and {invalid.sum() - 5} more'
+    return [f'{column} must be {_KIND_DESCRIPTIONS[kind]} (projects {projects})']
+
+
+_KIND_DESCRIPTIONS = {
+    'text': 'given',
+    'number': 'a number',
+    'non-negative': 'a number that is 0 or more',
+    'positive': 'a number more than 0',
+    'count': 'a whole number of 1 or more',
+    'fraction': 'a number from 0 to 1',
+    '0/1': '0 or 1',
+    'y/n': 'y or n',
+}
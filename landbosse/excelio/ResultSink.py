@@ -0,0 +1,584 @@
+import io
+import os
+import sqlite3
+
+import pandas as pd
+
+from ..model import CostRecords, DetailRecords
+from .CsvGenerator import CsvGenerator
+from .ParquetGenerator import ParquetGenerator
+
+
+class ResultSink:
+    """
+    A ResultSink receives the costs and details of each project as soon as
+    the project has run and writes them to files, so that the results of
+    a run do not need to be held in memory until the end of the run.
+
+    Records are buffered until at least batch_rows cost or detail rows
+    have accumulated, then written as one batch. Subclasses implement
+    _write_costs() and _write_details() for a file format.
+
+    A ResultSink is a context manager. Leaving the context writes what
+    remains in the buffers and closes the files:
+
+    with CsvResultSink(output_dir) as sink:
+        manager_runner = XlsxParallelManagerRunner(file_ops, result_sink=sink)
+        manager_runner.run_from_project_list_xlsx(projects_xlsx)
+    """
+
+    def __init__(self, output_dir, batch_rows=100000, extended_project_list_path=None):
+        """
+        Parameters
+        ----------
+        output_dir : str
+            The directory in which the files are written.
+
+        batch_rows : int
+            The number of cost or detail rows to buffer before writing.
+
+        extended_project_list_path : str
+            If given, the extended project list is written to this .csv
+            file as it is received.
+        """
+        self.output_dir = output_dir
+        self.batch_rows = batch_rows
+        self.extended_project_list_path = extended_project_list_path
+        self._extended_project_list_columns = None
+        self.costs_rows_written = 0
+        self.details_rows_written = 0
+        self._csv_generator = CsvGenerator(file_ops=None)
+        self._costs = []
+        self._details = []
+        self._costs_buffered = 0
+        self._details_buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_val, exception_traceback):
+        self.close()
+
+    def write(self, costs, details):
+        """
+        Adds the results of one or more projects.
+
+        Parameters
+        ----------
+        costs : CostRecords
+            The cost records.
+
+        details : DetailRecords
+            The detail records.
+        """
+        self._costs.append(costs)
+        self._costs_buffered += len(costs)
+        self._details.append(details)
+        self._details_buffered += len(details)
+        if self._costs_buffered >= self.batch_rows or self._details_buffered >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered records.
+        """
+        if self._costs_buffered > 0:
+            costs = CostRecords.concatenate(self._costs)
+            self._write_costs(self._csv_generator.create_costs_dataframe(costs))
+            self.costs_rows_written += len(costs)
+        if self._details_buffered > 0:
+            details = DetailRecords.concatenate(self._details)
+            self._write_details(self._csv_generator.create_details_dataframe(details))
+            self.details_rows_written += len(details)
+        self._costs = []
+        self._details = []
+        self._costs_buffered = 0
+        self._details_buffered = 0
+
+    def write_extended_project_list(self, extended_project_list):
+        """
+        Receives the extended project list, whole or one chunk at a time
+        as the runner prepares the projects, before close() is called. The
+        columns of the first chunk are the columns of all the chunks.
+
+        If extended_project_list_path was given, the chunks are appended
+        to that .csv file. Sinks that can join the extended project list
+        onto the costs and details, such as the database sinks, also write
+        it with _write_extended_project_list().
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The extended project list, or the next chunk of it.
+        """
+        first_chunk = self._extended_project_list_columns is None
+        if first_chunk:
+            self._extended_project_list_columns = list(extended_project_list.columns)
+        extended_project_list = extended_project_list.reindex(columns=self._extended_project_list_columns)
+        if self.extended_project_list_path is not None:
+            extended_project_list.to_csv(self.extended_project_list_path, index=False,
+                                         mode='w' if first_chunk else 'a', header=first_chunk)
+        self._write_extended_project_list(extended_project_list, first_chunk)
+
+    def _write_extended_project_list(self, extended_project_list, first_chunk):
+        """
+        Sinks that join the extended project list onto the costs and
+        details override this. Other sinks ignore it.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The next chunk of the extended project list.
+
+        first_chunk : bool
+            True for the first chunk.
+        """
+        pass
+
+    def close(self):
+        """
+        Writes the buffered records and closes the files.
+        """
+        self.flush()
+
+    def _write_costs(self, costs_df):
+        """
+        Parameters
+        ----------
+        costs_df : pd.DataFrame
+            A batch of costs with the columns of landbosse-costs.csv
+        """
+        raise NotImplementedError('_write_costs() is implemented by subclasses.')
+
+    def _write_details(self, details_df):
+        """
+        Parameters
+        ----------
+        details_df : pd.DataFrame
+            A batch of details with the columns of landbosse-details.csv
+        """
+        raise NotImplementedError('_write_details() is implemented by subclasses.')
+
+
+class CsvResultSink(ResultSink):
+    """
+    Appends the costs and details to landbosse-costs.csv and
+    landbosse-details.csv. The files are the same as the ones written
+    from the in-memory results by CsvGenerator.
+    """
+
+    def __init__(self, output_dir, batch_rows=100000, extended_project_list_path=None):
+        super().__init__(output_dir, batch_rows, extended_project_list_path)
+        self.costs_path = os.path.join(output_dir, 'landbosse-costs.csv')
+        self.details_path = os.path.join(output_dir, 'landbosse-details.csv')
+        self._costs_header_written = False
+        self._details_header_written = False
+
+    def _write_costs(self, costs_df):
+        costs_df.to_csv(self.costs_path, index=False, mode='a' if self._costs_header_written else 'w',
+                        header=not self._costs_header_written)
+        self._costs_header_written = True
+
+    def _write_details(self, details_df):
+        details_df.to_csv(self.details_path, index=False, mode='a' if self._details_header_written else 'w',
+                          header=not self._details_header_written)
+        self._details_header_written = True
+
+
+class ParquetResultSink(ResultSink):
+    """
+    Writes the costs and details to landbosse-costs.parquet and
+    landbosse-details.parquet, one row group per batch. The columns are
+    the same as in the .csv files, with the types of ParquetGenerator.
+
+    This needs pyarrow, which is imported only when an instance is made.
+    """
+
+    def __init__(self, output_dir, batch_rows=100000, extended_project_list_path=None):
+        super().__init__(output_dir, batch_rows, extended_project_list_path)
+        parquet_generator = ParquetGenerator(file_ops=None)
+        self._pa = parquet_generator.pa
+        self._pq = parquet_generator.pq
+        self.costs_path = os.path.join(output_dir, 'landbosse-costs.parquet')
+        self.details_path = os.path.join(output_dir, 'landbosse-details.parquet')
+        self.costs_schema = parquet_generator.costs_schema()
+        self.details_schema = parquet_generator.details_schema()
+        self._costs_writer = None
+        self._details_writer = None
+
+    def close(self):
+        super().close()
+        for writer in (self._costs_writer, self._details_writer):
+            if writer is not None:
+                writer.close()
+        self._costs_writer = None
+        self._details_writer = None
+
+    def _write_costs(self, costs_df):
+        if self._costs_writer is None:
+            self._costs_writer = self._pq.ParquetWriter(self.costs_path, self.costs_schema)
+        self._costs_writer.write_table(self._pa.Table.from_pandas(costs_df, schema=self.costs_schema, preserve_index=False))
+
+    def _write_details(self, details_df):
+        if self._details_writer is None:
+            self._details_writer = self._pq.ParquetWriter(self.details_path, self.details_schema)
+        self._details_writer.write_table(self._pa.Table.from_pandas(details_df, schema=self.details_schema, preserve_index=False))
+
+
+
+class DatabaseResultSink(ResultSink):
+    """
+    Inserts the costs and details into the landbosse_costs and
+    landbosse_details tables of a database through a DB-API connection.
+    The tables are made again when the sink is made, so a run replaces the
+    results of the previous run in the same database.
+
+    Indexes on 'Project ID with serial' and 'Module' are made when the sink
+    is closed, after the rows are inserted. write_extended_project_list()
+    fills the extended_project_list table, chunk by chunk, and adds the
+    extended_landbosse_costs and extended_landbosse_details views, which
+    join it onto the costs and details. These replace reading the .csv files back and joining them in
+    pandas after the run.
+
+    Subclasses set the connection and may insert batches in a faster way
+    than executemany().
+    """
+
+    costs_table = 'landbosse_costs'
+    details_table = 'landbosse_details'
+    extended_project_list_table = 'extended_project_list'
+
+    # The columns and SQL types of the tables. These are the columns of
+    # landbosse-costs.csv and landbosse-details.csv.
+    costs_columns = (
+        ('Project ID with serial', 'TEXT'),
+        ('Number of turbines', 'BIGINT'),
+        ('Turbine rating MW', 'DOUBLE PRECISION'),
+        ('Rotor diameter m', 'DOUBLE PRECISION'),
+        ('Module', 'TEXT'),
+        ('Type of cost', 'TEXT'),
+        ('Cost per turbine', 'DOUBLE PRECISION'),
+        ('Cost per project', 'DOUBLE PRECISION'),
+        ('Cost per kW', 'DOUBLE PRECISION'),
+    )
+
+    details_columns = (
+        ('Project ID with serial', 'TEXT'),
+        ('Module', 'TEXT'),
+        ('Variable name', 'TEXT'),
+        ('Unit', 'TEXT'),
+        ('Numeric value', 'DOUBLE PRECISION'),
+        ('Non-numeric value', 'TEXT'),
+    )
+
+    # The placeholder for parameters in the SQL of the connection.
+    placeholder = '?'
+
+    def __init__(self, connection, batch_rows=100000, output_dir=None, extended_project_list_path=None):
+        """
+        Parameters
+        ----------
+        connection
+            An open DB-API connection to the database.
+
+        batch_rows : int
+            The number of cost or detail rows to buffer before inserting.
+
+        output_dir : str
+            The directory of the database file, if it has one.
+
+        extended_project_list_path : str
+            If given, the extended project list is also written to this
+            .csv file.
+        """
+        super().__init__(output_dir, batch_rows, extended_project_list_path)
+        self.connection = connection
+        self._extended_project_list_types = None
+        self._execute(
+            f'DROP VIEW IF EXISTS extended_{self.costs_table}',
+            f'DROP VIEW IF EXISTS extended_{self.details_table}',
+            f'DROP TABLE IF EXISTS {self.costs_table}',
+            f'DROP TABLE IF EXISTS {self.details_table}',
+            f'DROP TABLE IF EXISTS {self.extended_project_list_table}',
+            self._create_table_sql(self.costs_table, self.costs_columns),
+            self._create_table_sql(self.details_table, self.details_columns)
+        )
+        self.connection.commit()
+
+    def flush(self):
+        super().flush()
+        self.connection.commit()
+
+    def close(self):
+        """
+        Inserts the buffered records, makes the indexes and closes the
+        connection.
+        """
+        if self.connection is None:
+            return
+        super().close()
+        self._execute(
+            self._create_index_sql(self.costs_table, ['Project ID with serial', 'Module']),
+            self._create_index_sql(self.details_table, ['Project ID with serial', 'Module'])
+        )
+        if self._extended_project_list_types is not None:
+            self._execute(self._create_index_sql(self.extended_project_list_table, ['Project ID with serial']))
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+
+    def _write_extended_project_list(self, extended_project_list, first_chunk):
+        """
+        Inserts a chunk of the extended project list into the
+        extended_project_list table. The first chunk makes the table and
+        the views that join it onto the costs and details.
+
+        Missing values of 'Project ID with serial' are filled with the
+        Project ID so that every project joins. The types of the columns
+        are set by the first chunk: booleans are integers, other numbers
+        are floats, since parametric values can turn integer columns of
+        the project list into floats in later chunks, and everything else
+        is text. Blank cells of later chunks are NULL. A column of numbers
+        that has text in a later chunk is changed to text, rather than
+        stopping the run.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The next chunk of the extended project list.
+
+        first_chunk : bool
+            True for the first chunk.
+        """
+        df = extended_project_list.reset_index(drop=True)
+        df['Project ID with serial'] = df['Project ID with serial'].fillna(df['Project ID']).astype(str)
+
+        if first_chunk:
+            self._extended_project_list_types = []
+            for column_name in df.columns:
+                column = df[column_name]
+                if pd.api.types.is_bool_dtype(column):
+                    sql_type = 'BIGINT'
+                elif pd.api.types.is_numeric_dtype(column):
+                    sql_type = 'DOUBLE PRECISION'
+                else:
+                    sql_type = 'TEXT'
+                self._extended_project_list_types.append((column_name, sql_type))
+            self._execute(
+                self._create_table_sql(self.extended_project_list_table, self._extended_project_list_types),
+                self._create_view_sql(self.costs_table, self.costs_columns),
+                self._create_view_sql(self.details_table, self.details_columns)
+            )
+
+        for position, (column_name, sql_type) in enumerate(self._extended_project_list_types):
+            column = df[column_name]
+            if sql_type != 'TEXT':
+                numbers = pd.to_numeric(column, errors='coerce')
+                if (numbers.isnull() & column.notnull()).any():
+                    self._change_extended_project_list_column_to_text(column_name)
+                    self._extended_project_list_types[position] = (column_name, 'TEXT')
+                    sql_type = 'TEXT'
+            if sql_type == 'BIGINT':
+                df[column_name] = numbers.astype('Int64')
+            elif sql_type == 'DOUBLE PRECISION':
+                df[column_name] = numbers.astype(float)
+            else:
+                df[column_name] = column.where(column.isnull(), column.astype(str))
+
+        self._insert(self.extended_project_list_table, [name for name, _ in self._extended_project_list_types], df)
+        self.connection.commit()
+
+    def _change_extended_project_list_column_to_text(self, column_name):
+        """
+        Changes the type of a column of the extended_project_list table to
+        TEXT. The views that join the table are made again around the
+        change, because some databases do not change the type of a column
+        that a view uses.
+
+        Parameters
+        ----------
+        column_name : str
+            The column to change.
+        """
+        self._execute(
+            f'DROP VIEW IF EXISTS extended_{self.costs_table}',
+            f'DROP VIEW IF EXISTS extended_{self.details_table}',
+            f'ALTER TABLE {self.extended_project_list_table} ALTER COLUMN {_quote(column_name)} TYPE TEXT',
+            self._create_view_sql(self.costs_table, self.costs_columns),
+            self._create_view_sql(self.details_table, self.details_columns)
+        )
+
+    def _write_costs(self, costs_df):
+        self._insert(self.costs_table, [name for name, _ in self.costs_columns], costs_df)
+
+    def _write_details(self, details_df):
+        self._insert(self.details_table, [name for name, _ in self.details_columns], details_df)
+
+    def _insert(self, table, column_names, df):
+        """
+        Inserts the rows of a dataframe into a table. Missing values are
+        inserted as NULL.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        column_names : list
+            The columns of the table, which are also columns of df.
+
+        df : pd.DataFrame
+            The rows to insert.
+        """
+        columns = [df[name].astype(object).where(df[name].notnull(), None).tolist() for name in column_names]
+        placeholders = ', '.join([self.placeholder] * len(column_names))
+        cursor = self.connection.cursor()
+        cursor.executemany(f'INSERT INTO {table} VALUES ({placeholders})', list(zip(*columns)))
+        cursor.close()
+
+    def _execute(self, *statements):
+        """
+        Executes SQL statements, in order.
+
+        Parameters
+        ----------
+        statements : str
+            The statements.
+        """
+        cursor = self.connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+    def _create_table_sql(self, table, columns):
+        """
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        columns : list
+            (name, SQL type) tuples for each column.
+
+        Returns
+        -------
+        str
+            The SQL that creates the table.
+        """
+        column_definitions = ', '.join(f'{_quote(name)} {sql_type}' for name, sql_type in columns)
+        return f'CREATE TABLE {table} ({column_definitions})'
+
+    def _create_index_sql(self, table, column_names):
+        """
+        Parameters
+        ----------
+        table : str
+            The name of the table.
+
+        column_names : list
+            The columns of the index.
+
+        Returns
+        -------
+        str
+            The SQL that creates the index, named after the table.
+        """
+        return f'CREATE INDEX IF NOT EXISTS {table}_index ON {table} ({", ".join(_quote(name) for name in column_names)})'
+
+    def _create_view_sql(self, table, columns):
+        """
+        Makes the view extended_<table>, which has the columns of the
+        extended project list followed by the columns of the costs or
+        details that are not in the extended project list.
+
+        Parameters
+        ----------
+        table : str
+            The costs or details table.
+
+        columns : list
+            (name, SQL type) tuples for each column of the table.
+
+        Returns
+        -------
+        str
+            The SQL that creates the view.
+        """
+        result_columns = ', '.join(f'r.{_quote(name)}' for name, _ in columns
+                                   if name not in ('Project ID with serial', 'Number of turbines', 'Turbine rating MW', 'Rotor diameter m'))
+        serial = _quote('Project ID with serial')
+        return f'CREATE VIEW extended_{table} AS SELECT e.*, {result_columns} ' \
+               f'FROM {table} AS r JOIN {self.extended_project_list_table} AS e ON r.{serial} = e.{serial}'
+
+
+class SqliteResultSink(DatabaseResultSink):
+    """
+    Writes the costs and details to a SQLite database file, by default
+    landbosse-results.sqlite in the output directory. See
+    DatabaseResultSink for the tables and views.
+    """
+
+    def __init__(self, output_dir, batch_rows=100000, filename='landbosse-results.sqlite', extended_project_list_path=None):
+        self.database_path = os.path.join(output_dir, filename)
+        super().__init__(sqlite3.connect(self.database_path), batch_rows, output_dir, extended_project_list_path)
+
+    def _change_extended_project_list_column_to_text(self, column_name):
+        # SQLite cannot change the type of a column, and does not need to,
+        # because any column can hold text.
+        pass
+
+
+class DuckDbResultSink(DatabaseResultSink):
+    """
+    Writes the costs and details to a DuckDB database file, by default
+    landbosse-results.duckdb in the output directory. Each batch is
+    inserted as a whole from its dataframe. See DatabaseResultSink for
+    the tables and views.
+
+    This needs duckdb, which is imported only when an instance is made.
+    """
+
+    def __init__(self, output_dir, batch_rows=100000, filename='landbosse-results.duckdb', extended_project_list_path=None):
+        try:
+            import duckdb
+        except ImportError as error:
+            raise ImportError('DuckDB output needs duckdb. Install it with "pip install duckdb".') from error
+        self.database_path = os.path.join(output_dir, filename)
+        super().__init__(duckdb.connect(self.database_path), batch_rows, output_dir, extended_project_list_path)
+
+    def _insert(self, table, column_names, df):
+        self.connection.register('landbosse_batch', df[column_names])
+        self.connection.execute(f'INSERT INTO {table} SELECT * FROM landbosse_batch')
+        self.connection.unregister('landbosse_batch')
+
+
+class PostgresResultSink(DatabaseResultSink):
+    """
+    Writes the costs and details to a PostgreSQL database. Each batch is
+    loaded with COPY, as CSV text. See DatabaseResultSink for the tables
+    and views.
+
+    The connection is made by the caller, usually with psycopg2, so that
+    the credentials stay outside of LandBOSSE. For example:
+
+    connection = psycopg2.connect(host=..., dbname=..., user=..., password=...)
+    with PostgresResultSink(connection) as sink:
+        ...
+    """
+
+    def _insert(self, table, column_names, df):
+        buffer = io.StringIO()
+        df[column_names].to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        columns = ', '.join(_quote(name) for name in column_names)
+        cursor = self.connection.cursor()
+        cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+        cursor.close()
+
+
+def _quote(name):
+    """
+    Quotes a column name for SQL.
+    """
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
@@ -0,0 +1,303 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .XlsxReader import XlsxReader
+
+
+class SensitivityAnalysis:
+    """
+    This class calculates the global sensitivity of the cost of each
+    module, and of the total BOS cost, of one project to a few cell
+    specifications, such as hub height or the rate of a crew.
+
+    There are two methods:
+
+    'sobol': A Saltelli design of samples * (number of factors + 2) runs,
+        from a scrambled Sobol sequence. The result has the first order
+        and total order Sobol indices of each factor, as fractions of the
+        variance of the cost.
+
+    'morris': samples trajectories of number of factors + 1 runs each on a
+        grid of levels values of each factor, one factor changing at each
+        step. levels must be even, so that every step stays on the grid.
+        The result has the mean (Mu), mean absolute value (Mu star) and
+        standard deviation (Sigma) of the elementary effects of each
+        factor, in USD per the whole range of the factor.
+
+    The runs are made with a manager runner, in parallel with an
+    XlsxParallelManagerRunner. With an incremental runner, which orders
+    the runs of each chunk itself, the cost modules that do not depend on
+    any factor come from the ModuleOutputCache instead of being run again.
+    It is used in the following manner:
+
+    analysis = SensitivityAnalysis(
+        manager_runner=XlsxParallelManagerRunner(file_ops, incremental=True),
+        project_id='ge15_public',
+        factors={'project list/x/Hub height m': (80, 120), 'crew_price/Operator/Hourly rate USD per hour': (80, 120)},
+        method='sobol',
+        samples=256
+    )
+    final_result = analysis.run()
+    final_result['sensitivity']
+
+    The factors are cell specifications, as in the Parametric list sheet,
+    with their minimum and maximum values, and are sampled uniformly.
+    """
+
+    methods = ('sobol', 'morris')
+
+    def __init__(self, manager_runner, project_id, factors, method='sobol', samples=64, levels=4, seed=None,
+                 project_parameters=None, enable_cost_and_scaling_modifications=False):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner of the projects. It must not have a result sink,
+            because the analysis needs the costs of every run.
+
+        project_id : str
+            The Project ID of the project to analyze, in the project list.
+
+        factors : dict
+            The (minimum, maximum) values of each cell specification.
+
+        method : str
+            'sobol' or 'morris'
+
+        samples : int
+            The number of base samples of a Sobol analysis, preferably a
+            power of 2, or the number of trajectories of a Morris analysis.
+
+        levels : int
+            The number of values of each factor in a Morris analysis. It
+            must be even.
+
+        seed : int
+            The seed of the random numbers, so that the same design is
+            made every time. If None, a different design is made every time.
+
+        project_parameters : pandas.Series
+            The row of the project list of the project. If None, it is read
+            from the project list xlsx.
+
+        enable_cost_and_scaling_modifications : bool
+            Passed to the runner. See run_from_project_list_xlsx().
+
+        Raises
+        ------
+        ValueError
+            If the runner has a result sink, the method is unknown,
+            samples or levels are too small, or levels is odd.
+        """
+        if manager_runner.result_sink is not None:
+            raise ValueError('SensitivityAnalysis needs the costs of each run. Use a runner without a result sink.')
+        if method not in self.methods:
+            raise ValueError(f'Method {method} is not one of {", ".join(self.methods)}.')
+        if samples < 2:
+            raise ValueError('samples must be at least 2.')
+        if levels < 2 or levels % 2 != 0:
+            raise ValueError('levels must be an even number of at least 2.')
+
+        self.manager_runner = manager_runner
+        self.project_id = project_id
+        self.factors = factors
+        self.cell_specifications = list(factors)
+        self.method = method
+        self.samples = samples
+        self.levels = levels
+        self.seed = seed
+        self.project_parameters = project_parameters
+        self.enable_cost_and_scaling_modifications = enable_cost_and_scaling_modifications
+
+    def saltelli_design(self):
+        """
+        Makes the runs of a Sobol analysis. For each base sample j, the
+        rows are A_j, then A_j with factor i taken from B_j for each
+        factor i, then B_j.
+
+        Returns
+        -------
+        np.ndarray
+            One row for each run and one column for each factor, with
+            values from 0 to 1.
+        """
+        dimensions = len(self.factors)
+        base = qmc.Sobol(d=2 * dimensions, seed=self.seed).random(self.samples)
+        a, b = base[:, :dimensions], base[:, dimensions:]
+        design = np.repeat(a[:, np.newaxis, :], dimensions + 2, axis=1)
+        for factor in range(dimensions):
+            design[:, factor + 1, factor] = b[:, factor]
+        design[:, -1, :] = b
+        return design.reshape(-1, dimensions)
+
+    def morris_design(self):
+        """
+        Makes the runs of a Morris analysis. Each trajectory starts at a
+        random point of the grid of levels and moves each factor once, in
+        random order, by delta = levels / (2 * (levels - 1)), up if it
+        can and down otherwise.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            The runs, with one row for each run and one column for each
+            factor, with values from 0 to 1, and the factor moved at each
+            step of each trajectory, as an array of samples rows and one
+            column for each factor.
+        """
+        dimensions = len(self.factors)
+        delta = self._morris_delta()
+        rng = np.random.default_rng(self.seed)
+        design = np.empty((self.samples, dimensions + 1, dimensions))
+        moved_factors = np.empty((self.samples, dimensions), dtype=int)
+        for trajectory in range(self.samples):
+            point = rng.integers(0, self.levels, dimensions) / (self.levels - 1)
+            design[trajectory, 0] = point
+            moved_factors[trajectory] = rng.permutation(dimensions)
+            for step, factor in enumerate(moved_factors[trajectory]):
+                point = point.copy()
+                point[factor] += delta if point[factor] + delta <= 1 + 1e-12 else -delta
+                design[trajectory, step + 1] = point
+        return design.reshape(-1, dimensions), moved_factors
+
+    def run(self):
+        """
+        Runs the design and calculates the sensitivity indices.
+
+        Returns
+        -------
+        dict
+            The final result of the runs, with the keys of the final
+            result of the runner. Under the additional key 'sensitivity' is
+            a dataframe with a row for each module, including 'Total', and
+            factor. Its columns are 'Module', 'Factor' and either
+            'First order' and 'Total order' or 'Mu', 'Mu star' and 'Sigma'.
+        
+        Raises
+        ------
+        ValueError
+            If the runner returns no costs for some of the runs.
+        """
+        project_parameters = self.project_parameters
+        if project_parameters is None:
+            project_list, _ = self.manager_runner.read_project_and_parametric_sheets()
+            project_parameters = project_list[project_list['Project ID'] == self.project_id].iloc[0]
+
+        if self.method == 'sobol':
+            design = self.saltelli_design()
+        else:
+            design, moved_factors = self.morris_design()
+
+        low = np.array([self.factors[cell_specification][0] for cell_specification in self.cell_specifications], dtype=float)
+        high = np.array([self.factors[cell_specification][1] for cell_specification in self.cell_specifications], dtype=float)
+        values = low + design * (high - low)
+
+        xlsx_reader = XlsxReader()
+        serials = xlsx_reader.create_serial_numbers(self.project_id, 0, len(values), len(values))
+        chunk_size = self.manager_runner.chunk_size
+        chunks = (self._extended_project_list(project_parameters, values, serials, start, start + chunk_size)
+                  for start in range(0, len(values), chunk_size))
+        final_result = self.manager_runner.run_extended_project_list(chunks, self.enable_cost_and_scaling_modifications)
+
+        module_costs = _module_costs(final_result['module_type_operation_list'])
+        missing = [serial for serial in serials if serial not in module_costs.index]
+        if len(missing) > 0:
+            raise ValueError(f'{len(missing)} runs have no costs, such as {", ".join(missing[:5])}.')
+
+        module_costs = module_costs.reindex(serials)
+        if self.method == 'sobol':
+            final_result['sensitivity'] = self._sobol_indices(module_costs)
+        else:
+            final_result['sensitivity'] = self._morris_indices(module_costs, design, moved_factors)
+        return final_result
+
+    def _extended_project_list(self, project_parameters, values, serials, start, stop):
+        """
+        Makes the rows of the extended project list of runs start to stop.
+        """
+        stop = min(stop, len(values))
+        extended_project_list = pd.DataFrame([project_parameters] * (stop - start)).reset_index(drop=True)
+        for column, cell_specification in enumerate(self.cell_specifications):
+            extended_project_list[cell_specification] = values[start:stop, column]
+        extended_project_list['Project ID with serial'] = serials[start:stop]
+        extended_project_list.index = pd.RangeIndex(start, stop)
+        return extended_project_list
+
+    def _sobol_indices(self, module_costs):
+        """
+        Calculates the first order indices with the estimator of Saltelli
+        et al. (2010) and the total order indices with that of Jansen
+        (1999). Indices of costs that do not vary are 0, and those of costs
+        that are missing for some runs are NaN.
+        """
+        dimensions = len(self.factors)
+        rows = []
+        for module, costs in module_costs.items():
+            costs = costs.to_numpy(dtype=float).reshape(self.samples, dimensions + 2)
+            f_a, f_ab, f_b = costs[:, 0], costs[:, 1:-1], costs[:, -1]
+            variance = np.var(np.concatenate([f_a, f_b]))
+            for factor, cell_specification in enumerate(self.cell_specifications):
+                if variance > 0 or np.isnan(variance):
+                    first_order = np.mean(f_b * (f_ab[:, factor] - f_a)) / variance
+                    total_order = 0.5 * np.mean((f_a - f_ab[:, factor]) ** 2) / variance
+                else:
+                    first_order, total_order = 0.0, 0.0
+                rows.append({'Module': module, 'Factor': cell_specification,
+                             'First order': first_order, 'Total order': total_order})
+        return pd.DataFrame(rows, columns=['Module', 'Factor', 'First order', 'Total order'])
+
+    def _morris_indices(self, module_costs, design, moved_factors):
+        """
+        Calculates the statistics of the elementary effects of each factor.
+        """
+        dimensions = len(self.factors)
+        trajectories = design.reshape(self.samples, dimensions + 1, dimensions)
+        step_rows = np.arange(dimensions)
+        steps = [trajectories[trajectory, step_rows + 1, moved_factors[trajectory]] -
+                 trajectories[trajectory, step_rows, moved_factors[trajectory]]
+                 for trajectory in range(self.samples)]
+        rows = []
+        for module, costs in module_costs.items():
+            costs = costs.to_numpy(dtype=float).reshape(self.samples, dimensions + 1)
+            effects = np.empty((self.samples, dimensions))
+            for trajectory in range(self.samples):
+                effects[trajectory, moved_factors[trajectory]] = np.diff(costs[trajectory]) / steps[trajectory]
+            for factor, cell_specification in enumerate(self.cell_specifications):
+                rows.append({'Module': module, 'Factor': cell_specification,
+                             'Mu': effects[:, factor].mean(),
+                             'Mu star': np.abs(effects[:, factor]).mean(),
+                             'Sigma': effects[:, factor].std(ddof=1)})
+        return pd.DataFrame(rows, columns=['Module', 'Factor', 'Mu', 'Mu star', 'Sigma'])
+
+    def _morris_delta(self):
+        return self.levels / (2 * (self.levels - 1))
+
+
+def _module_costs(costs):
+    """
+    Sums the costs of each module of each project.
+
+    Parameters
+    ----------
+    costs : CostRecords
+        The costs of the projects.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row for each project, indexed by project name, and one column
+        for each module, in alphabetical order, then 'Total'. The cost of
+        a module that a project has no costs for, and then its total, is
+        NaN.
+    """
+    project_codes, projects = pd.factorize(np.asarray(costs['project_id_with_serial'], dtype=object))
+    module_codes, modules = pd.factorize(np.asarray(costs['module'], dtype=object))
+    sums = np.zeros((len(projects), len(modules)))
+    np.add.at(sums, (project_codes, module_codes), np.asarray(costs['cost_per_project'], dtype=float))
+    counts = np.zeros((len(projects), len(modules)), dtype=int)
+    np.add.at(counts, (project_codes, module_codes), 1)
+    sums[counts == 0] = np.nan
+    module_costs = pd.DataFrame(sums, index=projects, columns=modules).sort_index(axis=1)
+    module_costs['Total'] = sums.sum(axis=1)
+    return module_costs
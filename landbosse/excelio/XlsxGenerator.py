@@ -1,9 +1,11 @@
 import xlsxwriter
 from xlsxwriter.utility import xl_rowcol_to_cell
+import numpy as np
 import pandas as pd
 import os
 import traceback
 
+from ..model import DetailRecords
 from .XlsxFileOperations import XlsxFileOperations
 
 
@@ -19,7 +21,10 @@ class XlsxGenerator:
     output Excel workbook.
     """
 
-    def __init__(self, output_xlsx, file_ops):
+    # The number of rows on an Excel worksheet, including the header row.
+    max_rows_per_sheet = 1048576
+
+    def __init__(self, output_xlsx, file_ops, constant_memory=False):
         """
         This constructor sets the name of the .xlsx file for writing
 
@@ -35,6 +40,14 @@ class XlsxGenerator:
 
         file_ops : XlsxFileOperations
             An instance of XlsxFileOperations to manage file names.
+
+        constant_memory : bool
+            If True, the workbook is opened in the constant_memory mode of
+            XlsxWriter, which writes each row to a temporary file once the
+            next row is started. Memory use then does not grow with the
+            number of rows. In this mode each tab must be written
+            completely, in row order, before the next tab is started, as
+            all the tab_ methods of this class do.
         """
 
         # Set all instance attributes to None first in the constructor as good
@@ -45,6 +58,7 @@ class XlsxGenerator:
         self.percent_format = None
         self.output_xlsx_path = os.path.join(file_ops.landbosse_output_dir(), f'{output_xlsx}.xlsx')
         self.file_ops = file_ops
+        self.constant_memory = constant_memory
 
     @classmethod
     def write_project_data(cls, project_data_dataframes, project_data_output_xlsx_path):
@@ -79,7 +93,8 @@ class XlsxGenerator:
         self
             Returns self for easy use in the context manager.
         """
-        self.workbook = xlsxwriter.Workbook(self.output_xlsx_path, {'nan_inf_to_errors': True})
+        self.workbook = xlsxwriter.Workbook(self.output_xlsx_path, {'nan_inf_to_errors': True,
+                                                                    'constant_memory': self.constant_memory})
         self.set_workbook_formats()
         return self
 
@@ -129,115 +144,167 @@ class XlsxGenerator:
 
     def tab_costs_by_module_type_operation(self, rows):
         """
-        This writes the costs_by_module_type_operation tab.
+        This writes the costs_by_module_type_operation tab. If there are
+        more rows than fit on one sheet, the rest continue on sheets
+        named costs_by_module_type_operatio_2, _3 and so on, each with the
+        header row.
 
         Parameters
         ----------
-        rows : list
-            List of dictionaries that are each row in the output
-            sheet.
-        """
-        worksheet = self.workbook.add_worksheet('costs_by_module_type_operation')
-        for idx, col_name in enumerate(['Project ID with serial',
-                                        'Number of turbines',
-                                        'Turbine rating MW',
-                                        'Rotor diameter m',
-                                        'Module',
-                                        'Operation ID',
-                                        'Type of cost',
-                                        'Cost per turbine',
-                                        'Cost per project',
-                                        'USD/kW per project']):
-            worksheet.write(0, idx, col_name, self.header_format)
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['num_turbines'])
-            worksheet.write(row_idx + 1, 2, row['turbine_rating_MW'])
-            worksheet.write(row_idx + 1, 3, row['rotor_diameter_m'])
-            worksheet.write(row_idx + 1, 4, row['module'])
-            worksheet.write(row_idx + 1, 5, row['operation_id'])
-            worksheet.write(row_idx + 1, 6, row['type_of_cost'])
-            worksheet.write(row_idx + 1, 7, row['cost_per_turbine'], self.accounting_format)
-            worksheet.write(row_idx + 1, 8, row['cost_per_project'], self.accounting_format)
-            worksheet.write(row_idx + 1, 9, row['usd_per_kw_per_project'], self.accounting_format)
+        rows : CostRecords
+            The cost records that are the rows in the output sheet.
+        """
+        header = ['Project ID with serial',
+                  'Number of turbines',
+                  'Turbine rating MW',
+                  'Rotor diameter m',
+                  'Module',
+                  'Operation ID',
+                  'Type of cost',
+                  'Cost per turbine',
+                  'Cost per project',
+                  'USD/kW per project']
+        fields = ['project_id_with_serial',
+                  'num_turbines',
+                  'turbine_rating_MW',
+                  'rotor_diameter_m',
+                  'module',
+                  'operation_id',
+                  'type_of_cost',
+                  'cost_per_turbine',
+                  'cost_per_project',
+                  'usd_per_kw_per_project']
+
+        def add_worksheet(sheet_number):
+            worksheet = self.workbook.add_worksheet(self._sheet_name('costs_by_module_type_operation', sheet_number))
             worksheet.set_column(0, 5, 25)
-            worksheet.set_column(6, 10, 17)
-        worksheet.freeze_panes(1, 0)  # Freeze the first row.
-
-    def tab_details(self, rows):
+            worksheet.set_column(6, 6, 17)
+            worksheet.set_column(7, 9, 17, self.accounting_format)
+            worksheet.set_column(10, 10, 17)
+            worksheet.write_row(0, 0, header, self.header_format)
+            worksheet.freeze_panes(1, 0)  # Freeze the first row.
+            return worksheet
+
+        # Convert each column to a list of Python values once, rather than
+        # looking up every cell.
+        columns = [rows[field].tolist() for field in fields]
+        self._write_rows_on_sheets(zip(*columns), add_worksheet)
+
+    def _write_rows_on_sheets(self, rows, add_worksheet):
         """
-        This writes a detailed outputs tab. It takes a list of dictionaries
-        as the parameters and in each of those dictionaries it looks at the keys:
-
-        ['project_id', 'module', 'type', 'variable_df_key_col_name', 'unit', 'numeric value', 'non_numeric_value']
-
-        The values of each of those keys become each cell in the row.
+        Writes rows below the header row of a sheet, starting a new sheet
+        whenever a sheet is full.
 
         Parameters
         ----------
-        rows : list
-            list of dicts. See above.
-        """
-        worksheet = self.workbook.add_worksheet('details')
-        worksheet.set_column(3, 3, 66)
-        worksheet.set_column(4, 4, 17)
-        worksheet.set_column(5, 5, 66)
-        worksheet.set_column(0, 2, 17)
+        rows : iterable
+            The rows to write. Each row is a sequence of cell values.
 
-        for idx, col_name in enumerate(['Project ID with serial', 'Module', 'Variable or DataFrame', 'name', 'unit', 'Numeric value', 'Non-numeric value']):
-            worksheet.write(0, idx, col_name, self.header_format)
+        add_worksheet : function
+            Called with the sheet number (1, 2, ...) to add a worksheet,
+            write its header row and set its column formats. Returns the
+            worksheet.
 
-        # Go through each row and create Excel rows from each of those rows.
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['module'])
-            worksheet.write(row_idx + 1, 2, row['type'])
-            worksheet.write(row_idx + 1, 3, row['variable_df_key_col_name'])
-            worksheet.write(row_idx + 1, 4, row['unit'])
+        Returns
+        -------
+        int
+            The number of sheets used.
+        """
+        sheet_number = 1
+        worksheet = add_worksheet(sheet_number)
+        row_idx = 1
+        for row in rows:
+            if row_idx == self.max_rows_per_sheet:
+                sheet_number += 1
+                worksheet = add_worksheet(sheet_number)
+                row_idx = 1
+            worksheet.write_row(row_idx, 0, row)
+            row_idx += 1
+        return sheet_number
+
+    def _sheet_name(self, name, sheet_number):
+        """
+        Makes the name of the first or a continuation sheet. Continuation
+        sheets have a suffix of _2, _3 and so on. The name is shortened as
+        needed to fit the 31 character limit of Excel.
+
+        Parameters
+        ----------
+        name : str
+            The name of the first sheet.
 
-            value = row['value']
-            value_is_number = self._is_numeric(value)
-            if value_is_number:
-                worksheet.write(row_idx + 1, 5, value, self.scientific_format)
-            else:
-                worksheet.write(row_idx + 1, 6, value)
+        sheet_number : int
+            1 for the first sheet, 2 for the first continuation sheet and
+            so on.
 
-            # If there is a last_number, which means this is a dataframe row that has a number
-            # at the end, write this into the numeric value column. This overrides automatic
-            # type detection.
+        Returns
+        -------
+        str
+            The sheet name.
+        """
+        if sheet_number == 1:
+            return name[:31]
+        suffix = f'_{sheet_number}'
+        return name[:31 - len(suffix)] + suffix
 
-            if 'last_number' in row:
-                worksheet.write(row_idx + 1, 5, row['last_number'], self.scientific_format)
+    def tab_details(self, rows):
+        """
+        This writes the details tab. If there are more rows than fit on one
+        sheet, the rest continue on sheets named details_2, details_3 and
+        so on, each with the header row.
 
-            # Certain data are pairs of numeric and non-numeric values. If a key of
-            # "non_numeric_value" exists, put that in column 6.
-            # An example is mobilization of an LB75-SL3F-Offload at some numeric cost
+        The columns are
 
-            if 'non_numeric_value' in row:
-                worksheet.write(row_idx + 1, 6, row['non_numeric_value'])
+        ['project_id_with_serial', 'module', 'type', 'variable_df_key_col_name', 'unit', 'numeric_value', 'non_numeric_value']
 
-        worksheet.freeze_panes(1, 0)  # Freeze the first row.
+        Missing numeric and non-numeric values are left blank.
 
-    def _is_numeric(self, value):
+        Parameters
+        ----------
+        rows : DetailRecords or iterable
+            The detail records to write, either all at once or as an
+            iterable of DetailRecords batches (such as one per project), so
+            that the details of all the projects need not be in memory at
+            the same time.
         """
-        This method tests if a value is a numeric (that is, can be parsed
-        by float()) or non numeric (which cannot be parsed).
-
-        The decision from this method determines whether values go into
-        the numeric or non-numeric columns.
+        header = ['Project ID with serial', 'Module', 'Variable or DataFrame', 'name', 'unit', 'Numeric value', 'Non-numeric value']
+
+        def add_worksheet(sheet_number):
+            worksheet = self.workbook.add_worksheet(self._sheet_name('details', sheet_number))
+            worksheet.set_column(0, 2, 17)
+            worksheet.set_column(3, 3, 66)
+            worksheet.set_column(4, 4, 17)
+            worksheet.set_column(5, 5, 66, self.scientific_format)
+            worksheet.write_row(0, 0, header, self.header_format)
+            worksheet.freeze_panes(1, 0)  # Freeze the first row.
+            return worksheet
+
+        if isinstance(rows, DetailRecords):
+            rows = [rows]
+        self._write_rows_on_sheets(self._detail_rows(rows), add_worksheet)
+
+    def _detail_rows(self, batches):
+        """
+        Converts batches of DetailRecords to rows of cell values. Missing
+        numeric values (NaN) become None, which write_row() leaves blank.
+        The conversion is done for each batch as a whole, not value by
+        value.
 
         Parameters
         ----------
-        value
-            The value to be tested.
+        batches : iterable
+            The DetailRecords batches.
 
-        Returns
-        -------
-        bool
-            True if the value is numeric, False otherwise.
+        Yields
+        ------
+        tuple
+            The cell values of one row.
         """
-        try:
-            float(value)
-        except ValueError:
-            return False
-        return True
+        text_fields = ['project_id_with_serial', 'module', 'type', 'variable_df_key_col_name', 'unit']
+        for batch in batches:
+            numeric_value = batch['numeric_value']
+            numeric_value = np.where(np.isnan(numeric_value), None, numeric_value)
+            columns = [batch[field].tolist() for field in text_fields]
+            columns.append(numeric_value.tolist())
+            columns.append(batch['non_numeric_value'].tolist())
+            yield from zip(*columns)
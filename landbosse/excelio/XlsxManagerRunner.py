@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 
+from ..model import CostRecords, DetailRecords, CraneSelectionRecords
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
@@ -14,7 +16,8 @@ class XlsxManagerRunner:
     or parallel manager runner is needed.
     """
 
-    def __init__(self, file_ops=None):
+    def __init__(self, file_ops=None, incremental=False, detail_level='full', result_sink=None, lcoe_calculator=None,
+                 chunk_size=10000):
         """
         The constructor simply creates an XlsxFileOperations instance
         to live throughout the lifetime of the instance
@@ -25,8 +28,124 @@ class XlsxManagerRunner:
             The file operation instance used to create filenames. If this
             is left at the default of None, a new instance of
             XlsxFileOperations is created.
+
+        incremental : bool
+            If True, the projects are reordered so that consecutive
+            projects differ in as few parametric values as possible, and
+            each Manager shares a ModuleOutputCache so that cost modules
+            whose inputs did not change are not run again. Results are
+            the same as with incremental=False, but they are listed in
+            the order the projects were run.
+
+        detail_level : str
+            How much of the details output to make: 'none', 'summary' or
+            'full'. It is passed to each Manager. With 'none', the details
+            are not collected and the details list of the result is empty.
+
+        result_sink : ResultSink
+            If given, the costs and details of each project are written to
+            this sink as soon as the project has run, and are not kept in
+            memory. The extended project list is written to it one chunk
+            at a time. The cost and details lists and the extended project
+            list of the result are then empty.
+
+        lcoe_calculator : LcoeCalculator
+            If given, the costs of each project are added to this
+            calculator as soon as the project has run, and the result has
+            the LCOE of every project under the key 'lcoe'.
+
+        chunk_size : int
+            The number of rows of the extended project list that are made
+            and prepared at a time. The grid of parametric values is
+            calculated one chunk at a time as the projects run, so large
+            grids neither wait for nor hold the whole extended project
+            list. In incremental mode, each chunk is reordered separately.
         """
         self.file_ops = file_ops if file_ops is not None else XlsxFileOperations()
+        self.incremental = incremental
+        self.detail_level = detail_level
+        self.result_sink = result_sink
+        self.lcoe_calculator = lcoe_calculator
+        self.chunk_size = chunk_size
+
+    def collect_project_result(self, runs_dict, project_id_with_serial, output_dict):
+        """
+        Handles the output dictionary of a project that has just run. Its
+        costs are added to the LCOE calculator, if there is one. If
+        there is a result sink, the costs and details of the project are
+        written to it and only the crane selection of the project is kept
+        in runs_dict. Otherwise, the output dictionary is added to
+        runs_dict to be extracted at the end of the run.
+
+        Parameters
+        ----------
+        runs_dict : dict
+            The output dictionaries of the projects that have run, keyed by
+            project name.
+
+        project_id_with_serial : str
+            The name of the project.
+
+        output_dict : dict
+            The output dictionary of the project.
+        """
+        if self.lcoe_calculator is not None:
+            self.lcoe_calculator.add_costs(self.extract_module_type_operation_lists({project_id_with_serial: output_dict}))
+
+        if self.result_sink is None:
+            runs_dict[project_id_with_serial] = output_dict
+        else:
+            project_runs_dict = {project_id_with_serial: output_dict}
+            self.result_sink.write(
+                costs=self.extract_module_type_operation_lists(project_runs_dict),
+                details=self.extract_details_lists(project_runs_dict)
+            )
+            # The crane selection is a few rows per project, so it is kept
+            # for the crane selection output at the end of the run.
+            runs_dict[project_id_with_serial] = {
+                key: value for key, value in output_dict.items() if key.endswith('_crane_selection')
+            }
+
+    def collect_extended_project_list(self, extended_project_lists, project_parameters):
+        """
+        Handles the project parameters of a chunk of projects after their
+        parametric modifications. If there is a result sink, they are
+        written to it at once. Otherwise, they are added to
+        extended_project_lists to be concatenated at the end of the run.
+
+        Parameters
+        ----------
+        extended_project_lists : list
+            The chunks of the extended project list so far.
+
+        project_parameters : pd.DataFrame
+            The modified project parameters of the projects of the chunk.
+        """
+        if len(project_parameters) == 0:
+            return
+        extended_project_list = project_parameters
+        if self.result_sink is None:
+            extended_project_lists.append(extended_project_list)
+        else:
+            self.result_sink.write_extended_project_list(extended_project_list)
+
+    def concatenate_extended_project_lists(self, extended_project_lists):
+        """
+        Parameters
+        ----------
+        extended_project_lists : list
+            The chunks of the extended project list collected with
+            collect_extended_project_list().
+
+        Returns
+        -------
+        pd.DataFrame
+            The extended project list of the run. It is empty when the
+            chunks were written to a result sink.
+        """
+        if len(extended_project_lists) == 0:
+            return pd.DataFrame()
+        return pd.concat(extended_project_lists, sort=False)
 
     def run_from_project_list_xlsx(self, projects_xlsx,  enable_cost_and_scaling_modifications=True):
         """
@@ -73,6 +192,35 @@ class XlsxManagerRunner:
         """
         raise NotImplementedError('run_from_project_list_xlsx() can only be called on subclasses')
 
+    def run_extended_project_list(self, extended_project_list_chunks, enable_cost_and_scaling_modifications=False):
+        """
+        Runs the projects of an extended project list that is already made,
+        rather than read from the project list xlsx. run_from_project_list_xlsx()
+        calls this with the chunks it reads. This is implemented by
+        subclasses.
+
+        Parameters
+        ----------
+        extended_project_list_chunks : iterable
+            The extended project list, as chunks of pandas.DataFrame with
+            the columns of read_project_and_parametric_list_from_xlsx().
+
+        enable_cost_and_scaling_modifications : bool
+            See run_from_project_list_xlsx()
+
+        Returns
+        -------
+        dict
+            The final result, as described in run_from_project_list_xlsx()
+
+        Raises
+        ------
+        NotImplementedError
+            NotImplementedError is raised if the method is called on the
+            superclass.
+        """
+        raise NotImplementedError('run_extended_project_list() can only be called on subclasses')
+
     def extract_module_type_operation_lists(self, runs_dict):
         """
         This method extract all the cost_by_module_type_operation lists for
@@ -85,20 +233,20 @@ class XlsxManagerRunner:
         Parameters
         ----------
         runs_dict : dict
-            Values are the names of the projects. Keys are the lists of
-            dictionaries that are lines for the .csv
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects, which hold CostRecords.
 
         Returns
         -------
-        list
-            List of dicts to write to the .csv.
+        CostRecords
+            The cost records of all the projects to write to the .csv.
         """
-        result = []
+        records = []
         for project_results in runs_dict.values():
             for key, value in project_results.items():
                 if key.endswith('_module_type_operation'):
-                    result.extend(value)
-        return result
+                    records.append(value)
+        return CostRecords.concatenate(records)
 
     def extract_details_lists(self, runs_dict):
         """
@@ -112,20 +260,46 @@ class XlsxManagerRunner:
         Parameters
         ----------
         runs_dict : dict
-            Values are the names of the projects. Keys are the lists of
-            dictionaries that are lines for the .csv
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects, which hold DetailRecords under
+            the keys ending in '_csv'.
 
         Returns
         -------
-        list
-            List of dicts to write to the .csv.
+        DetailRecords
+            The detail records of all the projects.
         """
-        runs_for_csv = []
+        records = []
+        if self.detail_level == 'none':
+            return DetailRecords.concatenate(records)
         for project_results in runs_dict.values():
             for key, value in project_results.items():
                 if key.endswith('_csv'):
-                    runs_for_csv.extend(value)
-        return runs_for_csv
+                    records.append(value)
+        return DetailRecords.concatenate(records)
+
+    def extract_crane_selection_lists(self, runs_dict):
+        """
+        This method extracts the crane selection of every project, which
+        ErectionCost puts under the key 'erection_crane_selection'.
+
+        Parameters
+        ----------
+        runs_dict : dict
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects.
+
+        Returns
+        -------
+        CraneSelectionRecords
+            The crane selection records of all the projects.
+        """
+        records = []
+        for project_results in runs_dict.values():
+            for key, value in project_results.items():
+                if key.endswith('_crane_selection'):
+                    records.append(value)
+        return CraneSelectionRecords.concatenate(records)
 
     def read_project_and_parametric_list_from_xlsx(self):
         """
@@ -153,6 +327,51 @@ class XlsxManagerRunner:
             The enhanced project list that has support for all parametric
             adjustments for each step.
 
+        Raises
+        ------
+        KeyError
+            When the spreadsheet contains multiple sheets and one or
+            both of "Project list" or "Parametric list" are undefined.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_sheets()
+
+        # Instantiate and XlsxReader to assemble master input dictionary
+        xlsx_reader = XlsxReader()
+
+        # Join in the parametric variable modifications
+        parametric_value_list = xlsx_reader.create_parametric_value_list(parametric_list)
+        extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list,
+                                                                                 parametric_value_list)
+
+        return extended_project_list
+
+    def iter_project_and_parametric_list_from_xlsx(self):
+        """
+        Same as read_project_and_parametric_list_from_xlsx(), but yields
+        the extended project list in chunks of at most chunk_size rows as
+        they are needed. See XlsxReader.iter_extended_project_list().
+
+        Yields
+        ------
+        pandas.DataFrame
+            The next rows of the extended project list.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_sheets()
+        xlsx_reader = XlsxReader()
+        yield from xlsx_reader.iter_extended_project_list(project_list, parametric_list, self.chunk_size)
+
+    def read_project_and_parametric_sheets(self):
+        """
+        Reads the project list and parametric list sheets of the
+        project_list xlsx, as described in
+        read_project_and_parametric_list_from_xlsx().
+
+        Returns
+        -------
+        pandas.DataFrame, pandas.DataFrame
+            The project list and the parametric list, which is empty if
+            the spreadsheet has one sheet.
+
         Raises
         ------
         KeyError
@@ -177,12 +396,46 @@ class XlsxManagerRunner:
         else:
             raise KeyError("Project list needs to have a single sheet or sheets named 'Project list' and 'Parametric list'.")
 
-        # Instantiate and XlsxReader to assemble master input dictionary
-        xlsx_reader = XlsxReader()
+        return project_list, parametric_list
 
-        # Join in the parametric variable modifications
-        parametric_value_list = xlsx_reader.create_parametric_value_list(parametric_list)
-        extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list,
-                                                                                 parametric_value_list)
+    def order_for_incremental_evaluation(self, extended_project_list):
+        """
+        Reorders the extended project list so that consecutive rows of the
+        same project differ in as few parametric values as possible.
 
-        return extended_project_list
+        Within each project, the grid of parametric values is walked in
+        "snake" order: every parametric column still varies in turn, but
+        the direction of a column reverses each time a column to its left
+        changes. For a full grid, this means that each row differs from the
+        previous one in exactly one parametric value, which is what lets
+        a ModuleOutputCache skip the cost modules that do not depend on
+        that value.
+
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The extended project list returned by
+            read_project_and_parametric_list_from_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame
+            The same rows in the new order.
+        """
+        parametric_columns = [column for column in extended_project_list.columns
+                              if isinstance(column, str) and len(column.split('/')) == 3]
+        if len(parametric_columns) == 0 or len(extended_project_list) < 2:
+            return extended_project_list
+
+        project_order, _ = pd.factorize(extended_project_list['Project ID'])
+        sort_keys = [project_order]
+        preceding_ranks = np.zeros(len(extended_project_list), dtype=int)
+        for column in parametric_columns:
+            ranks = extended_project_list[column].rank(method='dense').fillna(1).to_numpy(dtype=int) - 1
+            snake_ranks = np.where(preceding_ranks % 2 == 0, ranks, ranks.max() - ranks)
+            sort_keys.append(snake_ranks)
+            preceding_ranks += ranks
+
+        # np.lexsort() sorts by the last key first.
+        order = np.lexsort(sort_keys[::-1])
+        return extended_project_list.iloc[order]
@@ -1,11 +1,11 @@
 import os
+import math
 from concurrent import futures
 
-import pandas as pd
-
-from ..model import Manager
+from ..model import Manager, ModuleOutputCache
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
+from .ProjectInputRecord import ProjectInputRecord
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxGenerator import XlsxGenerator
@@ -48,10 +48,31 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
             is the list of rows for the csv. The third element is the list
             of costs for the spreadsheets.
         """
-        # Load the project list
-        print('Calculating parametric values')
-        extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
+        return self.run_extended_project_list(self.iter_project_and_parametric_list_from_xlsx(),
+                                              enable_cost_and_scaling_modifications)
 
+    def run_extended_project_list(self, extended_project_list_chunks, enable_cost_and_scaling_modifications=False):
+        """
+        Runs the projects of an extended project list, such as the chunks
+        read by run_from_project_list_xlsx() or the points of an
+        AdaptiveSweep. This is a concrete implementation of the super
+        class method.
+
+        Parameters
+        ----------
+        extended_project_list_chunks : iterable
+            The extended project list, as chunks of pandas.DataFrame.
+
+        enable_cost_and_scaling_modifications : bool
+            If True, this method modifies each row of the project list AFTER it has been
+            modified by the parameters for to scale certain input values based
+            on what has been parametrically modified.
+
+        Returns
+        -------
+        dict
+            The final result, as described in run_from_project_list_xlsx()
+        """
         # Prepare the file operations
         file_ops = XlsxFileOperations()
 
@@ -59,68 +80,109 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
         # dictionaries
         xlsx_reader = XlsxReader()
 
-        # Get a list ready to hold the project parameters after they have been modified
-        # After all rows have been added to this list (each row is a series) then the
-        # whole list will be transformed into a dataframe.
-        #
-        # See notes at https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.append.html
-        # for why this is more performant than appending to a dataframe.
-        extended_project_list_after_parameter_modifications = []
-
-        # Prep all task for the executor
-        all_tasks = []
-        print(f'Found {len(extended_project_list_before_parameter_modifications)} projects for execution')
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
-
-            # If project_parameters['Project ID with serial'] is null, that means there are no
-            # parametric modifications to the project data dataframes. Hence,
-            # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
-
-            print(f'Preparing {project_id_with_serial}')
-
-            project_data_basename = project_parameters['Project data file']
-            task = dict()
-
-            task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(task['project_data_sheets'], project_parameters)
-
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
-
-            # Append the modified project parameters
-            extended_project_list_after_parameter_modifications.append(project_parameters)
-
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
-
-            task['project_data_basename'] = project_data_basename
-            task['project_id_with_serial'] = project_id_with_serial
-            task['project_series'] = project_parameters
-            all_tasks.append(task)
-
-        # Execute every project
-        with futures.ProcessPoolExecutor() as executor:
-            executor_result = executor.map(run_single_project, all_tasks)
+        # Get a list ready to hold the chunks of the extended project list
+        # after the project parameters have been modified.
+        extended_project_lists = []
 
         # Get the output dictionary ready
-        runs_dict = {project_id_with_serial: result for project_id_with_serial, result in executor_result}
+        runs_dict = dict()
+
+        # The project list is loaded and the tasks are prepared one chunk at
+        # a time. The tasks of each chunk are handed to the executor before
+        # the results of the previous chunk are collected, so the processes
+        # stay busy while the next chunk is prepared, and at most two chunks
+        # of tasks are held at once. Results are collected as they arrive so
+        # that a result sink can write them while other projects are still
+        # running.
+        print('Calculating parametric values')
+        with futures.ProcessPoolExecutor() as executor:
+            pending_results = iter(())
+            for extended_project_list_before_parameter_modifications in extended_project_list_chunks:
+
+                # In incremental mode, order the projects so that consecutive runs
+                # share as many inputs as possible.
+                if self.incremental:
+                    extended_project_list_before_parameter_modifications = \
+                        self.order_for_incremental_evaluation(extended_project_list_before_parameter_modifications)
+
+                # Apply the parametric modifications of the project list, and
+                # the cost and scaling modifications if needed, to the whole
+                # chunk at once, then validate the inputs of every project in
+                # one pass.
+                extended_project_list_after_parameter_modifications = \
+                    xlsx_reader.modify_project_list(extended_project_list_before_parameter_modifications)
+                if enable_cost_and_scaling_modifications:
+                    xlsx_reader.apply_cost_and_scaling_modifications_to_extended_project_list(
+                        extended_project_list_after_parameter_modifications)
+                project_records = ProjectInputRecord.from_extended_project_list(extended_project_list_after_parameter_modifications)
+
+                # If 'Project ID with serial' is null, that means there are no
+                # parametric modifications to the project data dataframes. Hence,
+                # just the plain Project ID without a serial number should be used.
+                project_ids_with_serial = extended_project_list_after_parameter_modifications['Project ID with serial'].where(
+                    extended_project_list_after_parameter_modifications['Project ID with serial'].notnull(),
+                    extended_project_list_after_parameter_modifications['Project ID']
+                ).tolist()
+                project_data_basenames = extended_project_list_after_parameter_modifications['Project data file'].tolist()
+                columns = extended_project_list_after_parameter_modifications.columns
+                rows_values = extended_project_list_after_parameter_modifications.to_numpy(dtype=object)
+
+                # Prep all task for the executor
+                all_tasks = []
+                print(f'Found {len(extended_project_list_before_parameter_modifications)} projects for execution')
+                for project_id_with_serial, project_data_basename, project_record, values in \
+                        zip(project_ids_with_serial, project_data_basenames, project_records, rows_values):
+
+                    print(f'Preparing {project_id_with_serial}')
+
+                    task = dict()
+
+                    task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+
+                    # Transform the dataframes so that they have the right values for
+                    # the parametric variables.
+                    xlsx_reader.modify_project_data(task['project_data_sheets'], columns, values, project_data_basename)
+
+                    # Write all project_data sheets
+                    parametric_project_data_path = \
+                        os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+                    XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
+
+                    task['project_data_basename'] = project_data_basename
+                    task['project_id_with_serial'] = project_id_with_serial
+                    task['project_record'] = project_record
+                    task['incremental'] = self.incremental
+                    task['detail_level'] = self.detail_level
+                    all_tasks.append(task)
+
+                self.collect_extended_project_list(extended_project_lists, extended_project_list_after_parameter_modifications)
+
+                # Execute every project of the chunk. In incremental mode, hand
+                # each process one contiguous run of projects so that its module
+                # cache gets reused.
+                if self.incremental:
+                    chunksize = max(1, math.ceil(len(all_tasks) / (os.cpu_count() or 1)))
+                else:
+                    chunksize = 1
+                chunk_results = executor.map(run_single_project, all_tasks, chunksize=chunksize)
+
+                # Collect the results of the previous chunk.
+                for project_id_with_serial, result in pending_results:
+                    self.collect_project_result(runs_dict, project_id_with_serial, result)
+                pending_results = chunk_results
+
+            for project_id_with_serial, result in pending_results:
+                self.collect_project_result(runs_dict, project_id_with_serial, result)
 
         # Assemble the dictionary with content for the details, details with inputs,
         #  cost_by_module_type_operation and cost_by_module_type_operation_with_input tabs
         final_result = dict()
         final_result['details_list'] = self.extract_details_lists(runs_dict)
         final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
-        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        final_result['crane_selection_list'] = self.extract_crane_selection_lists(runs_dict)
+        if self.lcoe_calculator is not None:
+            final_result['lcoe'] = self.lcoe_calculator.lcoe()
+        final_result['extended_project_list'] = self.concatenate_extended_project_lists(extended_project_lists)
 
         # Return the runs for all the scenarios.
         return final_result
@@ -130,8 +192,13 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
 The following function is deliberately defined outside of the class.
 This makes it easier to think about it being a pure function for
 parallel processes.
+
+In incremental mode, each process keeps its own ModuleOutputCache in
+_module_cache for all the projects it runs.
 """
 
+_module_cache = None
+
 
 def run_single_project(task_dict):
     """
@@ -144,13 +211,19 @@ def run_single_project(task_dict):
         The filename for the input .xlsx that has all the dataframes
         for the for ErectionCost and FoundationCost
 
-    project_series : pd.Series
-        The series that has the non-dataframe values for each project,
+    project_record : ProjectInputRecord
+        The record that has the non-dataframe values for each project,
         including the project name.
 
     project_id : str
         The string that is the name of the project.
 
+    incremental : bool
+        If True, run the Manager with the module cache of this process.
+
+    detail_level : str
+        The detail level passed to the Manager.
+
     Basically, the map operation goes like this:
 
     task_dict -> master_input_dict -> master_output_dict
@@ -170,21 +243,30 @@ def run_single_project(task_dict):
         dictionary.
     """
     project_data_basename = task_dict['project_data_basename']
-    project_series = task_dict['project_series']
+    project_record = task_dict['project_record']
     project_id_with_serial = task_dict['project_id_with_serial']
     project_data_sheets = task_dict['project_data_sheets']
 
+    global _module_cache
+    if task_dict.get('incremental', False):
+        if _module_cache is None:
+            _module_cache = ModuleOutputCache()
+        module_cache = _module_cache
+    else:
+        module_cache = None
+
     # Log each project. Use print because it works better for multiple processes.
     print(f'Start {project_id_with_serial}, project data in {project_data_basename}')
 
     # Read the Excel
     xlsx_reader = XlsxReader()
-    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_series)
+    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_record)
 
     # Now run the manager and accumulate its result into the runs_dict
     output_dict = dict()
-    output_dict['project_series'] = project_series
-    mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
+    output_dict['project_record'] = project_record
+    mc = Manager(input_dict=master_input_dict, output_dict=output_dict, module_cache=module_cache,
+                 detail_level=task_dict.get('detail_level', 'full'))
     mc.execute_landbosse(project_name=project_id_with_serial)
 
     print(f'End {project_id_with_serial}')
@@ -8,6 +8,8 @@ from .XlsxOperationException import XlsxOperationException
 from .WeatherWindowCSVReader import read_weather_window, extend_weather_window
 from ..model import DefaultMasterInputDict
 from .GridSearchTree import GridSearchTree
+from .ParametricSampler import ParametricSampler
+from .ProjectInputRecord import ProjectInputRecord
 
 
 class XlsxReader:
@@ -58,6 +60,17 @@ class XlsxReader:
     possible.
     """
 
+    def __init__(self):
+        """
+        The reader keeps the cell specifications it has parsed, keyed by
+        the columns of the project parameters, and the positions of the
+        cells they point to, keyed by project data file, so that they are
+        parsed and found once per sweep rather than once per project. See
+        modify_project_data_and_project_list().
+        """
+        self._compiled_cell_specifications = dict()
+        self._cell_positions = dict()
+
     def create_parametric_value_list(self, parametric_list):
         """
         Assuming we have a "Parametric list" sheet/dataframe like the following
@@ -95,6 +108,12 @@ class XlsxReader:
         sorted alphabetically, they will end up in the same order as numeric
         sorting.
 
+        Instead of a full grid, the rows of a project can be sampled by
+        giving its rows of the parametric list a 'Sampling' method
+        ('latin hypercube', 'sobol' or 'random' rather than 'grid'), a
+        number of 'Samples' and a 'Seed'. The project then has one row for
+        each sample, with serial numbers as above. See ParametricSampler.
+
         Parameters
         ----------
         parametric_list : pandas.DataFrame
@@ -116,54 +135,97 @@ class XlsxReader:
                 }
             ])
 
-        all_parametric_value_rows = []
-
-        # Group all the projects by their ID and iterate over each group
-        group_by_project = parametric_list.groupby('Project ID')
-        for name, group in group_by_project:
+        # The serial numbers run across all the projects, so the total
+        # number of rows is needed before the rows are made.
+        grid_search_trees = self.create_grid_search_trees(parametric_list)
+        total_rows = sum(grid_search_tree.grid_size() for _, grid_search_tree, _ in grid_search_trees)
 
-            # For each group/project ID, build a new grid search tree
-            grid_search_tree = GridSearchTree(group)
-            grid = grid_search_tree.build_grid_tree_and_return_grid()
+        all_parametric_value_frames = []
+        for name, grid_search_tree, first_index in grid_search_trees:
 
-            # After the tree is built, make new rows that have individual
-            # parametric values.
-            #
-            # A grid_point is set of cell specifications and their values.
-            # given our example above, a grid point would be a list of
-            # dictionaries about dataframe cells to modify.
+            # Make the grid of the parametric values, with one column for
+            # each dataframe cell to modify. Given our example above, the
+            # rows of the grid would be:
             #
             # Grid point 0: alpha/fizz/buzz = 0, beta/foo/bar = 0
             # Grid point 1: alpha/fizz/buzz = 0, beta/foo/bar = 6
             # etc
-            parametric_value_rows = []
-            for grid_point in grid:
-                parametric_value_row = dict()
-                for axis in grid_point:
-                    parametric_value_row[axis['cell_specification']] = axis['value']
-                parametric_value_rows.append(parametric_value_row)
+            parametric_value_frame = grid_search_tree.grid_dataframe()
 
             # Assign the project ID to each row. Because of the grouping,
-            # tha name is the same as the project ID.
-            for parametric_value_row in parametric_value_rows:
-                parametric_value_row['Project ID'] = name
+            # tha name is the same as the project ID. Then create project
+            # names with serial numbers for each row.
+            parametric_value_frame['Project ID'] = name
+            parametric_value_frame['Project ID with serial'] = self.create_serial_numbers(
+                name, first_index, len(parametric_value_frame), total_rows
+            )
+            all_parametric_value_frames.append(parametric_value_frame)
 
-            # Add all these new rows into the master list before
-            # iterating again.
-            all_parametric_value_rows.extend(parametric_value_rows)
+        # Concatenating the grids adds NaN where appropriate
+        result = pd.concat(all_parametric_value_frames, ignore_index=True, sort=False)
 
-        # Create project names with serial numbers for each row
-        for index, parametric_value_row in enumerate(all_parametric_value_rows):
-            project_id = parametric_value_row['Project ID']
-            serial = self.create_serial_number(project_id, index, len(all_parametric_value_rows))
-            parametric_value_row['Project ID with serial'] = serial
+        return result
 
-        # Make a dataframe out of the list of dictionaries. This will
-        # add NaN where appropriate
+    def create_grid_search_trees(self, parametric_list):
+        """
+        Makes a GridSearchTree for each project in the parametric list,
+        in the order of create_parametric_value_list(). Projects with a
+        'Sampling' method other than 'grid' get a ParametricSampler
+        instead, which samples the same cell specifications rather than
+        making every point of their grid.
 
-        result = pd.DataFrame(all_parametric_value_rows)
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The parametric list, as described in
+            create_parametric_value_list().
 
-        return result
+        Returns
+        -------
+        list
+            (Project ID, GridSearchTree or ParametricSampler, index of the
+            first row of the project) tuples. The serial numbers of the
+            rows of the project start at the index of its first row.
+        """
+        if parametric_list.empty:
+            return []
+        grid_search_trees = []
+        first_index = 0
+        for name, group in parametric_list.groupby('Project ID'):
+            sampling = group['Sampling'].dropna() if 'Sampling' in group.columns else []
+            if len(sampling) > 0 and str(sampling.iloc[0]).strip().lower() != 'grid':
+                grid_search_tree = ParametricSampler(group)
+            else:
+                grid_search_tree = GridSearchTree(group)
+            grid_search_trees.append((name, grid_search_tree, first_index))
+            first_index += grid_search_tree.grid_size()
+        return grid_search_trees
+
+    def create_serial_numbers(self, project_id, first_index, count, total_rows):
+        """
+        Creates the serial numbers of consecutive rows of a project in the
+        parametric value list.
+
+        Parameters
+        ----------
+        project_id : str
+            Base name of the project.
+
+        first_index : int
+            The index of the first row.
+
+        count : int
+            The number of rows.
+
+        total_rows : int
+            The number of rows of all the projects, for the padding.
+
+        Returns
+        -------
+        list
+            The serial numbers, as made by create_serial_number()
+        """
+        return [self.create_serial_number(project_id, index, total_rows) for index in range(first_index, first_index + count)]
 
     def outer_join_projects_to_parametric_values(self, project_list, parametric_value_list):
         """
@@ -235,7 +297,109 @@ class XlsxReader:
         result = project_list.merge(right=parametric_value_list, how='left', on='Project ID')
         return result
 
-    def modify_project_data_and_project_list(self, project_data_dataframes, project_parameters):
+    def iter_extended_project_list(self, project_list, parametric_list, chunk_size=10000):
+        """
+        Yields the extended project list of outer_join_projects_to_parametric_values()
+        in chunks, without making the whole parametric value list first.
+        The rows of the grid of each project are calculated as they are
+        needed, so even a parametric list with millions of grid points
+        starts running at once, and only one chunk is in memory at a time.
+
+        Concatenating the chunks gives the same rows, columns and order as
+
+        parametric_value_list = create_parametric_value_list(parametric_list)
+        outer_join_projects_to_parametric_values(project_list, parametric_value_list)
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list, as described in
+            create_parametric_value_list(). It may be empty.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            The next rows of the extended project list. Every chunk has
+            all the columns of the extended project list.
+        """
+        grid_search_trees = self.create_grid_search_trees(parametric_list)
+        total_rows = sum(grid_search_tree.grid_size() for _, grid_search_tree, _ in grid_search_trees)
+        grid_search_tree_by_project = {
+            name: (grid_search_tree, first_index) for name, grid_search_tree, first_index in grid_search_trees
+        }
+
+        # The columns are in the order the merge of the outer join makes
+        # them: the project list, then each project's cell specifications
+        # and the serial number after the first project's.
+        parametric_value_columns = []
+        for _, grid_search_tree, _ in grid_search_trees:
+            for column in grid_search_tree.cell_specifications() + ['Project ID with serial']:
+                if column not in parametric_value_columns:
+                    parametric_value_columns.append(column)
+        if len(parametric_value_columns) == 0:
+            parametric_value_columns = ['Project ID with serial']
+        columns = list(project_list.columns) + parametric_value_columns
+
+        chunk = []
+        chunk_rows = 0
+        rows_yielded = 0
+        for position in range(len(project_list)):
+            project_row = project_list.iloc[[position]]
+            project_id = project_row['Project ID'].iloc[0]
+
+            # Projects without parametric values have one row with no
+            # serial number.
+            if project_id not in grid_search_tree_by_project:
+                chunk.append(project_row)
+                chunk_rows += 1
+            else:
+                grid_search_tree, first_index = grid_search_tree_by_project[project_id]
+                grid_size = grid_search_tree.grid_size()
+                start = 0
+                while start < grid_size:
+                    stop = min(grid_size, start + chunk_size - chunk_rows)
+                    grid = grid_search_tree.grid_dataframe(start, stop)
+                    rows = project_row.iloc[[0] * len(grid)].reset_index(drop=True)
+                    for column in grid.columns:
+                        rows[column] = grid[column]
+                    rows['Project ID with serial'] = self.create_serial_numbers(
+                        project_id, first_index + start, len(grid), total_rows
+                    )
+                    chunk.append(rows)
+                    chunk_rows += len(grid)
+                    start = stop
+                    if chunk_rows >= chunk_size:
+                        yield self._extended_project_list_chunk(chunk, columns, rows_yielded)
+                        rows_yielded += chunk_rows
+                        chunk = []
+                        chunk_rows = 0
+
+            if chunk_rows >= chunk_size:
+                yield self._extended_project_list_chunk(chunk, columns, rows_yielded)
+                rows_yielded += chunk_rows
+                chunk = []
+                chunk_rows = 0
+
+        if chunk_rows > 0:
+            yield self._extended_project_list_chunk(chunk, columns, rows_yielded)
+
+    def _extended_project_list_chunk(self, rows, columns, first_index):
+        """
+        Concatenates the rows of a chunk of the extended project list and
+        gives it all the columns and the index of the whole list.
+        """
+        chunk = pd.concat(rows, ignore_index=True, sort=False).reindex(columns=columns)
+        chunk.index = pd.RangeIndex(first_index, first_index + len(chunk))
+        return chunk
+
+    def modify_project_data_and_project_list(self, project_data_dataframes, project_parameters,
+                                             project_data_basename=None):
         """
         This method modifies project data dataframes according to the
         parametric modifications in the project parameters. It does not
@@ -251,6 +415,14 @@ class XlsxReader:
         Also, it modifies (once again in plance) the project parameters
         according to the parametrics.
 
+        The cell specifications among the columns of the project
+        parameters are parsed once for each set of columns (see
+        compile_cell_specifications()). If project_data_basename is given,
+        the rows and columns the cell specifications point to are also
+        found only once for each project data file (see locate_cell()),
+        so each modification is a positional assignment whose cost does
+        not depend on the size of the sheet.
+
         Parameters
         ----------
         project_data_dataframes : dict
@@ -263,6 +435,10 @@ class XlsxReader:
             create_parametric_value_list that have the values to
             placed into the dataframes.
 
+        project_data_basename : str
+            The name of the project data file the dataframes were read
+            from. If None, the cells are found again on every call.
+
         Returns
         -------
         None
@@ -275,56 +451,204 @@ class XlsxReader:
             is not found. The message is descriptive to help diagnose the
             problem during operation.
         """
-        # This is a regex to match a column name that specifies a change to make
-        # to a cell
-        cell_spec_re = re.compile('^.*/.*/.*$')
-
-        # Go through each project parameter
-        for index, value in project_parameters.iteritems():
-
-            # If the column specifies a cell to change in the dataframe
-            # or project list, inspect it to ensure it points somewhere
-            # valid and change the project list or the dataframe
-
-            if cell_spec_re.match(index) and not pd.isnull(value):
-                dataframe_name, row_name, column_name = index.split('/')
-
-                # First, branch on whether this a project list parameter
-                # or a dataframe parameter. First, if it is a project list
-                # parameter.
-                if dataframe_name == 'project list':
-                    if column_name not in project_parameters:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in project parameters'
-                        )
-                    if not pd.isnull(value):
-                        project_parameters[column_name] = value
-
-                # Second, if it is a dataframe parameter
-                else:
-                    # Check if dataframe exists
-                    if dataframe_name not in project_data_dataframes:
-                        raise XlsxOperationException(
-                            f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
-
-                    df = project_data_dataframes[dataframe_name]
-                    first_col = df.columns[0]
-
-                    # Check if row exists
-                    if df.loc[df[first_col] == row_name].empty:
-                        raise XlsxOperationException(
-                            f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
-
-                    # Check if column exists
-                    if df.loc[df[first_col] == row_name, column_name].empty:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
-
-                    # If all the above check pass, check to make sure the value is not nan.
-                    # If it is not nan, then a modification needs to be made, either to the
-                    # dataframe or the project list.
-                    if not pd.isnull(value):
-                        df.loc[df[first_col] == row_name, column_name] = value
+        values = project_parameters.to_numpy()
+
+        # First, go through each project list parameter that has a value
+        # for this project
+        for position, dataframe_name, _, column_name in self.compile_cell_specifications(project_parameters.index):
+            value = values[position]
+            if pd.isnull(value):
+                continue
+            if dataframe_name == 'project list':
+                if column_name not in project_parameters:
+                    raise XlsxOperationException(
+                        f'Column {column_name} not found in project parameters'
+                    )
+                project_parameters[column_name] = value
+
+        # Second, the dataframe parameters
+        self.modify_project_data(project_data_dataframes, project_parameters.index, values, project_data_basename)
+
+    def modify_project_data(self, project_data_dataframes, columns, values, project_data_basename=None):
+        """
+        This method modifies project data dataframes according to the
+        cell specifications of one row of the extended project list. Cell
+        specifications of the project list itself are skipped, because
+        they are applied to the whole extended project list at once by
+        modify_project_list().
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys in this dictionary are the names of the sheets where
+            the dataframes are parsed from. Values are the dataframes
+            to be modified.
+
+        columns : pandas.Index
+            The columns of the extended project list.
+
+        values : np.ndarray
+            The values of the row of the project, in the order of columns.
+
+        project_data_basename : str
+            The name of the project data file the dataframes were read
+            from. If None, the cells are found again on every call.
+
+        Returns
+        -------
+        None
+            Dataframes are modified in place.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a dataframe, row or column is not found.
+        """
+        for position, dataframe_name, row_name, column_name in self.compile_cell_specifications(columns):
+            value = values[position]
+            if dataframe_name == 'project list' or pd.isnull(value):
+                continue
+            rows, cell_columns = self.locate_cell(project_data_dataframes, dataframe_name, row_name, column_name,
+                                                  project_data_basename)
+            project_data_dataframes[dataframe_name].iloc[rows, cell_columns] = value
+
+    def modify_project_list(self, extended_project_list):
+        """
+        This method applies the cell specifications of the project list
+        itself, such as "project list/x/Hub height m", to every row of
+        an extended project list at once, one column at a time. Rows whose
+        cell specification is empty keep their value.
+
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The extended project list, as created by
+            create_parametric_value_list.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A copy of the extended project list with the modified values.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a cell specification has values for a column that is not in
+            the project list.
+        """
+        modified_project_list = extended_project_list.copy()
+        for position, dataframe_name, _, column_name in self.compile_cell_specifications(extended_project_list.columns):
+            if dataframe_name != 'project list':
+                continue
+            cell_values = extended_project_list.iloc[:, position]
+            modified = cell_values.notnull()
+            if column_name not in modified_project_list.columns:
+                if not modified.any():
+                    continue
+                raise XlsxOperationException(
+                    f'Column {column_name} not found in project parameters'
+                )
+            # The column is replaced even when none of the rows is
+            # modified, so that it gets the type of the cell specification
+            # in every chunk of an extended project list.
+            modified_project_list[column_name] = cell_values.where(modified, modified_project_list[column_name])
+        return modified_project_list
+
+    def compile_cell_specifications(self, columns):
+        """
+        Finds the columns of the project parameters that specify a change
+        to a cell, named like "dataframe name/row name/column name", and
+        splits them. The result is kept, so each set of columns is parsed
+        once.
+
+        Parameters
+        ----------
+        columns : pandas.Index
+            The columns of the project parameters.
+
+        Returns
+        -------
+        list
+            (position, dataframe_name, row_name, column_name) tuples, one
+            for each cell specification, in the order of the columns.
+            position is the position of the column.
+        """
+        key = tuple(columns)
+        compiled = self._compiled_cell_specifications.get(key)
+        if compiled is None:
+            # This is a regex to match a column name that specifies a change to make
+            # to a cell
+            cell_spec_re = re.compile('^.*/.*/.*$')
+            compiled = []
+            for position, column in enumerate(columns):
+                if cell_spec_re.match(column):
+                    dataframe_name, row_name, column_name = column.split('/')
+                    compiled.append((position, dataframe_name, row_name, column_name))
+            self._compiled_cell_specifications[key] = compiled
+        return compiled
+
+    def locate_cell(self, project_data_dataframes, dataframe_name, row_name, column_name, project_data_basename=None):
+        """
+        Finds the rows whose first column is row_name and the column named
+        column_name in a project data dataframe. If project_data_basename
+        is given, the positions are kept for the next project with the
+        same project data file.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            The project data dataframes, keyed by sheet name.
+
+        dataframe_name : str
+            The sheet of the cell.
+
+        row_name : str
+            The value of the first column of the row of the cell.
+
+        column_name : str
+            The column of the cell.
+
+        project_data_basename : str
+            The name of the project data file, or None to not keep the
+            positions.
+
+        Returns
+        -------
+        np.ndarray, int or np.ndarray
+            The positions of the rows and of the column, for iloc.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the dataframe, row or column is not found.
+        """
+        key = (project_data_basename, dataframe_name, row_name, column_name)
+        if project_data_basename is not None and key in self._cell_positions:
+            return self._cell_positions[key]
+
+        # Check if dataframe exists
+        if dataframe_name not in project_data_dataframes:
+            raise XlsxOperationException(
+                f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
+
+        df = project_data_dataframes[dataframe_name]
+
+        # Check if row exists
+        rows = np.flatnonzero((df.iloc[:, 0] == row_name).to_numpy())
+        if len(rows) == 0:
+            raise XlsxOperationException(
+                f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
+
+        # Check if column exists
+        columns = np.flatnonzero(df.columns == column_name)
+        if len(columns) == 0:
+            raise XlsxOperationException(
+                f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
+
+        positions = rows, int(columns[0]) if len(columns) == 1 else columns
+        if project_data_basename is not None:
+            self._cell_positions[key] = positions
+        return positions
 
     def create_master_input_dictionary(self, project_data_dataframes, project_parameters):
         """
@@ -339,13 +663,14 @@ class XlsxReader:
             are names of sheets and the values are the dataframe contents of
             the sheets.
 
-        project_parameters : pandas.Series
+        project_parameters : pandas.Series or ProjectInputRecord
             Series representing the project data, which is the second set
             of data described in the XlsxReader class docstring. The caller
             of this function is responsible for parsing out the project
             data into a series from which these data can be extracted.
             See the subclasses of XlsxManagerRunner for examples on how this
-            project series is read from a spreadsheet.
+            project series is read from a spreadsheet. A series is
+            validated and turned into a ProjectInputRecord first.
 
         Returns
         -------
@@ -366,8 +691,15 @@ class XlsxReader:
         # The erection module takes in a bunch of keys and values under the
         # 'project_data' key in the incomplete_input_dict
 
+        # Validate the inputs from the project list before anything else
+        # is done with them.
+        if isinstance(project_parameters, ProjectInputRecord):
+            project_input_record = project_parameters
+        else:
+            project_input_record = ProjectInputRecord.from_project_parameters(project_parameters)
+
         # Apply the labor multipliers
-        labor_cost_multiplier = project_parameters['Labor cost multiplier']
+        labor_cost_multiplier = project_input_record.labor_cost_multiplier
         self.apply_labor_multiplier_to_project_data_dict(project_data_dataframes, labor_cost_multiplier)
 
         erection_input_worksheets = [
@@ -405,50 +737,18 @@ class XlsxReader:
 
         incomplete_input_dict['cable_specs_pd'] = project_data_dataframes['cable_specs']
 
-        # For development cost, legacy input data will specify an itemized
+        # These come from the columns in the project definition .xlsx. For
+        # development cost, legacy input data will specify an itemized
         # breakdown in the project data. Newer input data will specify the
         # labor cost in the project list.
         #
         # In the DevelopmentCost module, this change will be detected by the
         # absence of a development_labor_cost_usd key in the master input
         # dictionary. In that case, the development cost will be pulled from
-        # the prject data.
-        if 'Development labor cost USD' in project_parameters:
-            incomplete_input_dict['development_labor_cost_usd'] = project_parameters['Development labor cost USD']
-
-        # These columns come from the columns in the project definition .xlsx
-        incomplete_input_dict['project_id'] = project_parameters['Project ID']
-        incomplete_input_dict['crane_breakdown_fraction'] = project_parameters['Crane breakdown fraction']
-        incomplete_input_dict['num_turbines'] = project_parameters['Number of turbines']
-        incomplete_input_dict['construct_duration'] = project_parameters['Total project construction time (months)']
-        incomplete_input_dict['hub_height_meters'] = project_parameters['Hub height m']
-        incomplete_input_dict['rotor_diameter_m'] = project_parameters['Rotor diameter m']
-        incomplete_input_dict['wind_shear_exponent'] = project_parameters['Wind shear exponent']
-        incomplete_input_dict['turbine_rating_MW'] = project_parameters['Turbine rating MW']
-        incomplete_input_dict['breakpoint_between_base_and_topping_percent'] = \
-            project_parameters['Breakpoint between base and topping (percent)']
-        incomplete_input_dict['fuel_usd_per_gal'] = project_parameters['Fuel cost USD per gal']
-        incomplete_input_dict['rate_of_deliveries'] = project_parameters['Rate of deliveries (turbines per week)']
-        incomplete_input_dict['turbine_spacing_rotor_diameters'] = project_parameters['Turbine spacing (times rotor diameter)']
-        incomplete_input_dict['depth'] = project_parameters['Foundation depth m']
-        incomplete_input_dict['rated_thrust_N'] = project_parameters['Rated Thrust (N)']
-        incomplete_input_dict['bearing_pressure_n_m2'] = project_parameters['Bearing Pressure (n/m2)']
-        incomplete_input_dict['gust_velocity_m_per_s'] = project_parameters['50-year Gust Velocity (m/s)']
-        incomplete_input_dict['project_size_megawatts'] = project_parameters['Number of turbines'] * project_parameters['Turbine rating MW']
-
-        if project_parameters['Calculate road cost for distributed wind? (y/n)'] == 'y':
-            incomplete_input_dict['road_distributed_wind'] = True
-        else:
-            incomplete_input_dict['road_distributed_wind'] = False
-        incomplete_input_dict['site_prep_area_m2'] = project_parameters['Site prep area for Distributed wind (m2)']
-        incomplete_input_dict['road_length_adder_m'] = project_parameters['Road length adder (m)']
-        incomplete_input_dict['fraction_new_roads'] = project_parameters['Percent of roads that will be constructed']
-        incomplete_input_dict['road_quality'] = project_parameters['Road Quality (0-1)']
-        incomplete_input_dict['line_frequency_hz'] = project_parameters['Line Frequency (Hz)']
-        incomplete_input_dict['plant_capacity_MW'] = project_parameters['Turbine rating MW'] * project_parameters['Number of turbines']
-        incomplete_input_dict['row_spacing_rotor_diameters'] = project_parameters['Row spacing (times rotor diameter)']
-        incomplete_input_dict['user_defined_distance_to_grid_connection'] = project_parameters['Flag for user-defined home run trench length (0 = no; 1 = yes)']
-        incomplete_input_dict['distance_to_grid_connection_km'] = project_parameters['Combined Homerun Trench Length to Substation (km)']
+        # the prject data. Likewise, the markups are only present if the total
+        # management cost is not overridden.
+        incomplete_input_dict.update(project_input_record.to_master_input_dict())
+
         incomplete_input_dict['crew'] = incomplete_input_dict['project_data']['crew']
         incomplete_input_dict['crew_cost'] = incomplete_input_dict['project_data']['crew_price']
 
@@ -457,52 +757,10 @@ class XlsxReader:
         crew_cost = crew_cost.set_index("Labor type ID", drop=False)
         incomplete_input_dict['rsmeans_per_diem'] = crew_cost.loc['RSMeans', 'Per diem USD per day']
 
-        incomplete_input_dict['fuel_cost_usd_per_gal'] = project_parameters['Fuel cost USD per gal']
-
-        incomplete_input_dict['line_frequency_hz'] = project_parameters['Line Frequency (Hz)']
-        incomplete_input_dict['plant_capacity_MW'] = project_parameters['Turbine rating MW'] * project_parameters['Number of turbines']
-        incomplete_input_dict['row_spacing_rotor_diameters'] = project_parameters['Row spacing (times rotor diameter)']
-        incomplete_input_dict['user_defined_home_run_trench'] = project_parameters[
-            'Flag for user-defined home run trench length (0 = no; 1 = yes)']
-        incomplete_input_dict['trench_len_to_substation_km'] = project_parameters[
-            'Combined Homerun Trench Length to Substation (km)']
-
-        # Add inputs for transmission & Substation modules:
-        incomplete_input_dict['distance_to_interconnect_mi'] = project_parameters['Distance to interconnect (miles)']
-        incomplete_input_dict['interconnect_voltage_kV'] = project_parameters['Interconnect Voltage (kV)']
-        new_switchyard = True
-        if project_parameters['New Switchyard (y/n)'] == 'y':
-            new_switchyard = True
-        else:
-            new_switchyard = False
-        incomplete_input_dict['new_switchyard'] = new_switchyard
-
-        incomplete_input_dict['critical_speed_non_erection_wind_delays_m_per_s'] = project_parameters['Non-Erection Wind Delay Critical Speed (m/s)']
-        incomplete_input_dict['critical_height_non_erection_wind_delays_m'] = project_parameters['Non-Erection Wind Delay Critical Height (m)']
-
-        incomplete_input_dict['road_width_ft'] = project_parameters['Road width (ft)']
-        incomplete_input_dict['road_thickness'] = project_parameters['Road thickness (in)']
-        incomplete_input_dict['crane_width'] = project_parameters['Crane width (m)']
-        incomplete_input_dict['num_hwy_permits'] = project_parameters['Number of highway permits']
-        incomplete_input_dict['num_access_roads'] = project_parameters['Number of access roads']
-        incomplete_input_dict['overtime_multiplier'] = project_parameters['Overtime multiplier']
-        incomplete_input_dict['allow_same_flag'] = True if project_parameters['Allow same flag'] == 'y' else False
-
-        override_total_mgmt_cost_col_name = 'Override total management cost for distributed (0 does not override)'
-        if override_total_mgmt_cost_col_name in project_parameters and project_parameters[override_total_mgmt_cost_col_name] > 0:
-            incomplete_input_dict['override_total_management_cost'] = \
-                project_parameters[override_total_mgmt_cost_col_name]
-        else:
-            incomplete_input_dict['markup_contingency'] = project_parameters['Markup contingency']
-            incomplete_input_dict['markup_warranty_management'] = project_parameters['Markup warranty management']
-            incomplete_input_dict['markup_sales_and_use_tax'] = project_parameters['Markup sales and use tax']
-            incomplete_input_dict['markup_overhead'] = project_parameters['Markup overhead']
-            incomplete_input_dict['markup_profit_margin'] = project_parameters['Markup profit margin']
-
         # The weather window is stored on a sheet of the project_data, but
         # needs preprocessing after it is read. The preprocessing changes it
         # from wind toolkit format to a dataframe.
-        number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
+        number_of_months_for_construction = int(project_input_record.construct_duration)
         weather_window_input = project_data_dataframes['weather_window']
         weather_window_intermediate = read_weather_window(weather_window_input)
         extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
@@ -544,22 +802,12 @@ class XlsxReader:
 
         rsmeans = project_data_dict['rsmeans']
 
-        # This function maps new labor rates in rsmeans. Used with an apply()
-        # call, it will create a new Series that can be mapped back onto the
-        # original dataframe.
-        #
-        # If the column "Type of cost" is "Labor" then return the current cost
-        # times the labor multiplier. If "Type of cost" isn't "Labor" then
-        # just return the current cost.
-        def map_labor_rates(row):
-            if row['Type of cost'] == 'Labor':
-                return row['Rate USD per unit'] * labor_cost_multiplier
-            else:
-                return row['Rate USD per unit']
-
-        rsmeans_new_labor_rates = rsmeans.apply(map_labor_rates, axis=1)
-        rsmeans.drop(columns=['Rate USD per unit'], inplace=True)
-        rsmeans['Rate USD per unit'] = rsmeans_new_labor_rates
+        # Multiply the rates of the rows whose "Type of cost" is "Labor" and
+        # keep the other rates. The column is moved to the end of the
+        # dataframe, as it always has been.
+        labor = (rsmeans['Type of cost'] == 'Labor').to_numpy()
+        rates = rsmeans.pop('Rate USD per unit')
+        rsmeans['Rate USD per unit'] = np.where(labor, rates * labor_cost_multiplier, rates)
 
     def apply_cost_and_scaling_modifications_to_project_parameters(self, project_parameters):
         """
@@ -612,6 +860,51 @@ class XlsxReader:
         project_parameters['Number of access roads'] = number_of_access_roads
         project_parameters['Number of highway permits'] = number_of_highway_permits
 
+    def apply_cost_and_scaling_modifications_to_extended_project_list(self, extended_project_list):
+        """
+        This applies the same modifications as
+        apply_cost_and_scaling_modifications_to_project_parameters() to
+        every row of an extended project list at once, one column at a
+        time.
+
+        Note: It is meant to be called on the extended project list AFTER
+        it has been modified with the parametrics by modify_project_list().
+
+        It modifies the extended project list IN PLACE.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The extended project list to be modified.
+        """
+        num_turbines = extended_project_list['Number of turbines'].to_numpy()
+        nameplate = extended_project_list['Turbine rating MW'].to_numpy()
+        hub_height_m = extended_project_list['Hub height m'].to_numpy()
+        flag_use_user_homerun = extended_project_list['Flag for user-defined home run trench length (0 = no; 1 = yes)'].to_numpy()
+        project_size_MW = num_turbines * nameplate
+        small = project_size_MW <= 20
+
+        if (flag_use_user_homerun == 1).any():
+            extended_project_list['Combined Homerun Trench Length to Substation (km)'] = np.where(
+                flag_use_user_homerun == 1,
+                0.1776 * project_size_MW - 2.551,
+                extended_project_list['Combined Homerun Trench Length to Substation (km)']
+            )
+
+        extended_project_list['Rate of deliveries(turbines per week)'] = np.ceil(15 / nameplate).astype(int)
+        extended_project_list['Development labor cost USD'] = project_size_MW * 17000
+        extended_project_list['Project size MW'] = project_size_MW
+        extended_project_list['Distance to interconnect (miles)'] = np.where(small, 0.0, 0.009375 * project_size_MW + 0.625)
+        extended_project_list['Interconnect Voltage (kV)'] = 0.4398 * project_size_MW + 60.204
+        extended_project_list['New Switchyard (y/n)'] = np.where(project_size_MW <= 40, 'n', 'y').astype(object)
+        extended_project_list['Road length adder (m)'] = np.where(small, 1e3, 13.542 * project_size_MW + 1458.3)
+
+        # if greater than 20 MW, then breakpoint between base and topping at 35 meters
+        extended_project_list['Breakpoint between base and topping (percent)'] = np.where(small, 0.0, 35 / hub_height_m)
+
+        extended_project_list['Number of access roads'] = np.where(small, 0.0, np.ceil(0.0052 * project_size_MW + 0.7917))
+        extended_project_list['Number of highway permits'] = np.ceil(0.2 * num_turbines).astype(int)
+
     def create_serial_number(self, project_id, index, max_index):
         """
         create_serial_number creates serial numbers left padded with
@@ -1,11 +1,10 @@
 from collections import OrderedDict
 import os
 
-import pandas as pd
-
-from ..model import Manager
+from ..model import Manager, ModuleOutputCache
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
+from .ProjectInputRecord import ProjectInputRecord
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxGenerator import XlsxGenerator
@@ -50,9 +49,34 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             module_type_operation_lists, but every row has all the inputs
             on each row.
         """
-        # Load the project list
-        extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
-        print('>>> Project and parametric lists loaded')
+        return self.run_extended_project_list(self.iter_project_and_parametric_list_from_xlsx(),
+                                              enable_cost_and_scaling_modifications)
+
+    def run_extended_project_list(self, extended_project_list_chunks, enable_cost_and_scaling_modifications=False):
+        """
+        Runs the projects of an extended project list, such as the chunks
+        read by run_from_project_list_xlsx() or the points of an
+        AdaptiveSweep. This is a concrete implementation of the super
+        class method.
+
+        Parameters
+        ----------
+        extended_project_list_chunks : iterable
+            The extended project list, as chunks of pandas.DataFrame.
+
+        enable_cost_and_scaling_modifications : bool
+            If True, this method modifies each row of the project list AFTER it has been
+            modified by the parameters for to scale certain input values based
+            on what has been parametrically modified.
+
+        Returns
+        -------
+        dict
+            The final result, as described in run_from_project_list_xlsx()
+        """
+        # In incremental mode, share one cache of module outputs between
+        # all the runs.
+        module_cache = ModuleOutputCache() if self.incremental else None
 
         # For file operations
         file_ops = XlsxFileOperations()
@@ -63,68 +87,90 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
         # Instantiate and XlsxReader to assemble master input dictionary
         xlsx_reader = XlsxReader()
 
-        # Get a list ready to hold the project parameters after they have been modified
-        # After all rows have been added to this list (each row is a series) then the
-        # whole list will be transformed into a dataframe.
-        #
-        # See notes at https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.append.html
-        # for why this is more performant than appending to a dataframe.
-        extended_project_list_after_parameter_modifications = []
-
-        # Loop over every project
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
+        # Get a list ready to hold the chunks of the extended project list
+        # after the project parameters have been modified.
+        extended_project_lists = []
+
+        # Load the project list one chunk at a time, so that the projects
+        # start running before the whole parametric grid is made.
+        for extended_project_list_before_parameter_modifications in extended_project_list_chunks:
+            print(f'>>> {len(extended_project_list_before_parameter_modifications)} projects loaded')
+
+            # In incremental mode, order the projects so that consecutive
+            # runs share as many inputs as possible.
+            if self.incremental:
+                extended_project_list_before_parameter_modifications = \
+                    self.order_for_incremental_evaluation(extended_project_list_before_parameter_modifications)
+
+            # Apply the parametric modifications of the project list, and
+            # the cost and scaling modifications if needed, to the whole
+            # chunk at once, then validate the inputs of every project in
+            # one pass.
+            extended_project_list_after_parameter_modifications = \
+                xlsx_reader.modify_project_list(extended_project_list_before_parameter_modifications)
+            if enable_cost_and_scaling_modifications:
+                xlsx_reader.apply_cost_and_scaling_modifications_to_extended_project_list(
+                    extended_project_list_after_parameter_modifications)
+            project_records = ProjectInputRecord.from_extended_project_list(extended_project_list_after_parameter_modifications)
 
-            # If project_parameters['Project ID with serial'] is null, that means there are no
+            # If 'Project ID with serial' is null, that means there are no
             # parametric modifications to the project data dataframes. Hence,
             # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
-
-            project_data_basename = project_parameters['Project data file']
-
-            # Input path for unmodified project input data.
-            project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
-
-            # Log each project
-            print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
-            print('>>> project_id: {}'.format(project_id_with_serial))
-            print('>>> Project data: {}'.format(project_data_xlsx))
-
-            # Read the project data sheets.
-            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
-
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
-
-            # Append the modified project parameters
-            extended_project_list_after_parameter_modifications.append(project_parameters)
-
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
-
-            # Create the master input dictionary.
-            master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
-
-            # Now run the manager and accumulate its result into the runs_dict
-            output_dict = dict()
-            mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-            mc.execute_landbosse(project_name=project_id_with_serial)
-            output_dict['project_series'] = project_parameters
-            runs_dict[project_id_with_serial] = output_dict
+            project_ids_with_serial = extended_project_list_after_parameter_modifications['Project ID with serial'].where(
+                extended_project_list_after_parameter_modifications['Project ID with serial'].notnull(),
+                extended_project_list_after_parameter_modifications['Project ID']
+            ).tolist()
+            project_data_basenames = extended_project_list_after_parameter_modifications['Project data file'].tolist()
+            columns = extended_project_list_after_parameter_modifications.columns
+            rows_values = extended_project_list_after_parameter_modifications.to_numpy(dtype=object)
+
+            # Loop over every project
+            for project_id_with_serial, project_data_basename, project_record, values in \
+                    zip(project_ids_with_serial, project_data_basenames, project_records, rows_values):
+
+                # Input path for unmodified project input data.
+                project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
+
+                # Log each project
+                print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
+                print('>>> project_id: {}'.format(project_id_with_serial))
+                print('>>> Project data: {}'.format(project_data_xlsx))
+
+                # Read the project data sheets.
+                project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+
+                # Transform the dataframes so that they have the right values for
+                # the parametric variables.
+                xlsx_reader.modify_project_data(project_data_sheets, columns, values, project_data_basename)
+
+                # Write all project_data sheets
+                parametric_project_data_path = \
+                    os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+                XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
+
+                # Create the master input dictionary.
+                master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_record)
+
+                # Now run the manager and accumulate its result into the runs_dict
+                output_dict = dict()
+                mc = Manager(input_dict=master_input_dict, output_dict=output_dict, module_cache=module_cache,
+                             detail_level=self.detail_level)
+                mc.execute_landbosse(project_name=project_id_with_serial)
+                output_dict['project_record'] = project_record
+                self.collect_project_result(runs_dict, project_id_with_serial, output_dict)
+
+            self.collect_extended_project_list(extended_project_lists, extended_project_list_after_parameter_modifications)
+
+        if module_cache is not None:
+            print(f'>>> Module cache: {module_cache.hits} modules reused, {module_cache.misses} modules run')
 
         final_result = dict()
         final_result['details_list'] = self.extract_details_lists(runs_dict)
         final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
-        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        final_result['crane_selection_list'] = self.extract_crane_selection_lists(runs_dict)
+        if self.lcoe_calculator is not None:
+            final_result['lcoe'] = self.lcoe_calculator.lcoe()
+        final_result['extended_project_list'] = self.concatenate_extended_project_lists(extended_project_lists)
 
         # Return the runs for all the projects.
         return final_result
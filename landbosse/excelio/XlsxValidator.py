@@ -18,7 +18,7 @@ class XlsxValidator:
         expected_xlsx : str
             The absolute filename of the expected output .xlsx file.
 
-        actual_module_type_operation_list : str
+        actual_module_type_operation_list : CostRecords
             The module_type_operation_list as returned by a subclass of
             XlsxManagerRunner.
 
@@ -32,9 +32,9 @@ class XlsxValidator:
             True if the expected and actual results are equal. It returns
             False otherwise.
         """
-        # First, make the list of dictionaries into a dataframe, and drop
+        # First, make the cost records into a dataframe, and drop
         # the raw_cost and raw_cost_total_or_per_turbine columns.
-        actual_df = pd.DataFrame(actual_module_type_operation_list)
+        actual_df = actual_module_type_operation_list.to_dataframe()
         actual_df.drop(['raw_cost', 'raw_cost_total_or_per_turbine'], axis=1, inplace=True)
         expected_df = pd.read_excel(expected_xlsx, 'costs_by_module_type_operation')
         expected_df.rename(columns={
@@ -7,3 +7,6 @@ from .XlsxFileOperations import XlsxFileOperations
 from .XlsxValidator import XlsxValidator
 from .XlsxDataframeCache import XlsxDataframeCache
 from .CsvGenerator import CsvGenerator
+from .ParquetGenerator import ParquetGenerator
+from .ResultSink import ResultSink, CsvResultSink, ParquetResultSink
+from .ResultSink import DatabaseResultSink, SqliteResultSink, DuckDbResultSink, PostgresResultSink
@@ -17,7 +17,8 @@ import numpy as np
 import traceback
 import pandas as pd
 
-from .CostModule import CostModule
+from .CostModule import CostModule, CostTableBuilder
+from .ColumnarRecords import DetailRecordsBuilder, join_as_text
 from .WeatherDelay import WeatherDelay as WD
 
 
@@ -801,24 +802,18 @@ class ArraySystem(CostModule):
         calculate_costs_output_dict['Equipment Cost USD with weather delays'] = calculate_costs_output_dict['Equipment Cost USD without weather delays'] *  calculate_costs_output_dict['wind_multiplier']
 
         if calculate_costs_input_dict['turbine_rating_MW'] >= 0.1:
-            trenching_equipment_rental_cost_df = pd.DataFrame([['Equipment rental', calculate_costs_output_dict[
-                'Equipment Cost USD with weather delays'], 'Collection']],
-                                                              columns=['Type of cost', 'Cost USD',
-                                                                       'Phase of construction'])
+            trenching_equipment_rental_cost = ('Equipment rental', calculate_costs_output_dict[
+                'Equipment Cost USD with weather delays'], 'Collection')
 
         # switch for small DW
         else:
             if calculate_costs_output_dict['Equipment Cost USD with weather delays'] < 137:
                 calculate_costs_output_dict['Equipment Cost USD with weather delays'] = 137   #cost of renting for a day
-                trenching_equipment_rental_cost_df = pd.DataFrame([['Equipment rental', calculate_costs_output_dict[
-                    'Equipment Cost USD with weather delays'], 'Collection']],
-                                                                  columns=['Type of cost', 'Cost USD',
-                                                                           'Phase of construction'])
+                trenching_equipment_rental_cost = ('Equipment rental', calculate_costs_output_dict[
+                    'Equipment Cost USD with weather delays'], 'Collection')
             else:
-                trenching_equipment_rental_cost_df = pd.DataFrame([['Equipment rental', calculate_costs_output_dict[
-                    'Equipment Cost USD with weather delays'], 'Small DW Collection']],
-                                                                  columns=['Type of cost', 'Cost USD',
-                                                                           'Phase of construction'])
+                trenching_equipment_rental_cost = ('Equipment rental', calculate_costs_output_dict[
+                    'Equipment Cost USD with weather delays'], 'Small DW Collection')
 
         #Calculating labor cost:
         calculate_costs_output_dict['Days taken for trenching (labor)'] = ((calculate_costs_output_dict['trench_length_km'] / self._km_to_LF) / calculate_costs_output_dict['trenching_labor_daily_output'])
@@ -828,43 +823,38 @@ class ArraySystem(CostModule):
         calculate_costs_output_dict['Labor Cost USD with weather delays'] = calculate_costs_output_dict['Labor Cost USD without weather delays'] * calculate_costs_output_dict['wind_multiplier']
 
         if calculate_costs_input_dict['turbine_rating_MW'] >= 0.1:
-            trenching_labor_cost_df = pd.DataFrame(
-                [['Labor', calculate_costs_output_dict['Labor Cost USD with weather delays'], 'Collection']],
-                columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            trenching_labor_cost = ('Labor', calculate_costs_output_dict['Labor Cost USD with weather delays'], 'Collection')
 
         # switch for small DW
         else:
-            trenching_labor_cost_df = pd.DataFrame(
-                [['Labor', calculate_costs_output_dict['Labor Cost USD with weather delays'], 'Small DW Collection']],
-                columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            trenching_labor_cost = ('Labor', calculate_costs_output_dict['Labor Cost USD with weather delays'], 'Small DW Collection')
 
         #Calculate cable cost:
-        cable_cost_usd_per_LF_df = pd.DataFrame([['Materials',self._total_cable_cost, 'Collection']],
-                                               columns = ['Type of cost', 'Cost USD', 'Phase of construction'])
+        cable_cost_usd_per_LF = ('Materials', self._total_cable_cost, 'Collection')
 
         # Combine all calculated cost items into the 'collection_cost' dataframe:
-        collection_cost = pd.DataFrame([],columns = ['Type of cost', 'Cost USD', 'Phase of construction'])
-        collection_cost = collection_cost.append(trenching_equipment_rental_cost_df)
-        collection_cost = collection_cost.append(trenching_labor_cost_df)
-        collection_cost = collection_cost.append(cable_cost_usd_per_LF_df)
+        collection_cost = CostTableBuilder()
+        collection_cost.add_row(*trenching_equipment_rental_cost)
+        collection_cost.add_row(*trenching_labor_cost)
+        collection_cost.add_row(*cable_cost_usd_per_LF)
 
         # Calculate Mobilization Cost and add to collection_cost dataframe.
         # For utility scale plants, mobilization is assumed to be 5% of the sum of labor, equipment, and material costs.
         # For distributed mode, mobilization is a calculated % that is a function of turbine size.
         if calculate_costs_input_dict['num_turbines'] > 10:
-            calculate_costs_output_dict['mob_cost'] = collection_cost['Cost USD'].sum() * 0.05
+            calculate_costs_output_dict['mob_cost'] = collection_cost.column_sum('Cost USD') * 0.05
         else:
             if calculate_costs_input_dict['turbine_rating_MW'] >= 0.1:
-                calculate_costs_output_dict['mob_cost'] = collection_cost[
-                    'Cost USD'].sum() * self.mobilization_cost_multiplier(calculate_costs_input_dict['turbine_rating_MW'])
+                calculate_costs_output_dict['mob_cost'] = collection_cost.column_sum(
+                    'Cost USD') * self.mobilization_cost_multiplier(calculate_costs_input_dict['turbine_rating_MW'])
 
             # switch for small DW
             else:  # mobilization cost included in equipment rental cost
                 calculate_costs_output_dict['mob_cost'] = 0.0
 
-        mobilization_cost = pd.DataFrame([['Mobilization', calculate_costs_output_dict['mob_cost'], 'Collection']],
-                                         columns=['Type of cost', 'Cost USD', 'Phase of construction'])
-        collection_cost = collection_cost.append(mobilization_cost)
+        mobilization_cost = ('Mobilization', calculate_costs_output_dict['mob_cost'], 'Collection')
+        collection_cost.add_row(*mobilization_cost)
+        collection_cost = collection_cost.to_dataframe()
 
         calculate_costs_output_dict['total_collection_cost'] = collection_cost
 
@@ -872,79 +862,24 @@ class ArraySystem(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Creates the rows of the details output.
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
-        """
-        result = []
-        module = 'Collection Cost'
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total Number of Turbines',
-            'value': float(self.output_dict['total_turb'])
-        })
-
-        result.append({
-            'unit': 'km',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total trench length',
-            'value': float(self.output_dict['trench_length_km'])
-        })
-
-        result.append({
-            'unit': 'km',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total cable length',
-            'value': float(self.output_dict['total_cable_len_km'])
-        })
-
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Turbines Per String in Full String',
-            'value': float(self.output_dict['total_turb_per_string'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Full Strings',
-            'value': float(self.output_dict['num_full_strings'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Turbines in Partial String',
-            'value': float(self.output_dict['num_leftover_turb'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Partial Strings',
-            'value': float(self.output_dict['num_partial_strings'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total number of strings full + partial',
-            'value': float(self.output_dict['num_full_strings'] + self.output_dict['num_partial_strings'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Trench Length to Substation (km)',
-            'value': float(self.output_dict['distance_to_grid_connection_km'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Cable Length to Substation (km)',
-            'value': float(self.output_dict['cable_len_to_grid_connection_km'])
-        })
+        DetailRecords
+            The detail rows of this module.
+        """
+        details = DetailRecordsBuilder()
+        details.add_number('Total Number of Turbines', self.output_dict['total_turb'])
+        details.add_number('Total trench length', self.output_dict['trench_length_km'], unit='km')
+        details.add_number('Total cable length', self.output_dict['total_cable_len_km'], unit='km')
+        details.add_number('Number of Turbines Per String in Full String', self.output_dict['total_turb_per_string'])
+        details.add_number('Number of Full Strings', self.output_dict['num_full_strings'])
+        details.add_number('Number of Turbines in Partial String', self.output_dict['num_leftover_turb'])
+        details.add_number('Number of Partial Strings', self.output_dict['num_partial_strings'])
+        details.add_number('Total number of strings full + partial', self.output_dict['num_full_strings'] + self.output_dict['num_partial_strings'])
+        details.add_number('Trench Length to Substation (km)', self.output_dict['distance_to_grid_connection_km'])
+        details.add_number('Cable Length to Substation (km)', self.output_dict['cable_len_to_grid_connection_km'])
 
         cables = ''
         n = 1  # to keep tab of number of cables input by user.
@@ -956,72 +891,29 @@ class ArraySystem(CostModule):
 
             for variable, value in specs.__dict__.items():
                 if variable == 'array_cable_len':
-                    result.append({
-                        'unit': 'km',
-                        'type': 'variable',
-                        'variable_df_key_col_name': 'Array cable length for cable  ' + cable,
-                        'value': float(value)
-                    })
+                    details.add_number('Array cable length for cable  ' + cable, value, unit='km')
                 elif variable == 'total_length':
-                    result.append({
-                        'unit': 'km',
-                        'type': 'variable',
-                        'variable_df_key_col_name': 'Total cable length for cable  ' + cable,
-                        'value': float(value)
-                    })
-
+                    details.add_number('Total cable length for cable  ' + cable, value, unit='km')
                 elif variable == 'total_cost':
-                    result.append({
-                        'unit': 'usd',
-                        'type': 'variable',
-                        'variable_df_key_col_name': 'Total cable cost for cable  ' + cable,
-                        'value': float(value)
-                    })
+                    details.add_number('Total cable cost for cable  ' + cable, value, unit='usd')
             n += 1
 
-        result.append({
-            'unit': '',
-            'type': 'list',
-            'variable_df_key_col_name': 'Number of turbines per cable type in full strings [' + cables + ']',
-
-            'value': str(self.output_dict['num_turb_per_cable'])
-        })
-
-        if self.input_dict['turbine_rating_MW'] > 0.1:
-            for row in self.output_dict['management_crew'].itertuples():
-                dashed_row = ' <--> '.join(str(x) for x in list(row))
-                result.append({
-                    'unit': '',
-                    'type': 'dataframe',
-                    'variable_df_key_col_name': 'Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ',
-                    'value': dashed_row
-                })
-
-        result.append({
-            'unit': '',
-            'type': 'list',
-            'variable_df_key_col_name': 'Percent length of cable in partial string [' + cables + ']',
+        details.add_text('Number of turbines per cable type in full strings [' + cables + ']',
+                         str(self.output_dict['num_turb_per_cable']), row_type='list')
 
-            'value': str(self.output_dict['perc_partial_string'])
-        })
-
-
-
-        for row in self.output_dict['total_collection_cost'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+        if self.input_dict['turbine_rating_MW'] > 0.1 and self.detail_level() == 'full':
+            management_crew = self.output_dict['management_crew']
+            details.add_columns(
+                'Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ',
+                non_numeric_value=join_as_text([management_crew.index] + [management_crew[column] for column in management_crew.columns], ' <--> ')
+            )
 
+        details.add_text('Percent length of cable in partial string [' + cables + ']',
+                         str(self.output_dict['perc_partial_string']), row_type='list')
 
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
+        details.add_cost_dataframe(self.output_dict['total_collection_cost'])
 
+        result = details.build(self.project_name, 'Collection Cost')
         self.output_dict['collection_cost_csv'] = result
         return result
 
@@ -1063,7 +955,8 @@ class ArraySystem(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             self.output_dict['collection_cost_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_collection_cost'],
                 project_id=self.project_name,
@@ -0,0 +1,449 @@
+import numpy as np
+import pandas as pd
+
+
+class ColumnarRecords:
+    """
+    ColumnarRecords is the base class for the rows that cost modules
+    output for the cost and details tables. Rather than one dictionary
+    per row, the rows are stored as one numpy array per field (a "struct
+    of arrays"). This keeps the field names out of every row and lets
+    the records of many projects and modules be concatenated with a
+    handful of array operations.
+
+    Subclasses list their fields in the class attribute fields.
+    """
+
+    __slots__ = ('columns',)
+
+    fields = ()
+
+    def __init__(self, columns=None):
+        """
+        Parameters
+        ----------
+        columns : dict
+            Keys are the names in fields. Values are numpy arrays of the
+            same length. If None, the records are empty.
+        """
+        if columns is None:
+            columns = {field: np.empty(0, dtype=object) for field in self.fields}
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns[self.fields[0]])
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def __iter__(self):
+        return self.iter_rows()
+
+    @classmethod
+    def concatenate(cls, records):
+        """
+        Concatenates records, such as those from all the modules of all
+        the projects in a run.
+
+        Parameters
+        ----------
+        records : iterable
+            The ColumnarRecords to concatenate.
+
+        Returns
+        -------
+        ColumnarRecords
+            The records, in order, in a new instance of the class this
+            method is called on.
+        """
+        records = [record for record in records if len(record) > 0]
+        if len(records) == 0:
+            return cls()
+        return cls({field: np.concatenate([record.columns[field] for record in records]) for field in cls.fields})
+
+    def iter_rows(self):
+        """
+        Iterates over the rows as dictionaries keyed by field name. This
+        is slow and is meant only for code that still expects rows as
+        dictionaries.
+
+        Yields
+        ------
+        dict
+            One row.
+        """
+        for values in zip(*(self.columns[field] for field in self.fields)):
+            yield dict(zip(self.fields, values))
+
+    def relabel_project(self, project_id_with_serial):
+        """
+        Replaces the project name on every row, such as when outputs of one
+        project are reused for another.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The new project name.
+        """
+        self.columns['project_id_with_serial'] = _repeat(project_id_with_serial, len(self))
+
+    def to_dataframe(self, column_names=None):
+        """
+        Parameters
+        ----------
+        column_names : dict
+            Keys are field names and values are the column headings. Only
+            these fields are included, in the order of this dict. If None,
+            all fields are included under their field names.
+
+        Returns
+        -------
+        pd.DataFrame
+            The records as a dataframe.
+        """
+        if column_names is None:
+            column_names = {field: field for field in self.fields}
+        return pd.DataFrame({name: self.columns[field] for field, name in column_names.items()})
+
+
+class CostRecords(ColumnarRecords):
+    """
+    CostRecords are the rows of the costs_by_module_type_operation output.
+    Each row is one type of cost for one operation of one module of one
+    project.
+    """
+
+    __slots__ = ()
+
+    fields = (
+        'project_id_with_serial',
+        'num_turbines',
+        'turbine_rating_MW',
+        'rotor_diameter_m',
+        'module',
+        'operation_id',
+        'type_of_cost',
+        'raw_cost',
+        'raw_cost_total_or_per_turbine',
+        'cost_per_turbine',
+        'cost_per_project',
+        'usd_per_kw_per_project',
+    )
+
+    @classmethod
+    def from_costs(cls,
+                   *,
+                   project_id_with_serial,
+                   module,
+                   operation_id,
+                   type_of_cost,
+                   raw_cost,
+                   total_or_turbine,
+                   turbine_rating_MW,
+                   num_turbines,
+                   rotor_diameter_m):
+        """
+        Makes the cost records of one module of one project and calculates
+        the costs per turbine, per project and per kW.
+
+        It must be called with keyword arguments.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the project.
+
+        module : str
+            The name of the module.
+
+        operation_id : str or array-like
+            The operation of each cost, or one operation for all of them.
+
+        type_of_cost : array-like
+            The type of each cost.
+
+        raw_cost : array-like
+            The costs in USD.
+
+        total_or_turbine : bool
+            True if the costs are totals for the project. False if they
+            are per turbine.
+
+        turbine_rating_MW : float
+            Turbine rating in MW.
+
+        num_turbines : int
+            Number of turbines in the project.
+
+        rotor_diameter_m : float
+            Rotor diameter in m.
+
+        Returns
+        -------
+        CostRecords
+            The records.
+        """
+        raw_cost = np.array(raw_cost, dtype=float)
+        n = len(raw_cost)
+        project_size_kw = num_turbines * turbine_rating_MW * 1000
+
+        if total_or_turbine:  # If raw_cost is the total cost
+            cost_per_turbine = raw_cost / num_turbines
+            cost_per_project = raw_cost
+        else:                 # If raw_cost is per turbine
+            cost_per_turbine = raw_cost
+            cost_per_project = raw_cost * num_turbines
+
+        if isinstance(operation_id, str):
+            operation_id = _repeat(operation_id, n)
+
+        return cls({
+            'project_id_with_serial': _repeat(project_id_with_serial, n),
+            'num_turbines': _repeat(num_turbines, n),
+            'turbine_rating_MW': _repeat(turbine_rating_MW, n),
+            'rotor_diameter_m': _repeat(rotor_diameter_m, n),
+            'module': _repeat(module, n),
+            'operation_id': np.asarray(operation_id, dtype=object),
+            'type_of_cost': np.asarray(type_of_cost, dtype=object),
+            'raw_cost': raw_cost,
+            'raw_cost_total_or_per_turbine': _repeat('total' if total_or_turbine else 'turbine', n),
+            'cost_per_turbine': cost_per_turbine,
+            'cost_per_project': cost_per_project,
+            'usd_per_kw_per_project': cost_per_project / project_size_kw,
+        })
+
+
+class DetailRecords(ColumnarRecords):
+    """
+    DetailRecords are the rows of the details output. Each row is one
+    variable, or one row of a dataframe, calculated by one module of one
+    project.
+
+    Numbers and text are kept in separate typed columns: numeric_value is
+    a float array (NaN where a row has no number) and non_numeric_value is
+    an object array (None where a row has no text). The module that makes
+    a row decides which column a value belongs in, so the writers do not
+    need to test each value.
+    """
+
+    __slots__ = ()
+
+    fields = (
+        'project_id_with_serial',
+        'module',
+        'type',
+        'variable_df_key_col_name',
+        'unit',
+        'numeric_value',
+        'non_numeric_value',
+    )
+
+
+class CraneSelectionRecords(ColumnarRecords):
+    """
+    CraneSelectionRecords are the rows of the crane selection output. Each
+    row is the crane that ErectionCost chose for one operation (such as
+    'Offload', 'Base' or 'Top') of one project, with what it takes to do
+    that operation for all the turbines.
+    """
+
+    __slots__ = ()
+
+    fields = (
+        'project_id_with_serial',
+        'operation',
+        'crane_name',
+        'boom_system',
+        'wind_multiplier',
+        'operation_time_all_turbines_hrs',
+        'total_cost_usd',
+        'number_of_equipment',
+    )
+
+
+class DetailRecordsBuilder:
+    """
+    DetailRecordsBuilder collects the detail rows of one module of one
+    project and makes DetailRecords from them.
+
+    Single variables are added with add_number() and add_text(). The rows
+    of a dataframe are added together with add_columns(), which takes the
+    columns of the dataframe rather than iterating over its rows. The
+    text of such rows can be made from several columns with join_as_text().
+    """
+
+    __slots__ = ('_chunks',)
+
+    def __init__(self):
+        self._chunks = []
+
+    def add_number(self, name, value, unit='', row_type='variable', non_numeric_value=None):
+        """
+        Adds a row with a numeric value.
+
+        Parameters
+        ----------
+        name : str
+            The name of the variable.
+
+        value : float
+            The value. It is stored as a float.
+
+        unit : str
+            The unit of the value.
+
+        row_type : str
+            The type of the row, such as 'variable' or 'dataframe'.
+
+        non_numeric_value : str
+            Optional text that goes with the number, such as the operation
+            it applies to.
+        """
+        self._chunks.append((row_type, name, unit, [float(value)], [non_numeric_value], 1))
+
+    def add_text(self, name, value, unit='', row_type='variable'):
+        """
+        Adds a row with a non-numeric value.
+
+        Parameters
+        ----------
+        name : str
+            The name of the variable.
+
+        value : str
+            The value.
+
+        unit : str
+            The unit of the value.
+
+        row_type : str
+            The type of the row, such as 'variable' or 'list'.
+        """
+        self._chunks.append((row_type, name, unit, [np.nan], [value], 1))
+
+    def add_columns(self, name, numeric_value=None, non_numeric_value=None, unit='', row_type='dataframe'):
+        """
+        Adds one row for each element of the given columns, usually one
+        row for each row of a dataframe. At least one of numeric_value and
+        non_numeric_value must be given.
+
+        Parameters
+        ----------
+        name : str
+            The name of the dataframe and its columns. It is the same for
+            every row.
+
+        numeric_value : array-like
+            The numeric value of each row.
+
+        non_numeric_value : array-like
+            The text of each row.
+
+        unit : str or array-like
+            One unit for every row, or the unit of each row.
+
+        row_type : str
+            The type of the rows.
+        """
+        if numeric_value is not None:
+            numeric_value = np.array(numeric_value, dtype=float)
+            n = len(numeric_value)
+        if non_numeric_value is not None:
+            non_numeric_value = np.asarray(non_numeric_value, dtype=object)
+            n = len(non_numeric_value)
+        if numeric_value is None:
+            numeric_value = np.full(n, np.nan)
+        if non_numeric_value is None:
+            non_numeric_value = np.full(n, None, dtype=object)
+        if not isinstance(unit, str):
+            unit = np.asarray(unit, dtype=object)
+        self._chunks.append((row_type, name, unit, numeric_value, non_numeric_value, n))
+
+    def add_cost_dataframe(self, df):
+        """
+        Adds the rows of a cost dataframe, with the columns 'Type of cost',
+        'Cost USD' and 'Phase of construction', as the text
+        'type <--> phase <--> cost rounded up' and the unrounded cost.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The cost dataframe.
+        """
+        cost = np.array(df['Cost USD'], dtype=float)
+        self.add_columns(
+            'Type of Cost <--> Phase of Construction <--> Cost in USD ',
+            numeric_value=cost,
+            non_numeric_value=join_as_text([df['Type of cost'], df['Phase of construction'], np.ceil(cost).astype(np.int64)], ' <--> ')
+        )
+
+    def build(self, project_id_with_serial, module):
+        """
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the project.
+
+        module : str
+            The name of the module.
+
+        Returns
+        -------
+        DetailRecords
+            Everything added so far, in the order it was added.
+        """
+        if len(self._chunks) == 0:
+            return DetailRecords()
+        n = sum(chunk[5] for chunk in self._chunks)
+        return DetailRecords({
+            'project_id_with_serial': _repeat(project_id_with_serial, n),
+            'module': _repeat(module, n),
+            'type': np.concatenate([_repeat(chunk[0], chunk[5]) for chunk in self._chunks]),
+            'variable_df_key_col_name': np.concatenate([_repeat(chunk[1], chunk[5]) for chunk in self._chunks]),
+            'unit': np.concatenate([_repeat(chunk[2], chunk[5]) if isinstance(chunk[2], str) else chunk[2]
+                                    for chunk in self._chunks]),
+            'numeric_value': np.concatenate([np.asarray(chunk[3], dtype=float) for chunk in self._chunks]),
+            'non_numeric_value': np.concatenate([np.asarray(chunk[4], dtype=object) for chunk in self._chunks]),
+        })
+
+
+def join_as_text(columns, separator):
+    """
+    Converts columns to text and joins them element by element, such as
+    to make 'Labor <--> Development <--> 150000' from three columns of a
+    cost dataframe. Values are converted as str() would convert them.
+
+    Parameters
+    ----------
+    columns : list
+        The columns, as pd.Series or arrays of the same length.
+
+    separator : str
+        The text between the values.
+
+    Returns
+    -------
+    np.ndarray
+        An object array of the joined text.
+    """
+    result = _as_text(columns[0])
+    for column in columns[1:]:
+        result = result + separator + _as_text(column)
+    return result
+
+
+def _as_text(column):
+    """
+    Converts a column to an object array of str.
+    """
+    return pd.Series(np.asarray(column)).astype(str).to_numpy(dtype=object)
+
+
+def _repeat(value, n):
+    """
+    Makes an array that repeats a value n times. Strings are kept in
+    object arrays so that concatenating them does not truncate them.
+    """
+    if isinstance(value, str):
+        return np.full(n, value, dtype=object)
+    return np.full(n, value)
@@ -1,5 +1,130 @@
 import math
 
+import pandas as pd
+
+from .ColumnarRecords import CostRecords
+
+
+# How much of the details output the cost modules make:
+#
+# 'none': no details. Diagnostic dataframes used only for the details are
+#     not calculated either.
+#
+# 'summary': the scalar variables and the cost tables of each module.
+#
+# 'full': everything, including the diagnostic dataframes.
+DETAIL_LEVELS = ('none', 'summary', 'full')
+
+
+class CostTableBuilder:
+    """
+    CostTableBuilder accumulates rows and dataframes and concatenates them
+    into a single dataframe only once, when to_dataframe() is called. This
+    replaces chains of DataFrame.append(), each of which copies everything
+    accumulated so far (and which no longer exists in pandas 2).
+
+    By default, the builder makes cost tables with the columns
+    'Type of cost', 'Cost USD' and 'Phase of construction' that every cost
+    module outputs, but it can build a dataframe with any columns.
+    """
+
+    def __init__(self, columns=('Type of cost', 'Cost USD', 'Phase of construction'), sort=False):
+        """
+        Parameters
+        ----------
+        columns : list
+            The column names for rows added with add_row(). These are also
+            the columns of the empty dataframe returned when nothing has
+            been added. Defaults to the cost table columns. If None,
+            only add_dataframe() can be used.
+
+        sort : bool
+            Passed to pd.concat() to sort the union of the columns when
+            the added dataframes have different columns.
+        """
+        self.columns = list(columns) if columns is not None else None
+        self.sort = sort
+        self._frames = []
+        self._rows = []
+
+    def add_row(self, *values):
+        """
+        Adds one row.
+
+        Parameters
+        ----------
+        values
+            One value for each column, in the order of the columns. For a
+            cost table, these are type of cost, cost in USD and phase of
+            construction.
+        """
+        self._rows.append(values)
+
+    def add_dataframe(self, df):
+        """
+        Adds all the rows of a dataframe. The dataframe is not copied
+        until to_dataframe() is called, so it should not be modified
+        in the meantime.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The dataframe to add.
+        """
+        self._flush_rows()
+        self._frames.append(df)
+
+    def column_sum(self, column):
+        """
+        Sums one column over everything added so far without building
+        the dataframe.
+
+        Parameters
+        ----------
+        column : str
+            The name of the column to sum, such as 'Cost USD'
+
+        Returns
+        -------
+        float
+            The sum of the column.
+        """
+        total = 0
+        if len(self._rows) > 0:
+            position = self.columns.index(column)
+            total += sum(row[position] for row in self._rows)
+        for df in self._frames:
+            total += df[column].sum()
+        return total
+
+    def to_dataframe(self):
+        """
+        Builds the dataframe from everything added so far, in the order it
+        was added.
+
+        Returns
+        -------
+        pd.DataFrame
+            The accumulated rows.
+        """
+        self._flush_rows()
+        if len(self._frames) == 0:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(self._frames, sort=self.sort)
+
+    def __len__(self):
+        return len(self._rows) + sum(len(df) for df in self._frames)
+
+    def _flush_rows(self):
+        """
+        Turns the rows added since the last dataframe into a dataframe.
+        Consecutive rows become one dataframe rather than one each.
+        """
+        if len(self._rows) > 0:
+            self._frames.append(pd.DataFrame(self._rows, columns=self.columns))
+            self._rows = []
+
+
 class CostModule:
     """
     This is a super class for all other cost modules to import
@@ -7,6 +132,20 @@ class CostModule:
     mobilization cost calculations.
     """
 
+    def detail_level(self):
+        """
+        Returns the detail level of the run, which the Manager puts in the
+        input dictionary under the key 'detail_level'. If the key is
+        absent, such as when a module is run on its own, the level is
+        'full'.
+
+        Returns
+        -------
+        str
+            One of DETAIL_LEVELS.
+        """
+        return self.input_dict.get('detail_level', 'full')
+
     def mobilization_cost_multiplier(self, turbine_rating):
         """
         Calculates a mobilization cost term as a function of
@@ -32,23 +171,24 @@ class CostModule:
                                                    project_id,
                                                    total_or_turbine):
         """
-        This takes a dataframe and turns it into a list of dictionaries
-        suitable for output to a cost tab in a spreadsheet.
+        This takes a dataframe and turns it into CostRecords suitable
+        for output to a cost tab in a spreadsheet.
 
-        Outputs dictionaries that are rows, with each row being a dict that
-        has costs broken down by and module id, operation id, type of cost,
-        cost, and per turbine or total. Each of those values are stored in
-        their own column.
+        The records are rows that have costs broken down by and module id,
+        operation id, type of cost, cost, and per turbine or total. Each of
+        those values is stored in its own column.
 
-        It maps each row of this dataframe into a dictionary with keys
-        of those names. It accumulates these dictionaries into a list.
+        Each row of this dataframe becomes one row of the records. The
+        columns are taken from the dataframe whole, without iterating
+        over its rows.
 
         It must be called with keyword arguments.
 
         Parameters
         ----------
         input_df : pd.DataFrame
-           The input dataframe that has the columns listed above.
+           The input dataframe that has the columns 'Type of cost',
+           'Cost USD' and 'Phase of construction'.
 
         project_id : str
             The id of the project (it is a string, not an integer) to
@@ -60,42 +200,20 @@ class CostModule:
 
         Returns
         -------
-        list
-            List of dicts, with each dict representing a row for
-            the output.
+        CostRecords
+            The cost records, one row per row of input_df.
         """
-        result = []
         # module = type(self).__name__
         module = 'CollectionCost' if (type(self).__name__ == 'ArraySystem') else type(self).__name__
-        turbine_rating_MW = self.input_dict['turbine_rating_MW']
-        num_turbines = self.input_dict['num_turbines']
-        rotor_diameter_m = self.input_dict['rotor_diameter_m']
-        project_size_kw = num_turbines * turbine_rating_MW * 1000
-
-        for _, row in input_df.iterrows():
-            _dict = dict()
-            row = row.to_dict()
-            _dict['operation_id'] = row['Phase of construction']
-            _dict['type_of_cost'] = row['Type of cost']
-            _dict['raw_cost'] = row['Cost USD']
-            result.append(_dict)
-
-        for _dict in result:
-            _dict['turbine_rating_MW'] = turbine_rating_MW
-            _dict['num_turbines'] = num_turbines
-            _dict['rotor_diameter_m'] = rotor_diameter_m
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
-            if total_or_turbine:  # If raw_cost is the total cost
-                _dict['raw_cost_total_or_per_turbine'] = 'total'
-                _dict['cost_per_turbine'] = _dict['raw_cost'] / num_turbines
-                _dict['cost_per_project'] = _dict['raw_cost']
-                _dict['usd_per_kw_per_project'] = _dict['raw_cost'] / project_size_kw
-            else:                 # If raw_cost is per turbine
-                _dict['raw_cost_total_or_per_turbine'] = 'turbine'
-                _dict['cost_per_turbine'] = _dict['raw_cost']
-                _dict['cost_per_project'] = _dict['raw_cost'] * num_turbines
-                _dict['usd_per_kw_per_project'] = _dict['cost_per_project'] / project_size_kw
-
-        return result
+
+        return CostRecords.from_costs(
+            project_id_with_serial=self.project_name,
+            module=module,
+            operation_id=input_df['Phase of construction'].to_numpy(),
+            type_of_cost=input_df['Type of cost'].to_numpy(),
+            raw_cost=input_df['Cost USD'].to_numpy(),
+            total_or_turbine=total_or_turbine,
+            turbine_rating_MW=self.input_dict['turbine_rating_MW'],
+            num_turbines=self.input_dict['num_turbines'],
+            rotor_diameter_m=self.input_dict['rotor_diameter_m']
+        )
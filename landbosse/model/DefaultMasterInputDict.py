@@ -1,3 +1,37 @@
+# The inputs of the master input dictionary that are calculated from other
+# inputs: for each, the inputs it is calculated from and the calculation.
+# Some are the same value stored under a second key.
+DERIVED_INPUTS = {
+    'project_size_megawatts': (('num_turbines', 'turbine_rating_MW'), lambda num_turbines, turbine_rating_MW: num_turbines * turbine_rating_MW),
+    'plant_capacity_MW': (('num_turbines', 'turbine_rating_MW'), lambda num_turbines, turbine_rating_MW: turbine_rating_MW * num_turbines),
+    'fuel_cost_usd_per_gal': (('fuel_usd_per_gal',), lambda fuel_usd_per_gal: fuel_usd_per_gal),
+    'user_defined_home_run_trench': (('user_defined_distance_to_grid_connection',), lambda flag: flag),
+    'trench_len_to_substation_km': (('distance_to_grid_connection_km',), lambda distance_km: distance_km),
+}
+
+
+def add_derived_inputs(input_dict, changed_keys=None):
+    """
+    Calculates the inputs in DERIVED_INPUTS from the inputs they depend on,
+    in place.
+
+    Parameters
+    ----------
+    input_dict : dict
+        The master input dictionary, or the part of it read from the
+        project list.
+
+    changed_keys : list
+        If given, only the derived inputs that depend on one of these keys
+        are calculated again.
+    """
+    for key, (sources, derive) in DERIVED_INPUTS.items():
+        if changed_keys is not None and not any(source in changed_keys for source in sources):
+            continue
+        if all(source in input_dict for source in sources):
+            input_dict[key] = derive(*(input_dict[source] for source in sources))
+
+
 class DefaultMasterInputDict:
     """
     DefaultMasterInput is a class that handles all the default values
@@ -1,7 +1,8 @@
 import traceback
 from .CostModule import CostModule
+from .ColumnarRecords import DetailRecordsBuilder, join_as_text
+import numpy as np
 import pandas as pd
-import math
 
 class DevelopmentCost(CostModule):
     """
@@ -53,33 +54,26 @@ class DevelopmentCost(CostModule):
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Creates the rows of the details output.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        DetailRecords
+            The detail rows of this module.
         """
+        total_development_cost = self.output_dict['total_development_cost']
+        cost = np.array(total_development_cost['Cost USD'], dtype=float)
 
-        result = []
-        module = type(self).__name__
-        for _, row in self.output_dict['total_development_cost'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row["Type of cost"], row["Phase of construction"], math.ceil(row["Cost USD"]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost - Phase of Construction - Cost in USD',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
+        details = DetailRecordsBuilder()
+        details.add_columns(
+            'Type of Cost - Phase of Construction - Cost in USD',
+            numeric_value=cost,
+            non_numeric_value=join_as_text([total_development_cost['Type of cost'], total_development_cost['Phase of construction'], np.ceil(cost).astype(np.int64)], ' - ')
+        )
 
+        result = details.build(self.project_name, type(self).__name__)
         self.output_dict['development_cost_csv'] = result
         return result
 
@@ -91,7 +85,8 @@ class DevelopmentCost(CostModule):
 
         try:
             self.calculate_costs()
-            self.outputs_for_detailed_tab()
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab()
             self.output_dict['development_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_development_cost'],
                 project_id=self.project_name,
@@ -2,7 +2,8 @@ import pandas as pd
 import numpy as np
 from math import ceil
 
-from .CostModule import CostModule
+from .CostModule import CostModule, CostTableBuilder
+from .ColumnarRecords import CraneSelectionRecords, DetailRecordsBuilder, join_as_text
 from .WeatherDelay import WeatherDelay
 
 import traceback
@@ -190,7 +191,9 @@ class ErectionCost(CostModule):
         """
         try:
             self.calculate_costs()
-            self.outputs_for_detailed_tab()
+            self.outputs_for_crane_selection()
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab()
             self.output_dict['erection_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_erection_cost'],
                 project_id=self.project_name,
@@ -202,183 +205,132 @@ class ErectionCost(CostModule):
             print(f"Fail {self.project_name} ErectionCost")
             return 1, error # Module did not run successfully
 
+    def outputs_for_crane_selection(self):
+        """
+        Creates the rows of the crane selection output, one for the crane
+        chosen for each operation. Unlike the crane rows of the details
+        output, these are made at every detail level.
+
+        Must be called after self.calculate_costs()
+
+        Returns
+        -------
+        CraneSelectionRecords
+            The crane selection rows of this project.
+        """
+        selected_detailed_data = self.output_dict['erection_selected_detailed_data']
+        keys = ['Crane name', 'Boom system', 'Operation']
+        number_of_equipment = self._possible_crane_cost[keys + ['Number of equipment']].drop_duplicates(keys)
+        number_of_equipment = selected_detailed_data[keys].merge(number_of_equipment, on=keys, how='left')['Number of equipment']
+
+        result = CraneSelectionRecords({
+            'project_id_with_serial': np.full(len(selected_detailed_data), self.project_name, dtype=object),
+            'operation': selected_detailed_data['Operation'].to_numpy(dtype=object),
+            'crane_name': selected_detailed_data['Crane name'].to_numpy(dtype=object),
+            'boom_system': selected_detailed_data['Boom system'].to_numpy(dtype=object),
+            'wind_multiplier': selected_detailed_data['Wind multiplier'].to_numpy(dtype=float),
+            'operation_time_all_turbines_hrs': selected_detailed_data['Operation time all turbines hrs'].to_numpy(dtype=float),
+            'total_cost_usd': selected_detailed_data['Total cost USD'].to_numpy(dtype=float),
+            'number_of_equipment': number_of_equipment.to_numpy(dtype=float),
+        })
+        self.output_dict['erection_crane_selection'] = result
+        return result
+
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Creates the rows of the details output. The diagnostic dataframes
+        about crane selection, crane costs and crews are only output at
+        the 'full' detail level.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        DetailRecords
+            The detail rows of this module.
         """
-        result =[]
-
-        for _, row in self._number_of_equip.iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': '_number_of_equip: Operation-Crane name-Boom system-Number of equipment',
-                'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Number of equipment"]}',
-                'last_number': row["Number of equipment"]
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days',
-                'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Operational construct days over time construct days"]}',
-                'last_number': row["Operational construct days over time construct days"]
-            })
-
-        for row in self.output_dict['component_name_topvbase'].itertuples():
-            dashed_row = '{} - {}'.format(row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'component_name_topvbase: Operation - Top or Base',
-                'value': dashed_row
-            })
-
-        for row in self.output_dict['crane_choice'].itertuples():
-            dashed_row = '{} - {} - {}'.format(row[1], row[2], row[3])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_choice: Crew name - Boom system - Operation',
-                'value': dashed_row
-            })
-
-        for _, row in self.output_dict['crane_data_output'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_data_output: crane_boom_operation_concat - variable - value',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['crane_cost_details'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_cost_details: Operation ID - Type of cost - Cost',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['total_erection_cost'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'total_erection_cost: Phase of construction - Type of cost - Cost USD',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Labor cost USD without management']
-            operation = row['Operation']
-            result.append({
-                'unit': 'usd',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: crew cost without management',
-                'value': value,
-                'non_numeric_value': operation
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Mobilization cost USD']
-            crane_boom_operation_concat = row['crane_boom_operation_concat']
-            result.append({
-                'unit': 'usd',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'erection_selected_detailed_data: mobilization',
-                'value': value,
-                'non_numeric_value': crane_boom_operation_concat
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Wind multiplier']
-            operation = row['Operation']
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: wind multiplier',
-                'value': value,
-                'non_numeric_value': operation
-            })
-
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'total_cost_summed_erection',
-            'value': float(self.output_dict['total_cost_summed_erection'])
-        })
+        full = self.detail_level() == 'full'
+        details = DetailRecordsBuilder()
+        selected_detailed_data = self.output_dict['erection_selected_detailed_data']
+
+        if full:
+            number_of_equip = self._number_of_equip
+            details.add_columns(
+                '_number_of_equip: Operation-Crane name-Boom system-Number of equipment',
+                numeric_value=number_of_equip['Number of equipment'],
+                non_numeric_value=join_as_text([number_of_equip['Operation'], number_of_equip['Crane name'], number_of_equip['Boom system'], number_of_equip['Number of equipment']], '-')
+            )
 
-        for _, row in self.output_dict['management_crews_cost'].iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'management_crews_cost: {}'.format(' - '.join(row.index)),
-                'value': ' - '.join(list(str(x) for x in row)[1:])
-            })
-
-        result.append({
-            'unit': 'hours',
-            'type': 'variable',
-            'variable_df_key_col_name': 'number of hours in weather window',
-            'value': len(self.input_dict['weather_window'])
-        })
+            operational_days = selected_detailed_data['Operational construct days over time construct days']
+            details.add_columns(
+                'erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days',
+                numeric_value=operational_days,
+                non_numeric_value=join_as_text([selected_detailed_data['Operation'], selected_detailed_data['Crane name'], selected_detailed_data['Boom system'], operational_days], '-')
+            )
 
-        result.append({
-            'unit': 'none',
-            'type': 'variable',
-            'variable_df_key_col_name': 'time_weighted_weather_multiplier',
-            'value': self.output_dict['time_weighted_weather_multiplier']
-        })
+            component_name_topvbase = self.output_dict['component_name_topvbase']
+            details.add_columns(
+                'component_name_topvbase: Operation - Top or Base',
+                non_numeric_value=join_as_text([component_name_topvbase.iloc[:, 0], component_name_topvbase.iloc[:, 1]], ' - ')
+            )
 
-        result.append({
-            'unit': 'months',
-            'type': 'variable',
-            'variable_df_key_col_name': 'erection_construction_months',
-            'value': self.output_dict['erection_construction_months']
-        })
+            crane_choice = self.output_dict['crane_choice']
+            details.add_columns(
+                'crane_choice: Crew name - Boom system - Operation',
+                non_numeric_value=join_as_text([crane_choice.iloc[:, 0], crane_choice.iloc[:, 1], crane_choice.iloc[:, 2]], ' - ')
+            )
 
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'labor_cost_management',
-            'value': self.output_dict['labor_cost_management']
-        })
+            dataframes = [('crane_data_output', 'crane_data_output: crane_boom_operation_concat - variable - value'),
+                          ('crane_cost_details', 'crane_cost_details: Operation ID - Type of cost - Cost'),
+                          ('total_erection_cost', 'total_erection_cost: Phase of construction - Type of cost - Cost USD')]
+        else:
+            dataframes = [('total_erection_cost', 'total_erection_cost: Phase of construction - Type of cost - Cost USD')]
+
+        for key, name in dataframes:
+            df = self.output_dict[key]
+            details.add_columns(
+                name,
+                numeric_value=df.iloc[:, 2],
+                non_numeric_value=join_as_text([df.iloc[:, 0], df.iloc[:, 1], df.iloc[:, 2]], ' - ')
+            )
 
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'labor_cost_non_management',
-            'value': self.output_dict['labor_cost_non_management']
-        })
+        if full:
+            details.add_columns(
+                'erection_selected_detailed_data: crew cost without management',
+                numeric_value=selected_detailed_data['Labor cost USD without management'],
+                non_numeric_value=selected_detailed_data['Operation'],
+                unit='usd'
+            )
+            details.add_columns(
+                'erection_selected_detailed_data: mobilization',
+                numeric_value=selected_detailed_data['Mobilization cost USD'],
+                non_numeric_value=selected_detailed_data['crane_boom_operation_concat'],
+                unit='usd'
+            )
+            details.add_columns(
+                'erection_selected_detailed_data: wind multiplier',
+                numeric_value=selected_detailed_data['Wind multiplier'],
+                non_numeric_value=selected_detailed_data['Operation']
+            )
 
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'labor_cost_total',
-            'value': self.output_dict['labor_cost_total']
-        })
+        details.add_number('total_cost_summed_erection', self.output_dict['total_cost_summed_erection'], unit='usd')
 
+        if full:
+            management_crews_cost = self.output_dict['management_crews_cost']
+            details.add_columns(
+                'management_crews_cost: {}'.format(' - '.join(management_crews_cost.columns)),
+                non_numeric_value=join_as_text([management_crews_cost[column] for column in management_crews_cost.columns[1:]], ' - ')
+            )
 
-        module = type(self).__name__
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-        self.output_dict['erection_cost_csv'] = result
+        details.add_number('number of hours in weather window', len(self.input_dict['weather_window']), unit='hours')
+        details.add_number('time_weighted_weather_multiplier', self.output_dict['time_weighted_weather_multiplier'], unit='none')
+        details.add_number('erection_construction_months', self.output_dict['erection_construction_months'], unit='months')
+        details.add_number('labor_cost_management', self.output_dict['labor_cost_management'], unit='usd')
+        details.add_number('labor_cost_non_management', self.output_dict['labor_cost_non_management'], unit='usd')
+        details.add_number('labor_cost_total', self.output_dict['labor_cost_total'], unit='usd')
 
+        result = details.build(self.project_name, type(self).__name__)
+        self.output_dict['erection_cost_csv'] = result
         return result
 
     def calculate_erection_operation_time(self):
@@ -663,8 +615,9 @@ class ErectionCost(CostModule):
         pd.DataFrame
             A dataframe of the cranes and their lifting polygons.
         """
-        crane_poly = pd.DataFrame(
-            columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne', 'Crane poly'])
+        crane_poly = CostTableBuilder(
+            columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne', 'Crane poly'],
+            sort=True)
         for (equipment_name, equipment_id, crane_name, boom_system, crane_capacity_tonne), crane in crane_grouped:
             crane = crane.reset_index(drop=True)
             x = crane['Max capacity tonne']
@@ -692,8 +645,8 @@ class ErectionCost(CostModule):
                                        'Max wind speed m per s', 'Setup time hr', 'Breakdown time hr',
                                        'Hoist speed m per min', 'Speed of travel km per hr',
                                        'Crew type ID', 'Crane poly'])
-            crane_poly = crane_poly.append(df, sort=True)
-        return crane_poly
+            crane_poly.add_dataframe(df)
+        return crane_poly.to_dataframe()
 
     def calculate_component_lift_max_wind_speed(self, *, component_group, crane_poly, component_max_speed, operation):
         """
@@ -745,6 +698,8 @@ class ErectionCost(CostModule):
             crane_poly dataframe passed as a parameter to this function and with a column
             of "Crane bool {operation}" attached.
         """
+        component_max_speed_builder = CostTableBuilder(columns=None, sort=True)
+        component_max_speed_builder.add_dataframe(component_max_speed)
         for idx, crane in crane_poly.iterrows():
             polygon = crane['Crane poly']
 
@@ -787,8 +742,9 @@ class ErectionCost(CostModule):
             component_group_new['Boom system'] = crane['Boom system']
             component_group_new['crane_bool'] = bool_list
 
-            component_max_speed = component_max_speed.append(component_group_new, sort=True)
+            component_max_speed_builder.add_dataframe(component_group_new)
 
+        component_max_speed = component_max_speed_builder.to_dataframe()
         crane_poly_new = crane_poly.copy()
         crane_poly_new['Crane bool {}'.format(operation)] = min(bool_list)
 
@@ -1025,7 +981,7 @@ class ErectionCost(CostModule):
 
         self.output_dict['separate_basetop'] = separate_basetop
 
-        total_separate_cost = pd.DataFrame()
+        total_separate_cost = CostTableBuilder(columns=None, sort=True)
         for operation in separate_basetop['Operation'].unique():
             # find minimum cost option for separate base and topping cranes
             min_val = min(separate_basetop['Total cost USD'].where(separate_basetop['Operation'] == operation).dropna())
@@ -1033,14 +989,14 @@ class ErectionCost(CostModule):
             # find the crane that corresponds to the minimum cost for each operation
             crane = separate_basetop[separate_basetop['Total cost USD'] == min_val]
             cost = crane.groupby('Operation').min()
-            total_separate_cost = total_separate_cost.append(cost, sort=True)
+            total_separate_cost.add_dataframe(cost)
 
         # reset index for separate crane costs
-        total_separate_cost = total_separate_cost.reset_index()
+        total_separate_cost = total_separate_cost.to_dataframe().reset_index()
 
         # duplicate offload records because assuming two offload cranes are on site
-        total_separate_cost = total_separate_cost.append(
-            total_separate_cost.loc[total_separate_cost['Operation'] == 'Offload'], sort=True)
+        total_separate_cost = pd.concat(
+            [total_separate_cost, total_separate_cost.loc[total_separate_cost['Operation'] == 'Offload']], sort=True)
 
         # sum costs for separate cranes to get total for all cranes
         cost_chosen_separate = total_separate_cost['Total cost USD'].sum()
@@ -1149,8 +1105,8 @@ class ErectionCost(CostModule):
 
         # append data for offloading
         if len(offload_specs) != 0:
-            crane_specs_withoffload = crane_specs.append(offload_specs, sort=True)
-            operation_time_withoffload = operation_time.append(offload_time, sort=True)
+            crane_specs_withoffload = pd.concat([crane_specs, offload_specs], sort=True)
+            operation_time_withoffload = pd.concat([operation_time, offload_time], sort=True)
         else:
             raise Exception('ErectionCost calculate_costs(): offload_specs empty')
 
@@ -1193,14 +1149,22 @@ class ErectionCost(CostModule):
 
         crane_choice = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].drop_duplicates()
 
-        selected_detailed_data['crane_boom_operation_concat'] = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].apply(lambda x: '-'.join(x), axis=1)
-        crane_data_output = selected_detailed_data.drop(['Crane name', 'Boom system', 'Operation'], axis=1)
-        crane_data_output = crane_data_output.melt(id_vars=['crane_boom_operation_concat'])
+        selected_detailed_data['crane_boom_operation_concat'] = \
+            selected_detailed_data['Crane name'] + '-' + selected_detailed_data['Boom system'] + '-' + selected_detailed_data['Operation']
+
+        # The melted crane data is only needed for the details output at the
+        # 'full' detail level.
+        if self.detail_level() == 'full':
+            crane_data_output = selected_detailed_data.drop(['Crane name', 'Boom system', 'Operation'], axis=1)
+            crane_data_output = crane_data_output.melt(id_vars=['crane_boom_operation_concat'])
+
+            crane_cost_details = crane_data_output.where(crane_data_output['variable'].str.contains("cost")).dropna()
+            crane_cost_details = crane_cost_details.rename(index=str,
+                                columns={"crane_boom_operation_concat": "Operation ID", "variable": "Type of cost",
+                                         "value": "Cost"})
 
-        crane_cost_details = crane_data_output.where(crane_data_output['variable'].str.contains("cost")).dropna()
-        crane_cost_details = crane_cost_details.rename(index=str,
-                            columns={"crane_boom_operation_concat": "Operation ID", "variable": "Type of cost",
-                                     "value": "Cost"})
+            self.output_dict['crane_data_output'] = crane_data_output
+            self.output_dict['crane_cost_details'] = crane_cost_details
 
         subtotal_per_diem_labor_management_USD = management_crews_cost['per_diem_costs'].sum()
         subtotal_hourly_labor_management_USD = management_crews_cost['hourly_costs'].sum()
@@ -1226,8 +1190,6 @@ class ErectionCost(CostModule):
         self.output_dict['total_erection_cost'] = total_erection_cost
         self.output_dict['erection_wind_mult'] = erection_wind_mult
         self.output_dict['crane_choice'] = crane_choice
-        self.output_dict['crane_data_output'] = crane_data_output
-        self.output_dict['crane_cost_details'] = crane_cost_details
         self.output_dict['total_cost_summed_erection'] = total_cost_summed_erection
 
         # Put some diagnostic data on selected_detailed_data. This is the number of crews needed
@@ -1242,10 +1204,13 @@ class ErectionCost(CostModule):
         total_time_construct_days = (selected_detailed_data['Time construct days']).sum()
         self.output_dict['time_weighted_weather_multiplier'] = (selected_detailed_data['Wind multiplier'] * (selected_detailed_data['Time construct days']) / total_time_construct_days).sum()
 
-        # Now get the number of equipment diagnostic data ready. This is held on an instance
-        # attribute because it isn't meant to be used outside of the class.
-        self._number_of_equip = selected_detailed_data.merge(self._possible_crane_cost, on=['Crane name', 'Boom system', 'Operation'], how='inner')
-        self._number_of_equip = self._number_of_equip[['Operation', 'Crane name', 'Boom system', 'Number of equipment']]
+        # The number of equipment is only needed for the details output at
+        # the 'full' detail level.
+        if self.detail_level() == 'full':
+            # Now get the number of equipment diagnostic data ready. This is held on an instance
+            # attribute because it isn't meant to be used outside of the class.
+            self._number_of_equip = selected_detailed_data.merge(self._possible_crane_cost, on=['Crane name', 'Boom system', 'Operation'], how='inner')
+            self._number_of_equip = self._number_of_equip[['Operation', 'Crane name', 'Boom system', 'Number of equipment']]
 
         # Management crews data
         self.output_dict['management_crews_cost'] = management_crews_cost
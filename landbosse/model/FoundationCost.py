@@ -7,7 +7,8 @@ import math
 from scipy.optimize import root_scalar
 
 from .WeatherDelay import WeatherDelay as WD
-from .CostModule import CostModule
+from .CostModule import CostModule, CostTableBuilder
+from .ColumnarRecords import DetailRecordsBuilder, join_as_text
 
 
 class FoundationCost(CostModule):
@@ -619,8 +620,8 @@ class FoundationCost(CostModule):
 
         labor_equip_data = pd.merge(material_vol_entire_farm, rsmeans, on=['Material type ID'])
 
-        # Create foundation cost dataframe
-        foundation_cost = pd.DataFrame(columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+        # Accumulate the rows of the foundation cost dataframe
+        foundation_cost = CostTableBuilder()
 
         # Calculate per diem
         per_diem = operation_data['Number of workers'] * operation_data['Number of crews'] * (operation_data['Time construct days'] +
@@ -638,8 +639,7 @@ class FoundationCost(CostModule):
                 equipment_dataframe['Quantity of material'] * equipment_dataframe['Rate USD per unit'] *
                 calculate_costs_input_dict['overtime_multiplier'] + per_diem)
         equipment_cost_usd_with_weather_delays = equipment_cost_usd_without_delay.sum() * wind_multiplier
-        equipment_costs = pd.DataFrame([['Equipment rental', equipment_cost_usd_with_weather_delays, 'Foundation']],
-                                       columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+        foundation_cost.add_row('Equipment rental', equipment_cost_usd_with_weather_delays, 'Foundation')
 
         # LABOR COST
         # Create labor costs row to be appended to foundation_cost
@@ -647,8 +647,7 @@ class FoundationCost(CostModule):
         labor_cost_usd_without_management= (labor_dataframe['Quantity of material'] * labor_dataframe['Rate USD per unit'] * calculate_costs_input_dict['overtime_multiplier'] + per_diem )
         labor_cost_usd_with_management = labor_cost_usd_without_management.sum() + calculate_costs_output_dict['managament_crew_cost_before_wind_delay']
         labor_cost_usd_with_management_plus_weather_delays = labor_cost_usd_with_management * wind_multiplier
-        labor_costs = pd.DataFrame([['Labor', labor_cost_usd_with_management_plus_weather_delays, 'Foundation']],
-                                   columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+        foundation_cost.add_row('Labor', labor_cost_usd_with_management_plus_weather_delays, 'Foundation')
 
         # MATERIAL COST
         material_cost_dataframe = pd.DataFrame(columns=['Operation ID', 'Type of cost', 'Cost USD'])
@@ -656,19 +655,13 @@ class FoundationCost(CostModule):
         material_cost_dataframe['Type of cost'] = 'Materials'
         material_cost_dataframe['Cost USD'] = material_data_entire_farm['Cost USD']
         material_costs_sum = material_cost_dataframe['Cost USD'].sum()
-        material_costs = pd.DataFrame([['Materials', material_costs_sum, 'Foundation']],
-                                      columns=['Type of cost', 'Cost USD', 'Phase of construction'])
-
-        # Append all cost items to foundation_cost
-        foundation_cost = foundation_cost.append(equipment_costs)
-        foundation_cost = foundation_cost.append(labor_costs)
-        foundation_cost = foundation_cost.append(material_costs)
+        foundation_cost.add_row('Materials', material_costs_sum, 'Foundation')
 
         # Calculate mobilization cost as percentage of total foundation cost and add to foundation_cost
         # Assumed 5% of total foundation cost and add to foundation_cost for utility scale plant
         # A function of turbine size for distributed wind (< 10 turbines)
         if calculate_costs_input_dict['num_turbines'] > 10:
-            mobilization_cost = foundation_cost['Cost USD'].sum() * 0.05
+            mobilization_cost = foundation_cost.column_sum('Cost USD') * 0.05
         else:
             if calculate_costs_input_dict['turbine_rating_MW'] < 0.1:
                 # Zero since mobilization cost of equipment is included in the equipment rental cost
@@ -678,11 +671,9 @@ class FoundationCost(CostModule):
                 num_turbines = calculate_costs_input_dict['num_turbines']
                 rating = calculate_costs_input_dict['turbine_rating_MW']
                 mobilization_multipler = self.mobilization_cost_multiplier(rating)
-                mobilization_cost = foundation_cost['Cost USD'].sum() / num_turbines * mobilization_multipler
-
-        mob_cost = pd.DataFrame([['Mobilization', mobilization_cost, 'Foundation']], columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+                mobilization_cost = foundation_cost.column_sum('Cost USD') / num_turbines * mobilization_multipler
 
-        foundation_cost = foundation_cost.append(mob_cost)
+        foundation_cost.add_row('Mobilization', mobilization_cost, 'Foundation')
 
         # todo: we add a separate tab in the output file for costs (all costs will be the same format but it's a different format than other data)
         # columns in cost tab would include project_id, module, operation_id, type_of_cost, total_or_per_turbine, cost_usd
@@ -691,7 +682,7 @@ class FoundationCost(CostModule):
         # total_foundation_cost['Phase of construction'] = 'Foundations'
         # total_cost_summed_foundation = total_foundation_cost.sum(numeric_only=True)[0] # todo: add total_cost_summed_foundation to output dict
 
-        total_foundation_cost = foundation_cost
+        total_foundation_cost = foundation_cost.to_dataframe()
         calculate_costs_output_dict['total_foundation_cost'] = total_foundation_cost
 
         self.output_dict['labor_equip_data'] = labor_equip_data
@@ -700,122 +691,60 @@ class FoundationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Creates the rows of the details output.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        DetailRecords
+            The detail rows of this module.
         """
-
-        # Note that some values are cast with float() so that XlsxWriter
-        # (the library depended on by XlsxGenerator) can output them as
-        # numbers. XlsxWriter, interestingly, cannot handle np.float32()
-        # types.
-
-        result = []
-        module = type(self).__name__
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'wind_multiplier',
-            'value': float(self.output_dict['wind_multiplier'])
-        })
-        result.append({
-            'unit': 'kN',
-            'type': 'variable',
-            'variable_df_key_col_name': 'F_dead',
-            'value': float(self.output_dict['F_dead_kN_per_turbine'])
-        })
-        result.append({
-            'unit': 'kN',
-            'type': 'variable',
-            'variable_df_key_col_name': 'F_horiz',
-            'value': float(self.output_dict['F_horiz_kN_per_turbine'])
-        })
-        result.append({
-            'unit': 'kN_m',
-            'type': 'variable',
-            'variable_df_key_col_name': 'M_tot_kN',
-            'value': float(self.output_dict['M_tot_kN_m_per_turbine'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius_o',
-            'value': float(self.output_dict['Radius_o_m'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius_g',
-            'value': float(self.output_dict['Radius_g_m'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius_b',
-            'value': float(self.output_dict['Radius_b_m'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius',
-            'value': float(self.output_dict['Radius_m'])
-        })
-        result.append({
-            'unit': 'short_ton',
-            'type': 'variable',
-            'variable_df_key_col_name': 'steel_mass_short_ton_per_turbine',
-            'value': self.output_dict['steel_mass_short_ton_per_turbine']
-        })
-        # foundation_volume_concrete_m3_per_turbine
-        result.append({
-            'unit': 'm^3',
-            'type': 'variable',
-            'variable_df_key_col_name': 'foundation_volume_concrete_m3_per_turbine',
-            'value': self.output_dict['foundation_volume_concrete_m3_per_turbine']
-        })
-
-        for row in self.output_dict['operation_data_id_days_crews_workers'].itertuples():
-            dashed_row = '{}-{}-{}-{}'.format(row[1], math.ceil(row[2]), row[3], row[4])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'operation_data: Operation ID-Number of days-Number of crews-Number of workers',
-                'value': dashed_row
-            })
-
-        for row in self.output_dict['material_needs_per_turbine'].itertuples():
-            # This must be formatted in Python
-            dashed_row = '{}-{}-{:.2e}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': row[3],
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'material_needs_per_turbine: {}'.format('-'.join(self.output_dict['material_needs_per_turbine'].columns[:-1])),
-                'value': dashed_row
-            })
-
-        for row in self.output_dict['total_foundation_cost'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
+        details = DetailRecordsBuilder()
+        details.add_number('wind_multiplier', self.output_dict['wind_multiplier'])
+        details.add_number('F_dead', self.output_dict['F_dead_kN_per_turbine'], unit='kN')
+        details.add_number('F_horiz', self.output_dict['F_horiz_kN_per_turbine'], unit='kN')
+        details.add_number('M_tot_kN', self.output_dict['M_tot_kN_m_per_turbine'], unit='kN_m')
+        details.add_number('Radius_o', self.output_dict['Radius_o_m'], unit='m')
+        details.add_number('Radius_g', self.output_dict['Radius_g_m'], unit='m')
+        details.add_number('Radius_b', self.output_dict['Radius_b_m'], unit='m')
+        details.add_number('Radius', self.output_dict['Radius_m'], unit='m')
+        details.add_number('steel_mass_short_ton_per_turbine', self.output_dict['steel_mass_short_ton_per_turbine'], unit='short_ton')
+        details.add_number('foundation_volume_concrete_m3_per_turbine', self.output_dict['foundation_volume_concrete_m3_per_turbine'], unit='m^3')
+
+        if self.detail_level() == 'full':
+            self._add_diagnostic_details(details)
+
+        details.add_cost_dataframe(self.output_dict['total_foundation_cost'])
+
+        result = details.build(self.project_name, type(self).__name__)
         self.output_dict['foundation_cost_csv'] = result
         return result
 
+    def _add_diagnostic_details(self, details):
+        """
+        Adds the rows of the operation data and material needs dataframes
+        to the details. These are only output at the 'full' detail level.
+
+        Parameters
+        ----------
+        details : DetailRecordsBuilder
+            The builder of the details of this module.
+        """
+        operation_data = self.output_dict['operation_data_id_days_crews_workers']
+        number_of_days = np.ceil(np.array(operation_data.iloc[:, 1], dtype=float)).astype(np.int64)
+        details.add_columns(
+            'operation_data: Operation ID-Number of days-Number of crews-Number of workers',
+            non_numeric_value=join_as_text([operation_data.iloc[:, 0], number_of_days, operation_data.iloc[:, 2], operation_data.iloc[:, 3]], '-')
+        )
+
+        material_needs = self.output_dict['material_needs_per_turbine']
+        details.add_columns(
+            'material_needs_per_turbine: {}'.format('-'.join(material_needs.columns[:-1])),
+            non_numeric_value=join_as_text([material_needs.index, material_needs.iloc[:, 0], material_needs.iloc[:, 1].map('{:.2e}'.format)], '-'),
+            unit=material_needs.iloc[:, 2]
+        )
+
     def outputs_for_module_type_operation(self, input_dict, output_dict):
         result = []
         module = type(self).__name__
@@ -889,7 +818,8 @@ class FoundationCost(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.output_dict['labor_equip_data']
             # self.output_dict['foundation_module_type_operation'] = self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['foundation_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
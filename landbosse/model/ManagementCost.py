@@ -3,6 +3,8 @@ import traceback
 import pytest
 import traceback
 
+from .ColumnarRecords import CostRecords, DetailRecordsBuilder
+
 class ManagementCost:
     """
     This class models management costs of a wind plant. Its inputs are
@@ -417,27 +419,18 @@ class ManagementCost:
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Creates the rows of the details output.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        DetailRecords
+            The detail rows of this module.
         """
-        result = []
+        details = DetailRecordsBuilder()
         if self.in_distributed_mode:
-            row = {
-                'project_id_with_serial': self.project_name,
-                'module': type(self).__name__,
-                'type': 'variable',
-                'variable_df_key_col_name': 'total_management_cost',
-                'unit': 'usd',
-                'value': self.output_dict['total_management_cost']
-            }
-            result.append(row)
+            details.add_number('total_management_cost', self.output_dict['total_management_cost'], unit='usd')
         else:
             management_cost_keys = [
                 'insurance_usd',
@@ -450,85 +443,54 @@ class ManagementCost:
             ]
 
             for key in management_cost_keys:
-                value = self.output_dict[key]
-                row = {
-                    'project_id_with_serial': self.project_name,
-                    'module': type(self).__name__,
-                    'type': 'variable',
-                    'variable_df_key_col_name': key,
-                    'unit': 'usd',
-                    'value': value
-                }
-                result.append(row)
-
-        return result
+                details.add_number(key, self.output_dict[key], unit='usd')
+
+        return details.build(self.project_name, type(self).__name__)
 
     def outputs_for_module_type_operation(self):
         """
-        Outputs dictionaries that are rows for the
-        costs_by_module_type_operation
+        Outputs the rows for the costs_by_module_type_operation
 
         Returns
         -------
-        list
-            List of dicts, with each dict representing a row for
-            the output.
+        CostRecords
+            The cost records of the management costs.
         """
-        result = []
-        module = type(self).__name__
-        turbine_rating_MW = self.input_dict['turbine_rating_MW']
-        num_turbines = self.input_dict['num_turbines']
-        project_size_kw = num_turbines * turbine_rating_MW * 1000
-
         if self.in_distributed_mode:
-            result.append({
-                'type_of_cost': 'total_management_cost',
-                'raw_cost': self.output_dict['total_management_cost']
-            })
+            type_of_cost = ['total_management_cost']
+            raw_cost = [self.output_dict['total_management_cost']]
 
         else:
-            result.append({
-                'type_of_cost': 'insurance',
-                'raw_cost': self.output_dict['insurance_usd']
-            })
-            result.append({
-                'type_of_cost': 'Construction Permitting',
-                'raw_cost': self.output_dict['construction_permitting_usd']
-            })
-            result.append({
-                'type_of_cost': 'Project Management',
-                'raw_cost': self.output_dict['project_management_usd']
-            })
-            result.append({
-                'type_of_cost': 'Bonding',
-                'raw_cost': self.output_dict['bonding_usd']
-            })
-            result.append({
-                'type_of_cost': 'Markup Contingency',
-                'raw_cost': self.output_dict['markup_contingency_usd']
-            })
-            result.append({
-                'type_of_cost': 'Engineering Foundation and Collections System (includes met mast)',
-                'raw_cost': self.output_dict['engineering_usd']
-            })
-            result.append({
-                'type_of_cost': 'Site Facility',
-                'raw_cost': self.output_dict['site_facility_usd']
-            })
-
-        for _dict in result:
-            _dict['turbine_rating_MW'] = self.input_dict['turbine_rating_MW']
-            _dict['num_turbines'] = self.input_dict['num_turbines']
-            _dict['rotor_diameter_m'] = self.input_dict['rotor_diameter_m']
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['operation_id'] = 'Management'
-            _dict['module'] = module
-            _dict['raw_cost_total_or_per_turbine'] = 'total'
-            _dict['cost_per_turbine'] = _dict['raw_cost'] / num_turbines
-            _dict['cost_per_project'] = _dict['raw_cost']
-            _dict['usd_per_kw_per_project'] = _dict['raw_cost'] / project_size_kw
-
-        return result
+            type_of_cost = [
+                'insurance',
+                'Construction Permitting',
+                'Project Management',
+                'Bonding',
+                'Markup Contingency',
+                'Engineering Foundation and Collections System (includes met mast)',
+                'Site Facility'
+            ]
+            raw_cost = [
+                self.output_dict['insurance_usd'],
+                self.output_dict['construction_permitting_usd'],
+                self.output_dict['project_management_usd'],
+                self.output_dict['bonding_usd'],
+                self.output_dict['markup_contingency_usd'],
+                self.output_dict['engineering_usd'],
+                self.output_dict['site_facility_usd']
+            ]
+
+        return CostRecords.from_costs(
+            project_id_with_serial=self.project_name,
+            module=type(self).__name__,
+            operation_id='Management',
+            type_of_cost=type_of_cost,
+            raw_cost=raw_cost,
+            total_or_turbine=True,
+            turbine_rating_MW=self.input_dict['turbine_rating_MW'],
+            num_turbines=self.input_dict['num_turbines'],
+            rotor_diameter_m=self.input_dict['rotor_diameter_m']
+        )
 
     def run_module(self):
         """
@@ -568,7 +530,8 @@ class ManagementCost:
                 self.output_dict['engineering_usd'] = self.engineering_foundations_collection_sys()
                 self.output_dict['site_facility_usd'] = self.site_facility()
                 self.output_dict['total_management_cost'] = self.total_management_cost()
-            self.output_dict['management_cost_csv'] = self.outputs_for_detailed_tab()
+            if self.input_dict.get('detail_level', 'full') != 'none':
+                self.output_dict['management_cost_csv'] = self.outputs_for_detailed_tab()
             self.output_dict['mangement_module_type_operation'] = self.outputs_for_module_type_operation()
             return 0, 0    # module ran successfully
         except Exception as error:
@@ -1,6 +1,10 @@
+import copy
 import traceback
 import math
 
+import numpy as np
+import pandas as pd
+
 from .ManagementCost import ManagementCost
 from .FoundationCost import FoundationCost
 from .SubstationCost import SubstationCost
@@ -9,6 +13,9 @@ from .SitePreparationCost import SitePreparationCost
 from .CollectionCost import Cable, Array, ArraySystem
 from .ErectionCost import ErectionCost
 from .DevelopmentCost import DevelopmentCost
+from .CostModule import CostTableBuilder, DETAIL_LEVELS
+from .ModuleOutputCache import ModuleOutputCache
+from .DefaultMasterInputDict import DERIVED_INPUTS, add_derived_inputs
 
 
 class Manager:
@@ -18,7 +25,7 @@ class Manager:
     structure.
     """
 
-    def __init__(self, input_dict, output_dict):
+    def __init__(self, input_dict, output_dict, module_cache=None, detail_level='full'):
         """
         This initializer sets up the instance variables of:
 
@@ -28,9 +35,47 @@ class Manager:
         self.input_dict: A placeholder for the inputs dictionary
 
         self.output_dict: A placeholder for the output dictionary
+
+        self.module_cache: An optional ModuleOutputCache. When it is
+            provided, cost modules whose inputs are unchanged since they
+            last ran with the same cache are not run again. Instead, their
+            outputs are copied from the cache.
+
+        self.detail_level: How much of the details output the cost modules
+            make. One of 'none', 'summary' or 'full' (see DETAIL_LEVELS in
+            CostModule). It is passed to the modules in the input
+            dictionary under the key 'detail_level'.
         """
+        if detail_level not in DETAIL_LEVELS:
+            raise ValueError(f'detail_level must be one of {DETAIL_LEVELS}, not {detail_level!r}')
         self.input_dict = input_dict
         self.output_dict = output_dict
+        self.module_cache = module_cache
+        self.detail_level = detail_level
+
+    def run_cost_module(self, module_class, project_name):
+        """
+        Runs one cost module on the input and output dictionaries. If
+        there is a module cache, the cache decides whether the module
+        needs to run at all.
+
+        Parameters
+        ----------
+        module_class : type
+            The class of the cost module to run.
+
+        project_name : str
+            The name of the project.
+
+        Returns
+        -------
+        tuple
+            The (status, error) tuple returned by the module.
+        """
+        if self.module_cache is not None:
+            return self.module_cache.run_module(module_class, self.input_dict, self.output_dict, project_name)
+        module = module_class(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
+        return module.run_module()
 
     def execute_landbosse(self, project_name):
         try:
@@ -48,32 +93,17 @@ class Manager:
             self.input_dict['weather_window'] = filtered_weather_window
             self.input_dict['weather_data_user_input'] = weather_data_user_input
 
-            foundation_cost = FoundationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            foundation_cost.run_module()
-
-            roads_cost = SitePreparationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            roads_cost.run_module()
-
-            substation_cost = SubstationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            substation_cost.run_module()
+            self.input_dict['detail_level'] = self.detail_level
 
-            transdist_cost = GridConnectionCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            transdist_cost.run_module()
-
-            collection_cost = ArraySystem(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            collection_cost.run_module()
-
-            development_cost = DevelopmentCost(input_dict=self.input_dict, output_dict=self.output_dict,
-                                          project_name=project_name)
-            development_cost.run_module()
+            self.run_cost_module(FoundationCost, project_name)
+            self.run_cost_module(SitePreparationCost, project_name)
+            self.run_cost_module(SubstationCost, project_name)
+            self.run_cost_module(GridConnectionCost, project_name)
+            self.run_cost_module(ArraySystem, project_name)
+            self.run_cost_module(DevelopmentCost, project_name)
 
             erection_cost_output_dict = dict()
-            erection_cost = ErectionCost(
-                input_dict=self.input_dict,
-                output_dict=self.output_dict,
-                project_name=project_name
-            )
-            erection_cost.run_module()
+            self.run_cost_module(ErectionCost, project_name)
             self.output_dict['erection_cost'] = erection_cost_output_dict
 
 
@@ -88,24 +118,163 @@ class Manager:
                 index = road_cost['Type of cost'] == 'Other'
                 other = road_cost[index]
                 amount_shorter_than_input_construction_time = (self.input_dict['construct_duration'] - self.output_dict['siteprep_construction_months'])
-                road_cost.at[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
+                road_cost.loc[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
                 self.output_dict['total_road_cost'] = road_cost
 
-            total_costs = self.output_dict['total_collection_cost']
-            total_costs = total_costs.append(self.output_dict['total_road_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_transdist_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_substation_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_foundation_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_erection_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_development_cost'], sort=False)
+            total_costs = CostTableBuilder()
+            total_costs.add_dataframe(self.output_dict['total_collection_cost'])
+            total_costs.add_dataframe(self.output_dict['total_road_cost'])
+            total_costs.add_dataframe(self.output_dict['total_transdist_cost'])
+            total_costs.add_dataframe(self.output_dict['total_substation_cost'])
+            total_costs.add_dataframe(self.output_dict['total_foundation_cost'])
+            total_costs.add_dataframe(self.output_dict['total_erection_cost'])
+            total_costs.add_dataframe(self.output_dict['total_development_cost'])
+            total_costs = total_costs.to_dataframe()
 
-            self.input_dict['project_value_usd'] = total_costs.sum(numeric_only=True)[0]
-            self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost'].sum(numeric_only=True)[0]
+            self.input_dict['project_value_usd'] = total_costs.sum(numeric_only=True).iloc[0]
+            self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost'].sum(numeric_only=True).iloc[0]
 
-            management_cost = ManagementCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            management_cost.run_module()
+            self.run_cost_module(ManagementCost, project_name)
 
             return 0
         except Exception:
             traceback.print_exc()
             return 1  # module did not run successfully
+
+    def execute_landbosse_gradient(self, project_name, input_keys, relative_step=0.01):
+        """
+        Calculates the derivatives of the cost of each module, and of the
+        total BOS cost, with respect to inputs of the master input
+        dictionary, such as 'hub_height_meters' or 'rotor_diameter_m', by
+        forward finite differences.
+
+        The project runs once at the base point, into self.output_dict,
+        and once more for each input with only that input increased. All
+        of the runs share one ModuleOutputCache, so in each perturbed run
+        only the modules that read the perturbed input, directly or
+        through the outputs of other modules, run again. The outputs of
+        the others come from the base run.
+
+        The inputs calculated from a perturbed input, such as
+        project_size_megawatts from turbine_rating_MW (see DERIVED_INPUTS),
+        are calculated again for its perturbed run. The calculated inputs
+        themselves cannot be differentiated by.
+
+        The crane chosen by ErectionCost can change between the base and
+        a perturbed point. The cost is then discontinuous and its
+        derivative is the slope across the jump rather than a gradient,
+        so those inputs are reported.
+
+        Parameters
+        ----------
+        project_name : str
+            The name of the project.
+
+        input_keys : list
+            The keys of the master input dictionary to differentiate by.
+            Their values must be numbers.
+
+        relative_step : float
+            The step of each input, as a fraction of its value. Inputs
+            whose value is 0 are stepped by relative_step itself.
+
+        Returns
+        -------
+        dict
+            'jacobian': pd.DataFrame with one row for each module and
+            'Total', and one column for each input, of the derivatives in
+            USD per unit of the input. Columns of perturbed runs that
+            failed are NaN, and all of them are NaN if the base run failed.
+
+            'base_costs': pd.Series of the cost of each module and 'Total'
+            at the base point.
+
+            'steps': pd.Series of the step of each input.
+
+            'crane_selection_changed': pd.Series that is True for each
+            input whose step changed the crane selection.
+
+            'module_cache_hits': The number of module runs that were
+            restored from the base run instead of run again.
+
+        Raises
+        ------
+        ValueError
+            If an input is calculated from other inputs.
+        """
+        derived_keys = [key for key in input_keys if key in DERIVED_INPUTS]
+        if len(derived_keys) > 0:
+            raise ValueError(f'{", ".join(derived_keys)} are calculated from other inputs. '
+                             f'Differentiate by the inputs they are calculated from instead.')
+
+        base_input_dict = copy.deepcopy(self.input_dict)
+        module_cache = ModuleOutputCache(max_entries_per_module=len(input_keys) + 1)
+
+        steps = pd.Series(
+            [relative_step * abs(base_input_dict[key]) if base_input_dict[key] != 0 else relative_step for key in input_keys],
+            index=input_keys,
+            dtype=float
+        )
+
+        base_manager = Manager(self.input_dict, self.output_dict, module_cache=module_cache, detail_level=self.detail_level)
+        base_failed = base_manager.execute_landbosse(project_name) != 0
+        base_costs = _module_costs(self.output_dict)
+        base_cranes = _crane_selection(self.output_dict)
+
+        derivatives = dict()
+        crane_selection_changed = pd.Series(False, index=input_keys)
+        for key in input_keys:
+            perturbed_input_dict = copy.deepcopy(base_input_dict)
+            perturbed_input_dict[key] = base_input_dict[key] + steps[key]
+            add_derived_inputs(perturbed_input_dict, changed_keys=[key])
+            perturbed_output_dict = dict()
+            perturbed_manager = Manager(perturbed_input_dict, perturbed_output_dict, module_cache=module_cache,
+                                        detail_level=self.detail_level)
+            if base_failed or perturbed_manager.execute_landbosse(project_name) != 0:
+                derivatives[key] = pd.Series(np.nan, index=base_costs.index)
+                continue
+            perturbed_costs = _module_costs(perturbed_output_dict).reindex(base_costs.index, fill_value=0.0)
+            derivatives[key] = (perturbed_costs - base_costs) / steps[key]
+            crane_selection_changed[key] = _crane_selection(perturbed_output_dict) != base_cranes
+
+        return {
+            'jacobian': pd.DataFrame(derivatives, index=base_costs.index, columns=input_keys),
+            'base_costs': base_costs,
+            'steps': steps,
+            'crane_selection_changed': crane_selection_changed,
+            'module_cache_hits': module_cache.hits,
+        }
+
+
+def _module_costs(output_dict):
+    """
+    Sums the costs of each module in an output dictionary.
+
+    Parameters
+    ----------
+    output_dict : dict
+        The output dictionary of a project.
+
+    Returns
+    -------
+    pd.Series
+        The cost of each module, in alphabetical order, then 'Total'.
+    """
+    module_costs = dict()
+    for key, value in output_dict.items():
+        if key.endswith('_module_type_operation'):
+            for module, cost in zip(value['module'], value['cost_per_project']):
+                module_costs[module] = module_costs.get(module, 0.0) + float(cost)
+    module_costs = pd.Series(module_costs, dtype=float).sort_index()
+    module_costs['Total'] = module_costs.sum()
+    return module_costs
+
+
+def _crane_selection(output_dict):
+    """
+    Returns the cranes chosen by ErectionCost in an output dictionary, as
+    a set of (operation, crane name, boom system) tuples.
+    """
+    if 'erection_crane_selection' not in output_dict:
+        return set()
+    return set(zip(*(output_dict['erection_crane_selection'][field] for field in ['operation', 'crane_name', 'boom_system'])))
@@ -0,0 +1,268 @@
+import copy
+import math
+from collections.abc import MutableMapping
+
+import numpy as np
+import pandas as pd
+
+from .ColumnarRecords import ColumnarRecords
+
+
+# Marker for a key that was absent when a cost module looked it up.
+_MISSING = object()
+
+
+class TrackedDict(MutableMapping):
+    """
+    TrackedDict wraps the master input dictionary or the output dictionary
+    while a cost module runs. Every read and write passes straight through
+    to the wrapped dictionary, so the module behaves exactly as it does with
+    a plain dict, but each key that is read or written is reported to the
+    ModuleOutputCache that created the wrapper.
+
+    Keys listed in nested_keys hold dictionaries of their own (such as
+    project_data, which holds the project data sheets). Those are wrapped
+    in turn so that a dependency is recorded on the individual sheet
+    rather than on the dictionary of all sheets.
+    """
+
+    def __init__(self, data, cache, path, nested_keys=()):
+        """
+        Parameters
+        ----------
+        data : dict
+            The dictionary to wrap.
+
+        cache : ModuleOutputCache
+            The cache that receives the reads and writes.
+
+        path : tuple
+            The path of this dictionary from the root of the tracked
+            dictionaries, such as ('input', 'project_data').
+
+        nested_keys : tuple
+            Keys whose dictionary values should be tracked per key.
+        """
+        self._data = data
+        self._cache = cache
+        self._path = path
+        self._nested_keys = nested_keys
+
+    def __getitem__(self, key):
+        path = self._path + (key,)
+        try:
+            value = self._data[key]
+        except KeyError:
+            self._cache.record_read(path, _MISSING)
+            raise
+        if key in self._nested_keys and isinstance(value, dict):
+            return TrackedDict(value, self._cache, path)
+        self._cache.record_read(path, value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._cache.record_write(self._path + (key,))
+
+    def __delitem__(self, key):
+        del self._data[key]
+        self._cache.record_write(self._path + (key,))
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ModuleOutputCache:
+    """
+    ModuleOutputCache lets the Manager skip cost modules whose inputs have
+    not changed since they last ran.
+
+    While a cost module runs, its input and output dictionaries are wrapped
+    in TrackedDict instances. Those record every key the module reads (its
+    dependencies, including values written earlier in the run by other
+    modules) and every key it writes (its outputs). When the module finishes
+    successfully, copies of both are stored.
+
+    The next time the same module is about to run, typically for the next
+    point of a parametric sweep, the stored dependencies are compared to
+    the current values in the dictionaries. If every dependency is
+    unchanged, the stored outputs are copied into the output dictionary
+    and the module is not run. Otherwise the module runs and its new
+    dependencies and outputs replace the oldest stored entry.
+
+    An instance is meant to live across many calls to
+    Manager.execute_landbosse() in the same process. Parametric sweeps get
+    the most benefit when consecutive projects differ in as few inputs as
+    possible (see XlsxManagerRunner.order_for_incremental_evaluation()).
+    """
+
+    def __init__(self, max_entries_per_module=4):
+        """
+        Parameters
+        ----------
+        max_entries_per_module : int
+            How many sets of dependencies and outputs to remember for each
+            cost module. The oldest entry is discarded first.
+        """
+        self.max_entries_per_module = max_entries_per_module
+        self.hits = 0
+        self.misses = 0
+        self._entries = dict()
+        self._reads = None
+        self._writes = None
+
+    def run_module(self, module_class, input_dict, output_dict, project_name):
+        """
+        Runs a cost module or restores its outputs from the cache.
+
+        Parameters
+        ----------
+        module_class : type
+            The class of the cost module. It must have a constructor that
+            accepts input_dict, output_dict and project_name keyword
+            arguments and a run_module() method.
+
+        input_dict : dict
+            The master input dictionary of the project.
+
+        output_dict : dict
+            The output dictionary of the project.
+
+        project_name : str
+            The name of the project.
+
+        Returns
+        -------
+        tuple
+            The (status, error) tuple from run_module(). A restored module
+            returns (0, 0).
+        """
+        module_name = module_class.__name__
+        roots = {'input': input_dict, 'output': output_dict}
+
+        for entry in self._entries.get(module_name, []):
+            dependencies, outputs = entry
+            if all(_values_equal(_resolve(roots, path), value) for path, value in dependencies.items()):
+                for path, value in outputs.items():
+                    _assign(roots, path, _relabel_project(copy.deepcopy(value), project_name))
+                self.hits += 1
+                return 0, 0
+
+        self.misses += 1
+        self._reads = dict()
+        self._writes = set()
+        try:
+            module = module_class(
+                input_dict=TrackedDict(input_dict, self, ('input',), nested_keys=('project_data',)),
+                output_dict=TrackedDict(output_dict, self, ('output',)),
+                project_name=project_name
+            )
+            result = module.run_module()
+            status = result[0] if isinstance(result, tuple) else result
+            if status == 0:
+                outputs = {path: copy.deepcopy(_resolve(roots, path)) for path in self._writes}
+                entries = self._entries.setdefault(module_name, [])
+                entries.insert(0, (self._reads, outputs))
+                del entries[self.max_entries_per_module:]
+            return result
+        finally:
+            self._reads = None
+            self._writes = None
+
+    def record_read(self, path, value):
+        """
+        Records that the running module read a key. Only the first read of
+        a key that the module has not written itself is a dependency.
+
+        Parameters
+        ----------
+        path : tuple
+            The path of the key, such as ('input', 'num_turbines').
+
+        value : object
+            The value that was read.
+        """
+        if self._reads is None or path in self._reads or path in self._writes:
+            return
+        self._reads[path] = value if value is _MISSING else copy.deepcopy(value)
+
+    def record_write(self, path):
+        """
+        Records that the running module wrote a key.
+
+        Parameters
+        ----------
+        path : tuple
+            The path of the key, such as ('output', 'total_substation_cost').
+        """
+        if self._writes is not None:
+            self._writes.add(path)
+
+
+def _resolve(roots, path):
+    """
+    Looks up a path in the plain (untracked) dictionaries. Returns _MISSING
+    if any key along the path is absent.
+    """
+    value = roots[path[0]]
+    for key in path[1:]:
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _assign(roots, path, value):
+    """
+    Assigns a value at a path in the plain (untracked) dictionaries. A
+    _MISSING value deletes the key.
+    """
+    parent = roots[path[0]]
+    for key in path[1:-1]:
+        parent = parent[key]
+    if value is _MISSING:
+        parent.pop(path[-1], None)
+    else:
+        parent[path[-1]] = value
+
+
+def _relabel_project(value, project_name):
+    """
+    Detail and cost rows carry the name of the project that produced
+    them. When outputs are restored for another project, this replaces
+    that name with the name of the current project.
+    """
+    if isinstance(value, ColumnarRecords):
+        value.relabel_project(project_name)
+    return value
+
+
+def _values_equal(a, b):
+    """
+    Compares two values found in the input or output dictionaries,
+    including dataframes, series, arrays, and nested dicts and lists.
+    NaNs compare equal to each other.
+    """
+    if a is _MISSING or b is _MISSING:
+        return a is b
+    if isinstance(a, (pd.DataFrame, pd.Series)) or isinstance(b, (pd.DataFrame, pd.Series)):
+        return type(a) is type(b) and a.equals(b)
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        try:
+            return np.array_equal(a, b, equal_nan=True)
+        except TypeError:
+            return np.array_equal(a, b)
+    if isinstance(a, dict) or isinstance(b, dict):
+        return isinstance(a, dict) and isinstance(b, dict) and a.keys() == b.keys() and \
+            all(_values_equal(a[key], b[key]) for key in a)
+    if isinstance(a, (list, tuple)) or isinstance(b, (list, tuple)):
+        return type(a) is type(b) and len(a) == len(b) and all(_values_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
@@ -3,7 +3,8 @@ import numpy as np
 import math
 from .WeatherDelay import WeatherDelay as WD
 import traceback
-from .CostModule import CostModule
+from .CostModule import CostModule, CostTableBuilder
+from .ColumnarRecords import DetailRecordsBuilder
 
 
 class SitePreparationCost(CostModule):
@@ -356,11 +357,10 @@ class SitePreparationCost(CostModule):
                                       'embankment cubic yards road': estimate_construction_time_output['topsoil_volume']
                                       }
 
-        material_needs = pd.DataFrame(columns=['Units', 'Quantity of material'])
+        material_needs = CostTableBuilder(columns=['Units', 'Quantity of material'])
         for unit in list_units:
-            unit_quantity = pd.DataFrame([[unit, material_quantity_dict[unit]]],
-                                         columns=['Units', 'Quantity of material'])
-            material_needs = material_needs.append(unit_quantity)
+            material_needs.add_row(unit, material_quantity_dict[unit])
+        material_needs = material_needs.to_dataframe()
 
         estimate_construction_time_output['material_needs'] = material_needs
 
@@ -493,14 +493,10 @@ class SitePreparationCost(CostModule):
         # New + old roads material cost:
         if calculate_cost_input_dict['turbine_rating_MW'] >= 0.1:
             material_cost_of_old_and_new_roads = self.new_and_existing_total_road_cost(material_cost_of_new_roads)
-            material_costs = pd.DataFrame(
-                [['Materials', float(material_cost_of_old_and_new_roads), 'Roads']],
-                columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            material_costs = ('Materials', float(material_cost_of_old_and_new_roads), 'Roads')
         else:
             material_cost_of_old_and_new_roads = material_cost_of_new_roads
-            material_costs = pd.DataFrame(
-                [['Materials', float(material_cost_of_old_and_new_roads), 'Small DW Roads']],
-                columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            material_costs = ('Materials', float(material_cost_of_old_and_new_roads), 'Small DW Roads')
 
 
 
@@ -545,8 +541,7 @@ class SitePreparationCost(CostModule):
                                            calculate_cost_output_dict['managament_crew_cost_before_wind_delay']
 
             labor_for_new_and_old_roads_cost_usd = self.new_and_existing_total_road_cost(labor_for_new_roads_cost_usd)
-            labor_costs = pd.DataFrame([['Labor', float(labor_for_new_and_old_roads_cost_usd), 'Roads']],
-                                       columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            labor_costs = ('Labor', float(labor_for_new_and_old_roads_cost_usd), 'Roads')
 
         elif calculate_cost_input_dict['road_distributed_wind'] and \
                 calculate_cost_input_dict['turbine_rating_MW'] < 0.1:  # small DW
@@ -554,8 +549,7 @@ class SitePreparationCost(CostModule):
             labor_for_new_roads_cost_usd = (labor_data['Cost USD'].sum())
             labor_for_new_and_old_roads_cost_usd = self.new_and_existing_total_road_cost(labor_for_new_roads_cost_usd)
 
-            labor_costs = pd.DataFrame([['Labor', float(labor_for_new_and_old_roads_cost_usd), 'Small DW Roads']],
-                                       columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            labor_costs = ('Labor', float(labor_for_new_and_old_roads_cost_usd), 'Small DW Roads')
 
         else:
             labor_for_new_roads_cost_usd = labor_data['Cost USD'].sum() + \
@@ -563,13 +557,9 @@ class SitePreparationCost(CostModule):
 
             labor_for_new_and_old_roads_cost_usd = self.new_and_existing_total_road_cost(labor_for_new_roads_cost_usd)
 
-            labor_costs = pd.DataFrame([['Labor',
+            labor_costs = ('Labor',
                                          float(labor_for_new_and_old_roads_cost_usd),
-                                         'Roads']],
-
-                                       columns=['Type of cost',
-                                                'Cost USD',
-                                                'Phase of construction'])
+                                         'Roads')
 
         # Filter out equipment costs from rsmeans tab:
         if calculate_cost_input_dict['turbine_rating_MW'] >= 0.1:
@@ -589,12 +579,10 @@ class SitePreparationCost(CostModule):
 
         if calculate_cost_input_dict['turbine_rating_MW'] >= 0.1:
             equip_for_new_and_old_roads_cost_usd = self.new_and_existing_total_road_cost(equip_for_new_roads_cost_usd)
-            equipment_costs = pd.DataFrame([['Equipment rental', float(equip_for_new_and_old_roads_cost_usd), 'Roads']],
-                columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            equipment_costs = ('Equipment rental', float(equip_for_new_and_old_roads_cost_usd), 'Roads')
         else:
             equip_for_new_and_old_roads_cost_usd = self.new_and_existing_total_road_cost(equip_for_new_roads_cost_usd)
-            equipment_costs = pd.DataFrame([['Equipment rental', float(equip_for_new_and_old_roads_cost_usd), 'Small DW Roads']],
-                                           columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            equipment_costs = ('Equipment rental', float(equip_for_new_and_old_roads_cost_usd), 'Small DW Roads')
 
         # add costs for other operations not included in process data for utility mode (e.g., fencing, access roads)
         if calculate_cost_input_dict['turbine_rating_MW'] > 0.1:
@@ -607,19 +595,17 @@ class SitePreparationCost(CostModule):
                         (float(num_turbines) * 17639) + (float(num_turbines) * float(rotor_diameter_m) * 24.8) + (
                             float(construct_duration) * 55500) + float(num_access_roads) * 3800)
             cost_adder = self.new_and_existing_total_road_cost(cost_new_roads_adder)
-            additional_costs = pd.DataFrame([['Other', float(cost_adder), 'Roads']],
-                                            columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            additional_costs = ('Other', float(cost_adder), 'Roads')
 
         else:  # No 'Other' cost in distributed wind mode:
             cost_new_roads_adder = 0
             cost_adder = self.new_and_existing_total_road_cost(cost_new_roads_adder)
-            additional_costs = pd.DataFrame([['Other', float(cost_adder), 'Small DW Roads']],
-                                            columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            additional_costs = ('Other', float(cost_adder), 'Small DW Roads')
 
 
 
-        # Create empty road cost (showing cost breakdown by type) dataframe:
-        road_cost = pd.DataFrame(columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+        # Accumulate the rows of the road cost (showing cost breakdown by type) dataframe:
+        road_cost = CostTableBuilder()
 
         #Filter out equipment costs from rsmeans tab:
         equipment_data = labor_equip_data[labor_equip_data['Type of cost'] == 'Equipment rental'].copy()
@@ -627,8 +613,7 @@ class SitePreparationCost(CostModule):
 
         equip_for_new_roads_cost_usd = equipment_data['Cost USD'].sum()
         equip_for_new_and_old_roads_cost_usd = self.new_and_existing_total_road_cost(equip_for_new_roads_cost_usd)
-        equipment_costs = pd.DataFrame([['Equipment rental', float(equip_for_new_and_old_roads_cost_usd), 'Roads']],
-            columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+        equipment_costs = ('Equipment rental', float(equip_for_new_and_old_roads_cost_usd), 'Roads')
 
         # add costs for other operations not included in process data (e.g., fencing, access roads)
         #
@@ -652,36 +637,32 @@ class SitePreparationCost(CostModule):
             num_turbines * 17639 + num_turbines * rotor_diameter_m * 24.8 + calculate_cost_input_dict['construct_duration'] * 55500 \
             + num_access_roads * 3800
         cost_adder = self.new_and_existing_total_road_cost(cost_new_roads_adder)
-        additional_costs = pd.DataFrame([['Other', cost_adder, 'Roads']],
-                                        columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+        additional_costs = ('Other', cost_adder, 'Roads')
 
-        road_cost = road_cost.append(material_costs)
-        road_cost = road_cost.append(equipment_costs)
-        road_cost = road_cost.append(labor_costs)
-        road_cost = road_cost.append(additional_costs)
+        road_cost.add_row(*material_costs)
+        road_cost.add_row(*equipment_costs)
+        road_cost.add_row(*labor_costs)
+        road_cost.add_row(*additional_costs)
 
         # set mobilization cost equal to 5% of total road cost for utility scale model and function of
         # of turbine size for distributed wind:
         if calculate_cost_input_dict['num_turbines'] > 10:
-            mobilization_costs_new_roads = road_cost["Cost USD"].sum() * 0.05
+            mobilization_costs_new_roads = road_cost.column_sum('Cost USD') * 0.05
             mobilization_costs_new_plus_old_roads = self.new_and_existing_total_road_cost(mobilization_costs_new_roads)
-            mobilization_costs = pd.DataFrame([['Mobilization', mobilization_costs_new_plus_old_roads, 'Roads']],
-                                              columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+            mobilization_costs = ('Mobilization', mobilization_costs_new_plus_old_roads, 'Roads')
         else:
-            mobilization_costs_new_roads = road_cost["Cost USD"].sum() * \
+            mobilization_costs_new_roads = road_cost.column_sum('Cost USD') * \
                                            self.mobilization_cost_multiplier(calculate_cost_input_dict['turbine_rating_MW'])
             mobilization_costs_new_plus_old_roads = self.new_and_existing_total_road_cost(mobilization_costs_new_roads)
 
             if calculate_cost_input_dict['turbine_rating_MW'] >= 0.1:
-                mobilization_costs = pd.DataFrame([['Mobilization', mobilization_costs_new_plus_old_roads, 'Roads']],
-                                                  columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+                mobilization_costs = ('Mobilization', mobilization_costs_new_plus_old_roads, 'Roads')
             else:
-                mobilization_costs = pd.DataFrame([['Mobilization', mobilization_costs_new_plus_old_roads, 'Small DW Roads']],
-                                                  columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+                mobilization_costs = ('Mobilization', mobilization_costs_new_plus_old_roads, 'Small DW Roads')
 
 
-        road_cost = road_cost.append(mobilization_costs)
-        total_road_cost = road_cost
+        road_cost.add_row(*mobilization_costs)
+        total_road_cost = road_cost.to_dataframe()
         calculate_cost_output_dict['total_road_cost'] = total_road_cost
         calculate_cost_output_dict['siteprep_construction_months'] = siteprep_construction_months
         return total_road_cost
@@ -689,120 +670,34 @@ class SitePreparationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
-
+        Creates the rows of the details output.
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        DetailRecords
+            The detail rows of this module.
         """
-        result = []
-        module = type(self).__name__
-
-        # Note that some values are cast with float() so that XlsxWriter
-        # (the library depended on by XlsxGenerator) can output them as
-        # numbers. XlsxWriter, interestingly, cannot handle np.float32()
-        # types.
-
-        result.append({
-            'unit': 'm^3',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total road volume',
-            'value': float(self.output_dict['road_volume_m3'])
-        })
-
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Depth to subgrade',
-            'value': self.output_dict['depth_to_subgrade_m']
-        })
-
-        result.append({
-            'unit': 'ft',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Crane path width',
-            'value': self.output_dict['crane_path_width_m']     #TODO: Rename variable to: crane_path_width_ft
-        })
+        details = DetailRecordsBuilder()
+        details.add_number('Total road volume', self.output_dict['road_volume_m3'], unit='m^3')
+        details.add_number('Depth to subgrade', self.output_dict['depth_to_subgrade_m'], unit='m')
+        details.add_number('Crane path width', self.output_dict['crane_path_width_m'], unit='ft')     #TODO: Rename variable to: crane_path_width_ft
 
         if not input_dict['road_distributed_wind']:
-            result.append({
-                'unit': 'm',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Road length',
-                'value': float(self.output_dict['road_length_m'])
-            })
-
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Road width',
-            'value': self.output_dict['road_width_m']
-        })
-
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Road thickness',
-            'value': self.output_dict['road_thickness_m']
-        })
-
-
-
-        result.append({
-            'unit': 'cubic yards',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Material volume',
-            'value': float(self.output_dict['material_volume_cubic_yards'])
-        })
-
-        result.append({
-            'unit': 'cubic yards',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Topsoil volume',
-            'value': float(self.output_dict['topsoil_volume'])
-        })
-
-        if input_dict['turbine_rating_MW'] >= 0.1:
-            result.append({
-                'unit': 'cubic yards',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Embankment volume crane',
-                'value': float(self.output_dict['embankment_volume_crane'])
-            })
-
-            result.append({
-                'unit': 'cubic yards',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Embankment volume road',
-                'value': float(self.output_dict['embankment_volume_road'])
-            })
-
-            result.append({
-                'unit': 'ft^2',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Rough grading area',
-                'value': float(self.output_dict['rough_grading_area'])
-            })
-
-        for row in self.output_dict['total_road_cost'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
+            details.add_number('Road length', self.output_dict['road_length_m'], unit='m')
 
+        details.add_number('Road width', self.output_dict['road_width_m'], unit='m')
+        details.add_number('Road thickness', self.output_dict['road_thickness_m'], unit='m')
+        details.add_number('Material volume', self.output_dict['material_volume_cubic_yards'], unit='cubic yards')
+        details.add_number('Topsoil volume', self.output_dict['topsoil_volume'], unit='cubic yards')
 
+        if input_dict['turbine_rating_MW'] >= 0.1:
+            details.add_number('Embankment volume crane', self.output_dict['embankment_volume_crane'], unit='cubic yards')
+            details.add_number('Embankment volume road', self.output_dict['embankment_volume_road'], unit='cubic yards')
+            details.add_number('Rough grading area', self.output_dict['rough_grading_area'], unit='ft^2')
 
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
+        details.add_cost_dataframe(self.output_dict['total_road_cost'])
 
+        result = details.build(self.project_name, type(self).__name__)
         self.output_dict['roads_cost_csv'] = result
         return result
 
@@ -869,7 +764,8 @@ class SitePreparationCost(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['siteprep_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_road_cost'],
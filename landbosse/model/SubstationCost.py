@@ -1,8 +1,8 @@
 import traceback
 import pandas as pd
-import math
 
 from .CostModule import CostModule
+from .ColumnarRecords import DetailRecordsBuilder
 
 
 class SubstationCost(CostModule):
@@ -92,33 +92,19 @@ class SubstationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Creates the rows of the details output.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        DetailRecords
+            The detail rows of this module.
         """
-        result = []
-        module = type(self).__name__
-
-        for row in self.output_dict['substation_cost_output_df'].itertuples():
-            dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
+        details = DetailRecordsBuilder()
+        details.add_cost_dataframe(self.output_dict['substation_cost_output_df'])
 
+        result = details.build(self.project_name, type(self).__name__)
         self.output_dict['substation_cost_csv'] = result
         return result
 
@@ -142,7 +128,8 @@ class SubstationCost(CostModule):
         """
         try:
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detail_level() != 'none':
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['substation_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['substation_cost_output_df'],
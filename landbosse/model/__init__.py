@@ -8,4 +8,6 @@ from .SubstationCost import SubstationCost
 from .GridConnectionCost import GridConnectionCost
 from .CollectionCost import Cable, Array, ArraySystem
 from .DevelopmentCost import DevelopmentCost
-from .DefaultMasterInputDict import DefaultMasterInputDict
+from .DefaultMasterInputDict import DefaultMasterInputDict, DERIVED_INPUTS, add_derived_inputs
+from .ModuleOutputCache import ModuleOutputCache
+from .ColumnarRecords import ColumnarRecords, CostRecords, DetailRecords, DetailRecordsBuilder, CraneSelectionRecords
@@ -0,0 +1,211 @@
+import pandas as pd
+
+
+# The operations that ErectionCost chooses cranes for. Base is missing
+# from projects without a separate crane for the base of the tower.
+CRANE_OPERATIONS = ('Base', 'Offload', 'Top')
+
+# The inputs that are kept with the crane choices when the details are
+# extended with the project list, as in extended_landbosse_details.csv.
+CRANE_CHOICE_INPUT_COLUMNS = (
+    'Number of turbines',
+    'Breakpoint between base and topping (percent)',
+    'Turbine rating MW',
+    'Crane breakdown fraction',
+    'Labor cost multiplier',
+    'Hub height m',
+)
+
+CRANE_CHOICE = 'crane_choice: Crew name - Boom system - Operation'
+CRANE_DATA_OUTPUT = 'crane_data_output: crane_boom_operation_concat - variable - value'
+CRANE_COST_DETAILS = 'crane_cost_details: Operation ID - Type of cost - Cost'
+
+
+def extract_crane_choice(details):
+    """
+    This function extracts the crane chosen for each operation of each
+    project, and its wind multiplier, operation time and total cost, from
+    the details of ErectionCost. The details of all the projects are
+    parsed and pivoted together rather than queried project by project.
+
+    The wind multipliers, operation times and total costs are in the
+    details only when they are made at the 'full' detail level. Otherwise
+    those columns are missing values. pivot_crane_selection() makes the
+    same columns from the crane selection output, which has them at every
+    detail level.
+
+    The columns returned in the dataframe are:
+
+    'Project ID with serial': The project.
+
+    The columns of CRANE_CHOICE_INPUT_COLUMNS that are in details, such as
+    when details is read from extended_landbosse_details.csv.
+
+    '<operation> crane choice': The crew name and boom system of the
+        crane, such as 'LR1500 SL3F'.
+
+    '<operation> total cost': The total cost of the crane in USD.
+
+    '<operation> wind multiplier': The wind multiplier of the crane.
+
+    '<operation> operation time all turbines (hours)': The operation time
+        of the crane for all the turbines.
+
+    where <operation> is Base, Offload and Top. Projects without a base
+    crane have missing values in the Base columns.
+
+    Parameters
+    ----------
+    details : pd.DataFrame
+        The details, with the columns of landbosse-details.csv.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row for each project with ErectionCost details, in the order
+        the projects first appear in details.
+    """
+    key = 'Project ID with serial'
+    erection = details[details['Module'] == 'ErectionCost']
+    projects = pd.Index(erection[key].unique(), name=key)
+
+    input_columns = [column for column in CRANE_CHOICE_INPUT_COLUMNS if column in details.columns]
+    result = erection.groupby(key, sort=False)[input_columns].first().reindex(projects)
+
+    # crane_choice rows are 'crew - boom - operation'
+    crane_choice_rows = erection[erection['Variable name'] == CRANE_CHOICE]
+    if len(crane_choice_rows) > 0:
+        parts = crane_choice_rows['Non-numeric value'].str.split(' - ', n=2, expand=True)
+        crane_choice = _pivot_operations(
+            project_id_with_serial=crane_choice_rows[key],
+            operation=parts[2],
+            value=parts[0] + ' ' + parts[1],
+            projects=projects
+        )
+    else:
+        crane_choice = pd.DataFrame(index=projects, columns=list(CRANE_OPERATIONS), dtype=object)
+
+    # crane_data_output and crane_cost_details rows are
+    # 'crew-boom-operation - variable - value', with the value in the
+    # numeric value column too.
+    total_cost = _crane_variable(erection, CRANE_COST_DETAILS, 'Total cost USD', projects)
+    wind_multiplier = _crane_variable(erection, CRANE_DATA_OUTPUT, 'Wind multiplier', projects)
+    operation_time = _crane_variable(erection, CRANE_DATA_OUTPUT, 'Operation time all turbines hrs', projects)
+
+    for name, values in [('crane choice', crane_choice), ('total cost', total_cost),
+                         ('wind multiplier', wind_multiplier), ('operation time all turbines (hours)', operation_time)]:
+        for operation in CRANE_OPERATIONS:
+            result[f'{operation} {name}'] = values[operation]
+
+    return result.reset_index()
+
+
+def pivot_crane_selection(crane_selection):
+    """
+    This function arranges the crane selection output of ErectionCost,
+    as in landbosse-crane-selection.csv, into the columns of
+    extract_crane_choice(). Unlike the details, the crane selection has
+    the wind multipliers, operation times and total costs at every detail
+    level and needs no parsing of text.
+
+    Parameters
+    ----------
+    crane_selection : pd.DataFrame
+        The crane selection, with the columns of
+        landbosse-crane-selection.csv.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row for each project, in the order the projects first appear
+        in crane_selection, with the crane columns of
+        extract_crane_choice().
+    """
+    key = 'Project ID with serial'
+    projects = pd.Index(crane_selection[key].unique(), name=key)
+    result = pd.DataFrame(index=projects)
+    columns = [
+        ('crane choice', crane_selection['Crane name'] + ' ' + crane_selection['Boom system']),
+        ('total cost', crane_selection['Total cost USD']),
+        ('wind multiplier', crane_selection['Wind multiplier']),
+        ('operation time all turbines (hours)', crane_selection['Operation time all turbines hrs']),
+    ]
+    for name, value in columns:
+        values = _pivot_operations(crane_selection[key], crane_selection['Operation'], value, projects)
+        for operation in CRANE_OPERATIONS:
+            result[f'{operation} {name}'] = values[operation]
+    return result.reset_index()
+
+
+def _crane_variable(erection, variable_name, crane_variable, projects):
+    """
+    Pivots one variable of the crane_data_output or crane_cost_details
+    rows into one column per operation.
+
+    Parameters
+    ----------
+    erection : pd.DataFrame
+        The ErectionCost details.
+
+    variable_name : str
+        CRANE_DATA_OUTPUT or CRANE_COST_DETAILS
+
+    crane_variable : str
+        The variable of the crane, such as 'Wind multiplier'.
+
+    projects : pd.Index
+        The projects, which are the rows of the result.
+
+    Returns
+    -------
+    pd.DataFrame
+        The numeric values of the variable, with one column for each
+        operation in CRANE_OPERATIONS.
+    """
+    rows = erection[erection['Variable name'] == variable_name]
+    if len(rows) == 0:
+        return pd.DataFrame(index=projects, columns=list(CRANE_OPERATIONS), dtype=float)
+    parts = rows['Non-numeric value'].str.split(' - ', n=2, expand=True)
+    selected = (parts[1] == crane_variable).to_numpy()
+    return _pivot_operations(
+        project_id_with_serial=rows['Project ID with serial'][selected],
+        operation=parts[0][selected].str.rsplit('-', n=1).str[-1],
+        value=rows['Numeric value'][selected],
+        projects=projects
+    )
+
+
+def _pivot_operations(project_id_with_serial, operation, value, projects):
+    """
+    Arranges values into one row per project and one column per operation.
+    If a project has more than one value for an operation, the first is
+    kept.
+
+    Parameters
+    ----------
+    project_id_with_serial : pd.Series
+        The project of each value.
+
+    operation : pd.Series
+        The operation of each value.
+
+    value : pd.Series
+        The values.
+
+    projects : pd.Index
+        The projects, which are the rows of the result.
+
+    Returns
+    -------
+    pd.DataFrame
+        The values, with one column for each operation in
+        CRANE_OPERATIONS.
+    """
+    values = pd.DataFrame({
+        'project': project_id_with_serial.to_numpy(),
+        'operation': operation.to_numpy(),
+        'value': value.to_numpy()
+    })
+    values = values.drop_duplicates(['project', 'operation'])
+    pivoted = values.pivot(index='project', columns='operation', values='value')
+    return pivoted.reindex(index=projects, columns=list(CRANE_OPERATIONS))
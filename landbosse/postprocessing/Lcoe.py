@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+
+class LcoeCalculator:
+    """
+    This class calculates the levelized cost of energy (LCOE) of each
+    project from its balance of system (BOS) costs and tables of annual
+    energy production (AEP) and turbine capital cost (TCC).
+
+    The AEP and TCC tables are joined once, and indexed by turbine rating
+    and rotor diameter, when the calculator is made. The BOS costs are then
+    added with add_costs() as the projects run, which sums them to one row
+    per project, so that the costs do not need to be kept or read back
+    from the output files. It is used in the following manner:
+
+    lcoe_calculator = LcoeCalculator.from_csv('aep.csv', 'tcc.csv')
+    lcoe_calculator.add_costs(final_result['module_type_operation_list'])
+    lcoe = lcoe_calculator.lcoe()
+
+    The columns of the AEP and TCC tables must include 'Rating [kW]' and
+    'Rotor Diam [m]'. The AEP table must have 'AEP [kWh/yr]' and the TCC
+    table must have 'TCC [USD/kW]'.
+    """
+
+    key_columns = ['Rating [kW]', 'Rotor Diam [m]']
+
+    def __init__(self, aep, tcc, fcr=0.079, opex_usd_per_kw=52.0):
+        """
+        Parameters
+        ----------
+        aep : pd.DataFrame
+            The AEP of one turbine for each turbine rating and rotor
+            diameter.
+
+        tcc : pd.DataFrame
+            The TCC for each turbine rating and rotor diameter.
+
+        fcr : float
+            The fixed charge rate.
+
+        opex_usd_per_kw : float
+            The annual operational expenditures in USD per kW.
+
+        Raises
+        ------
+        ValueError
+            If more than one row of the joined AEP and TCC tables has the
+            same turbine rating and rotor diameter.
+        """
+        self.aep_tcc = aep.merge(tcc, on=self.key_columns)
+        self.fcr = fcr
+        self.opex_usd_per_kw = opex_usd_per_kw
+        self._index = pd.MultiIndex.from_arrays([_key(self.aep_tcc[column]) for column in self.key_columns])
+        if not self._index.is_unique:
+            raise ValueError('The AEP and TCC tables have more than one row for the same Rating [kW] and Rotor Diam [m].')
+        self._projects = []
+
+    @classmethod
+    def from_csv(cls, aep_csv, tcc_csv, wind_speed_m_per_s=None, blade_mass_exp=None, **kwargs):
+        """
+        Makes a calculator from aep.csv and tcc.csv files.
+
+        Parameters
+        ----------
+        aep_csv : str
+            The path of the AEP .csv file.
+
+        tcc_csv : str
+            The path of the TCC .csv file.
+
+        wind_speed_m_per_s : float
+            If given, only the rows of the AEP table with this
+            'Wind Speed [m/s]' are used, as for the tables of
+            TurbineScalingTableBuilder.
+
+        blade_mass_exp : float
+            If given, only the rows of the TCC table with this
+            'Blade Mass Exp' are used.
+
+        kwargs
+            The other arguments of the constructor.
+
+        Returns
+        -------
+        LcoeCalculator
+            The calculator.
+        """
+        aep = _select(pd.read_csv(aep_csv), 'Wind Speed [m/s]', wind_speed_m_per_s)
+        tcc = _select(pd.read_csv(tcc_csv), 'Blade Mass Exp', blade_mass_exp)
+        return cls(aep, tcc, **kwargs)
+
+    @classmethod
+    def from_parquet(cls, aep_parquet, tcc_parquet, wind_speed_m_per_s=None, blade_mass_exp=None, **kwargs):
+        """
+        Makes a calculator from aep.parquet and tcc.parquet files, such as
+        those written by TurbineScalingTableBuilder. This needs pyarrow.
+
+        Parameters
+        ----------
+        aep_parquet : str
+            The path of the AEP .parquet file.
+
+        tcc_parquet : str
+            The path of the TCC .parquet file.
+
+        wind_speed_m_per_s : float
+            If given, only the rows of the AEP table with this
+            'Wind Speed [m/s]' are used.
+
+        blade_mass_exp : float
+            If given, only the rows of the TCC table with this
+            'Blade Mass Exp' are used.
+
+        kwargs
+            The other arguments of the constructor.
+
+        Returns
+        -------
+        LcoeCalculator
+            The calculator.
+        """
+        aep = _select(pd.read_parquet(aep_parquet), 'Wind Speed [m/s]', wind_speed_m_per_s)
+        tcc = _select(pd.read_parquet(tcc_parquet), 'Blade Mass Exp', blade_mass_exp)
+        return cls(aep, tcc, **kwargs)
+
+    def add_costs(self, costs):
+        """
+        Adds the BOS costs of one or more projects.
+
+        Parameters
+        ----------
+        costs : CostRecords
+            The cost records of the projects.
+        """
+        self.add_project_costs(
+            project_id_with_serial=costs['project_id_with_serial'],
+            num_turbines=costs['num_turbines'],
+            turbine_rating_MW=costs['turbine_rating_MW'],
+            rotor_diameter_m=costs['rotor_diameter_m'],
+            cost_per_project=costs['cost_per_project']
+        )
+
+    def add_project_costs(self, *, project_id_with_serial, num_turbines, turbine_rating_MW, rotor_diameter_m, cost_per_project):
+        """
+        Adds BOS costs given as columns, such as those of
+        landbosse-costs.csv. The costs of each project are summed.
+
+        It must be called with keyword arguments.
+
+        Parameters
+        ----------
+        project_id_with_serial : array-like
+            The project of each cost.
+
+        num_turbines : array-like
+            The number of turbines of the project of each cost.
+
+        turbine_rating_MW : array-like
+            The turbine rating of the project of each cost.
+
+        rotor_diameter_m : array-like
+            The rotor diameter of the project of each cost.
+
+        cost_per_project : array-like
+            The costs in USD.
+        """
+        codes, projects = pd.factorize(np.asarray(project_id_with_serial, dtype=object))
+        if len(projects) == 0:
+            return
+        first = np.unique(codes, return_index=True)[1]
+        self._projects.append(pd.DataFrame({
+            'Project ID with serial': projects,
+            'Rating [kW]': np.asarray(turbine_rating_MW, dtype=float)[first] * 1000,
+            'Rotor Diam [m]': np.asarray(rotor_diameter_m, dtype=float)[first],
+            'Number of turbines': np.asarray(num_turbines)[first],
+            'BOS Capex [USD]': np.bincount(codes, weights=np.asarray(cost_per_project, dtype=float), minlength=len(projects)),
+        }))
+
+    def bos_capex(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The BOS capital expenditures of each project added so far.
+        """
+        if len(self._projects) == 0:
+            return pd.DataFrame(columns=['Project ID with serial', 'Rating [kW]', 'Rotor Diam [m]', 'Number of turbines', 'BOS Capex [USD]'])
+        return pd.concat(self._projects, ignore_index=True)
+
+    def lcoe(self):
+        """
+        Calculates the LCOE of each project added so far. Projects whose
+        turbine rating and rotor diameter are not in both the AEP and TCC
+        tables are left out.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row for each project, with the project, the columns of the
+            AEP and TCC tables, the number of turbines, the BOS capex, the
+            FCR, the opex and the LCOE.
+        """
+        bos = self.bos_capex()
+        positions = self._index.get_indexer(pd.MultiIndex.from_arrays([_key(bos[column]) for column in self.key_columns]))
+        found = positions >= 0
+        bos = bos[found].reset_index(drop=True)
+
+        lcoe = self.aep_tcc.iloc[positions[found]].reset_index(drop=True)
+        lcoe.insert(0, 'Project ID with serial', bos['Project ID with serial'])
+        lcoe['Number of turbines'] = bos['Number of turbines']
+        lcoe['BOS Capex [USD]'] = bos['BOS Capex [USD]']
+        lcoe['FCR'] = self.fcr
+        lcoe['Opex [USD/kW]'] = self.opex_usd_per_kw
+
+        lcoe['Total Opex [USD]'] = lcoe['Opex [USD/kW]'] * lcoe['Rating [kW]'] * lcoe['Number of turbines']
+        lcoe['Turbine Capex [USD]'] = lcoe['TCC [USD/kW]'] * lcoe['Rating [kW]'] * lcoe['Number of turbines']
+        capex_times_fcr = (lcoe['BOS Capex [USD]'] + lcoe['Turbine Capex [USD]']) * lcoe['FCR']
+        aep_all_turbines = lcoe['AEP [kWh/yr]'] * lcoe['Number of turbines']
+        lcoe['LCOE [USD/kW]'] = (capex_times_fcr + lcoe['Total Opex [USD]']) / aep_all_turbines
+        return lcoe
+
+
+def _select(table, column, value):
+    """
+    Selects the rows of a table where a column is close to a value, or all
+    the rows if the value is None. The column is then dropped.
+    """
+    if value is None:
+        return table
+    return table[np.isclose(table[column], value)].drop(columns=column).reset_index(drop=True)
+
+
+def _key(column):
+    """
+    Rounds a key column so that ratings calculated from MW, such as
+    0.3 * 1000, match the ratings in the tables.
+    """
+    return np.round(np.asarray(column, dtype=float), 6)
@@ -0,0 +1,327 @@
+import itertools
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+class CostSurrogate:
+    """
+    This class trains fast regressions of the cost of each module on the
+    inputs of a sweep, so that optimization loops can estimate costs
+    without running the Manager for every evaluation.
+
+    It is trained on the extended project list and the costs of a sweep,
+    and predicts the cost of each module, and the total, for new rows of
+    project parameters. It is used in the following manner:
+
+    surrogate = CostSurrogate(model='polynomial', degree=2)
+    surrogate.fit(final_result['extended_project_list'], final_result['module_type_operation_list'])
+    surrogate.save('surrogate.pkl')
+
+    surrogate = CostSurrogate.load('surrogate.pkl')
+    costs = surrogate.predict(project_parameters_frame)
+
+    There are three models:
+
+    'polynomial': A least squares polynomial of the standardized inputs,
+        with NumPy. The error is the standard error of the prediction,
+        from the residuals of the fit and the leverage of each point.
+
+    'gaussian process': A Gaussian process with an RBF kernel for each
+        module, with scikit-learn. The error is the standard deviation of
+        the prediction.
+
+    'gradient boosting': Gradient boosted trees for each module, with
+        scikit-learn. The error is the standard deviation of the
+        cross-validated residuals, the same for every point.
+
+    scikit-learn is an optional dependency, imported only for the last two
+    models.
+    """
+
+    models = ('polynomial', 'gaussian process', 'gradient boosting')
+
+    def __init__(self, input_columns=None, model='polynomial', degree=2):
+        """
+        Parameters
+        ----------
+        input_columns : list
+            The columns of the extended project list that are the inputs of
+            the regressions. If None, every numeric column that changes in
+            the training rows is an input.
+
+        model : str
+            'polynomial', 'gaussian process' or 'gradient boosting'
+
+        degree : int
+            The degree of the polynomial model.
+
+        Raises
+        ------
+        ValueError
+            If the model is unknown.
+        """
+        if model not in self.models:
+            raise ValueError(f'Model {model} is not one of {", ".join(self.models)}.')
+        self.input_columns = None if input_columns is None else list(input_columns)
+        self.model = model
+        self.degree = degree
+        self.output_columns = None
+
+    @classmethod
+    def from_csv(cls, extended_project_list_csv, costs_csv, **kwargs):
+        """
+        Makes and trains a surrogate from the extended_project_list.csv and
+        landbosse-costs.csv files of a sweep.
+
+        Parameters
+        ----------
+        extended_project_list_csv : str
+            The path of the extended project list .csv file.
+
+        costs_csv : str
+            The path of the costs .csv file.
+
+        kwargs
+            The arguments of the constructor.
+
+        Returns
+        -------
+        CostSurrogate
+            The trained surrogate.
+        """
+        costs = pd.read_csv(costs_csv, usecols=['Project ID with serial', 'Module', 'Cost per project'])
+        module_costs = costs.pivot_table(index='Project ID with serial', columns='Module', values='Cost per project',
+                                         aggfunc='sum', fill_value=0.0)
+        surrogate = cls(**kwargs)
+        surrogate.fit_module_costs(pd.read_csv(extended_project_list_csv), module_costs)
+        return surrogate
+
+    def fit(self, extended_project_list, costs):
+        """
+        Trains the regressions on the costs of a sweep.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The extended project list of the sweep.
+
+        costs : CostRecords
+            The costs of the projects of the sweep, such as
+            final_result['module_type_operation_list'].
+        """
+        project_codes, projects = pd.factorize(np.asarray(costs['project_id_with_serial'], dtype=object))
+        module_codes, modules = pd.factorize(np.asarray(costs['module'], dtype=object))
+        sums = np.zeros((len(projects), len(modules)))
+        np.add.at(sums, (project_codes, module_codes), np.asarray(costs['cost_per_project'], dtype=float))
+        self.fit_module_costs(extended_project_list, pd.DataFrame(sums, index=projects, columns=modules))
+
+    def fit_module_costs(self, extended_project_list, module_costs):
+        """
+        Trains the regressions on a table of the cost of each module of
+        each project.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The extended project list of the sweep.
+
+        module_costs : pd.DataFrame
+            One row for each project, indexed by Project ID with serial,
+            and one column for each module.
+
+        Raises
+        ------
+        ValueError
+            If no project has both parameters and costs, or there are no
+            input columns.
+        """
+        training = extended_project_list.set_index('Project ID with serial').join(module_costs.sort_index(axis=1), how='inner')
+        if len(training) == 0:
+            raise ValueError('No project of the extended project list has costs.')
+
+        if self.input_columns is None:
+            candidates = [column for column in extended_project_list.columns
+                          if column not in ('Project ID', 'Project ID with serial')
+                          and pd.api.types.is_numeric_dtype(extended_project_list[column])
+                          and not pd.api.types.is_bool_dtype(extended_project_list[column])]
+            self.input_columns = [column for column in candidates if training[column].nunique() > 1]
+        if len(self.input_columns) == 0:
+            raise ValueError('The surrogate needs at least one input column that changes between projects.')
+
+        self.output_columns = list(module_costs.sort_index(axis=1).columns) + ['Total']
+        outputs = training[self.output_columns[:-1]].to_numpy(dtype=float)
+        outputs = np.column_stack([outputs, outputs.sum(axis=1)])
+
+        inputs = training[self.input_columns].to_numpy(dtype=float)
+        self._input_mean = inputs.mean(axis=0)
+        self._input_scale = inputs.std(axis=0)
+        self._input_scale[self._input_scale == 0] = 1.0
+        inputs = self._standardize(inputs)
+
+        if self.model == 'polynomial':
+            self._fit_polynomial(inputs, outputs)
+        elif self.model == 'gaussian process':
+            self._fit_gaussian_process(inputs, outputs)
+        else:
+            self._fit_gradient_boosting(inputs, outputs)
+
+    def predict(self, project_parameters_frame):
+        """
+        Predicts the costs of each module for rows of project parameters.
+
+        Parameters
+        ----------
+        project_parameters_frame : pd.DataFrame
+            The rows to predict, with at least the input columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row for each row of project_parameters_frame, with the same
+            index, and the columns '<module> [USD]' and
+            '<module> error [USD]' for each module and for 'Total'.
+
+        Raises
+        ------
+        ValueError
+            If the surrogate is not trained or input columns are missing.
+        """
+        if self.output_columns is None:
+            raise ValueError('The surrogate must be trained with fit() before it can predict.')
+        missing = [column for column in self.input_columns if column not in project_parameters_frame.columns]
+        if len(missing) > 0:
+            raise ValueError(f'The input columns {", ".join(missing)} are missing.')
+
+        inputs = self._standardize(project_parameters_frame[self.input_columns].to_numpy(dtype=float))
+        if self.model == 'polynomial':
+            predictions, errors = self._predict_polynomial(inputs)
+        elif self.model == 'gaussian process':
+            predictions, errors = self._predict_gaussian_process(inputs)
+        else:
+            predictions, errors = self._predict_gradient_boosting(inputs)
+
+        columns = dict()
+        for output, output_column in enumerate(self.output_columns):
+            columns[f'{output_column} [USD]'] = predictions[:, output]
+            columns[f'{output_column} error [USD]'] = errors[:, output]
+        return pd.DataFrame(columns, index=project_parameters_frame.index)
+
+    def save(self, path):
+        """
+        Writes the trained surrogate to a file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+        """
+        with open(path, 'wb') as file:
+            pickle.dump(self, file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a surrogate written by save().
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        Returns
+        -------
+        CostSurrogate
+            The surrogate.
+        """
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+    def _standardize(self, inputs):
+        return (inputs - self._input_mean) / self._input_scale
+
+    def _features(self, inputs):
+        """
+        Returns the monomials of the inputs up to the degree, starting with
+        the constant.
+        """
+        return np.column_stack([np.ones(len(inputs))] + [np.prod(inputs[:, list(term)], axis=1) for term in self._terms])
+
+    def _fit_polynomial(self, inputs, outputs):
+        self._terms = [term for power in range(1, self.degree + 1)
+                       for term in itertools.combinations_with_replacement(range(inputs.shape[1]), power)]
+        features = self._features(inputs)
+        u, s, vt = np.linalg.svd(features, full_matrices=False)
+        rank = int((s > s[0] * max(features.shape) * np.finfo(float).eps).sum())
+
+        # The coefficients and the basis of the leverage of new points, from
+        # the pseudo-inverse of the features.
+        self._leverage_basis = vt[:rank].T / s[:rank]
+        self._coefficients = self._leverage_basis @ (u[:, :rank].T @ outputs)
+
+        residuals = outputs - features @ self._coefficients
+        degrees_of_freedom = len(outputs) - rank
+        if degrees_of_freedom > 0:
+            self._residual_std = np.sqrt((residuals ** 2).sum(axis=0) / degrees_of_freedom)
+        else:
+            self._residual_std = np.full(outputs.shape[1], np.nan)
+
+    def _predict_polynomial(self, inputs):
+        features = self._features(inputs)
+        leverage = ((features @ self._leverage_basis) ** 2).sum(axis=1)
+        errors = np.sqrt(1 + leverage)[:, np.newaxis] * self._residual_std
+        return features @ self._coefficients, errors
+
+    def _fit_gaussian_process(self, inputs, outputs):
+        sklearn = import_sklearn()
+        kernels = sklearn.gaussian_process.kernels
+        self._regressors = []
+        for output in outputs.T:
+            kernel = kernels.ConstantKernel() * kernels.RBF(length_scale=np.ones(inputs.shape[1])) + kernels.WhiteKernel()
+            regressor = sklearn.gaussian_process.GaussianProcessRegressor(kernel=kernel, normalize_y=True)
+            self._regressors.append(regressor.fit(inputs, output))
+
+    def _predict_gaussian_process(self, inputs):
+        predictions = [regressor.predict(inputs, return_std=True) for regressor in self._regressors]
+        return np.column_stack([mean for mean, _ in predictions]), np.column_stack([std for _, std in predictions])
+
+    def _fit_gradient_boosting(self, inputs, outputs):
+        sklearn = import_sklearn()
+        folds = min(5, len(outputs))
+        self._regressors = []
+        self._residual_std = []
+        for output in outputs.T:
+            regressor = sklearn.ensemble.GradientBoostingRegressor()
+            cross_validated = sklearn.model_selection.cross_val_predict(regressor, inputs, output, cv=folds)
+            self._residual_std.append(np.std(output - cross_validated))
+            self._regressors.append(regressor.fit(inputs, output))
+        self._residual_std = np.array(self._residual_std)
+
+    def _predict_gradient_boosting(self, inputs):
+        predictions = np.column_stack([regressor.predict(inputs) for regressor in self._regressors])
+        return predictions, np.broadcast_to(self._residual_std, predictions.shape)
+
+
+def import_sklearn():
+    """
+    Imports the parts of scikit-learn used by the Gaussian process and
+    gradient boosting surrogates. It is an optional dependency of
+    LandBOSSE.
+
+    Returns
+    -------
+    module
+        sklearn, with its ensemble, gaussian_process and model_selection
+        modules imported.
+    """
+    try:
+        import sklearn
+        import sklearn.ensemble
+        import sklearn.gaussian_process
+        import sklearn.gaussian_process.kernels
+        import sklearn.model_selection
+    except ImportError as error:
+        raise ImportError('Gaussian process and gradient boosting surrogates need scikit-learn. '
+                          'Install it with "pip install scikit-learn".') from error
+    return sklearn
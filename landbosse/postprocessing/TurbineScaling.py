@@ -0,0 +1,337 @@
+import csv
+import hashlib
+import math
+import os
+from concurrent import futures
+
+import numpy as np
+import pandas as pd
+
+from ..excelio.ParquetGenerator import import_pyarrow
+
+
+# The turbine and site parameters of the scaling tables other than the
+# rating, rotor diameter, blade mass exponent and wind speed. The hub
+# height is the rotor diameter plus hub_height_above_rotor_m.
+DEFAULT_TURBINE_PARAMETERS = {
+    'blade_number': 3,
+    'max_tip_speed': 90.0,  # m/s
+    'opt_tsr': 9.0,  # Optimal tip speed ratio
+    'max_Cp': 0.49,
+    'rotor_Ct': 0.8,  # Max thrust coefficient
+    'max_eff': 0.95,  # Drivetrain efficiency
+    'cut_in': 4.0,  # m/s
+    'cut_out': 25.0,  # m/s
+    'altitude': 0.0,
+    'rho_air': 1.225,  # kg/m^3
+    'shear_exp': 0.0,  # No variation in z-height
+    'array_losses': 0.0,  # Focusing on single turbine
+    'availability': 1.0,
+    'soiling_losses': 0.0,
+    'turbine_number': 1,
+    'weibull_k': 2.0,
+    'hub_height_above_rotor_m': 20.0,
+}
+
+
+class TurbineScalingTableBuilder:
+    """
+    This class makes the AEP and TCC tables of turbines that are scaled by
+    rating and rotor diameter, with the NREL cost and scaling models of
+    WISDEM. The TCC table has one row for each rating, rotor diameter and
+    blade mass exponent. The AEP table has one row for each rating, rotor
+    diameter and mean wind speed. The tables can be read by LcoeCalculator.
+
+    Each point of the tables is calculated on a process pool and appended
+    to a cache file as soon as it is done. Points that are already in the
+    cache, with the same turbine parameters, are not calculated again, so
+    an interrupted build resumes where it stopped and a build over a
+    larger grid only calculates the new points. It is used in the
+    following manner:
+
+    builder = TurbineScalingTableBuilder('turbine-scaling-cache.csv', machine_rating_kw=..., ...)
+    aep, tcc = builder.build()
+
+    This needs WISDEM and OpenMDAO, which are imported only in the
+    processes that calculate points.
+    """
+
+    cache_columns = ['Table', 'Rating [kW]', 'Rotor Diam [m]', 'Parameter', 'Parameters hash', 'Value']
+
+    def __init__(self, cache_path, machine_rating_kw, rotor_diameter_m, blade_mass_exp, wind_speed_m_per_s,
+                 max_workers=None, **turbine_parameters):
+        """
+        Parameters
+        ----------
+        cache_path : str
+            The path of the .csv file that caches the points. It is made if
+            it does not exist.
+
+        machine_rating_kw : array-like
+            The turbine ratings in kW.
+
+        rotor_diameter_m : array-like
+            The rotor diameters in m.
+
+        blade_mass_exp : array-like
+            The blade mass exponents of the TCC table.
+
+        wind_speed_m_per_s : array-like
+            The mean wind speeds of the AEP table.
+
+        max_workers : int
+            The number of processes. If None, one for each CPU.
+
+        turbine_parameters
+            Values that replace those of DEFAULT_TURBINE_PARAMETERS.
+
+        Raises
+        ------
+        ValueError
+            If a turbine parameter is not in DEFAULT_TURBINE_PARAMETERS.
+        """
+        unknown = set(turbine_parameters) - set(DEFAULT_TURBINE_PARAMETERS)
+        if len(unknown) > 0:
+            raise ValueError(f'Unknown turbine parameters: {", ".join(sorted(unknown))}')
+        self.cache_path = cache_path
+        self.machine_rating_kw = [float(value) for value in machine_rating_kw]
+        self.rotor_diameter_m = [float(value) for value in rotor_diameter_m]
+        self.blade_mass_exp = [float(value) for value in blade_mass_exp]
+        self.wind_speed_m_per_s = [float(value) for value in wind_speed_m_per_s]
+        self.max_workers = max_workers
+        self.turbine_parameters = dict(DEFAULT_TURBINE_PARAMETERS, **turbine_parameters)
+        self.parameters_hash = hashlib.sha1(repr(sorted(self.turbine_parameters.items())).encode()).hexdigest()
+
+    def points(self):
+        """
+        Returns
+        -------
+        list
+            (table, rating, rotor diameter, blade mass exponent or wind
+            speed) for each point of the tables, where table is 'tcc' or
+            'aep'.
+        """
+        points = []
+        for rating in self.machine_rating_kw:
+            for diameter in self.rotor_diameter_m:
+                points.extend(('tcc', rating, diameter, exponent) for exponent in self.blade_mass_exp)
+                points.extend(('aep', rating, diameter, wind_speed) for wind_speed in self.wind_speed_m_per_s)
+        return points
+
+    def read_cache(self):
+        """
+        Returns
+        -------
+        dict
+            The cached values, keyed by point, of the points calculated
+            with the turbine parameters of this builder.
+        """
+        cache = dict()
+        if not os.path.exists(self.cache_path):
+            return cache
+        with open(self.cache_path, newline='') as cache_file:
+            for row in csv.DictReader(cache_file):
+                if row['Parameters hash'] == self.parameters_hash:
+                    point = (row['Table'], float(row['Rating [kW]']), float(row['Rotor Diam [m]']), float(row['Parameter']))
+                    cache[point] = float(row['Value'])
+        return cache
+
+    def build(self):
+        """
+        Calculates the points that are not in the cache and appends them to
+        the cache as they finish.
+
+        Returns
+        -------
+        pd.DataFrame, pd.DataFrame
+            The AEP table, with the columns 'Rating [kW]', 'Rotor Diam [m]',
+            'Wind Speed [m/s]' and 'AEP [kWh/yr]', and the TCC table, with
+            the columns 'Rating [kW]', 'Rotor Diam [m]', 'Blade Mass Exp'
+            and 'TCC [USD/kW]'.
+        """
+        cache = self.read_cache()
+        points = self.points()
+        missing = [point for point in points if point not in cache]
+
+        if len(missing) > 0:
+            self._calculate(missing, cache)
+
+        tables = pd.DataFrame(points, columns=['Table', 'Rating [kW]', 'Rotor Diam [m]', 'Parameter'])
+        tables['Value'] = [cache[point] for point in points]
+        aep = tables[tables['Table'] == 'aep'].drop(columns='Table').reset_index(drop=True)
+        tcc = tables[tables['Table'] == 'tcc'].drop(columns='Table').reset_index(drop=True)
+        aep = aep.rename(columns={'Parameter': 'Wind Speed [m/s]', 'Value': 'AEP [kWh/yr]'})
+        tcc = tcc.rename(columns={'Parameter': 'Blade Mass Exp', 'Value': 'TCC [USD/kW]'})
+        return aep, tcc
+
+    def _calculate(self, points, cache):
+        """
+        Calculates points on the process pool, in chunks, and appends each
+        chunk to the cache file as soon as it is done. If a chunk fails,
+        the other chunks are still calculated and cached before the error
+        is raised.
+
+        Parameters
+        ----------
+        points : list
+            The points to calculate.
+
+        cache : dict
+            The cached values, keyed by point, to which the new values are
+            added.
+        """
+        write_header = not os.path.exists(self.cache_path)
+        chunksize = max(1, math.ceil(len(points) / (4 * (self.max_workers or os.cpu_count() or 1))))
+        chunks = [points[start:start + chunksize] for start in range(0, len(points), chunksize)]
+        error = None
+
+        with open(self.cache_path, 'a', newline='') as cache_file, \
+                futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            writer = csv.writer(cache_file)
+            if write_header:
+                writer.writerow(self.cache_columns)
+            chunk_futures = {
+                executor.submit(calculate_scaling_points, [point + (self.turbine_parameters,) for point in chunk]): chunk
+                for chunk in chunks
+            }
+            for chunk_future in futures.as_completed(chunk_futures):
+                if chunk_future.exception() is not None:
+                    error = error or chunk_future.exception()
+                    continue
+                chunk = chunk_futures[chunk_future]
+                values = chunk_future.result()
+                writer.writerows(list(point) + [self.parameters_hash, value] for point, value in zip(chunk, values))
+                cache_file.flush()
+                cache.update(zip(chunk, values))
+
+        if error is not None:
+            raise error
+
+    def write_parquet(self, output_dir):
+        """
+        Builds the tables and writes them to aep.parquet and tcc.parquet.
+        This needs pyarrow.
+
+        Parameters
+        ----------
+        output_dir : str
+            The directory to write to.
+
+        Returns
+        -------
+        str, str
+            The paths of aep.parquet and tcc.parquet.
+        """
+        import_pyarrow()
+        aep, tcc = self.build()
+        aep_path = os.path.join(output_dir, 'aep.parquet')
+        tcc_path = os.path.join(output_dir, 'tcc.parquet')
+        aep.to_parquet(aep_path, index=False)
+        tcc.to_parquet(tcc_path, index=False)
+        return aep_path, tcc_path
+
+
+"""
+The following functions are deliberately defined outside of the class so
+that they can run in other processes. Each process keeps the OpenMDAO
+problem of the TCC model in _tcc_problems and the AEP model in
+_aep_instance, so that they are set up once per process rather than once
+per point.
+"""
+
+_tcc_problems = dict()
+_aep_instance = None
+
+
+def calculate_scaling_points(tasks):
+    """
+    Calculates a chunk of points of the AEP and TCC tables.
+
+    Parameters
+    ----------
+    tasks : list
+        The tasks of calculate_scaling_point().
+
+    Returns
+    -------
+    list
+        The value of each point.
+    """
+    return [calculate_scaling_point(task) for task in tasks]
+
+
+def calculate_scaling_point(task):
+    """
+    Calculates one point of the AEP or TCC table.
+
+    Parameters
+    ----------
+    task : tuple
+        (table, rating kW, rotor diameter m, blade mass exponent or wind
+        speed m/s, turbine parameters), where table is 'tcc' or 'aep'.
+
+    Returns
+    -------
+    float
+        The TCC in USD per kW or the net AEP in kWh per year.
+    """
+    global _aep_instance
+    table, rating, diameter, value, parameters = task
+    hub_height = diameter + parameters['hub_height_above_rotor_m']
+
+    if table == 'tcc':
+        problem = _tcc_problem(parameters)
+        problem['machine_rating'] = rating
+        problem['rotor_diameter'] = diameter
+        problem['blade_user_exp'] = value
+        problem['hub_height'] = hub_height
+        problem.run_model()
+        return float(np.squeeze(problem['turbine_cost_kW']))
+
+    if _aep_instance is None:
+        aep_csm, _, _ = import_wisdem()
+        _aep_instance = aep_csm()
+    p = parameters
+    _aep_instance.compute(rating, p['max_tip_speed'], diameter, p['max_Cp'], p['opt_tsr'],
+                          p['cut_in'], p['cut_out'], hub_height, p['altitude'], p['rho_air'],
+                          p['max_eff'], p['rotor_Ct'], p['soiling_losses'], p['array_losses'], p['availability'],
+                          p['turbine_number'], p['shear_exp'], value, p['weibull_k'])
+    return float(_aep_instance.aep.net_aep)
+
+
+def _tcc_problem(parameters):
+    """
+    Returns the OpenMDAO problem of the TCC model of this process for the
+    given turbine parameters, setting it up the first time.
+    """
+    key = tuple(sorted(parameters.items()))
+    if key not in _tcc_problems:
+        _, nrel_csm_2015, om = import_wisdem()
+        problem = om.Problem()
+        problem.model = nrel_csm_2015()
+        problem.setup()
+        problem['blade_number'] = parameters['blade_number']
+        problem['max_efficiency'] = parameters['max_eff']
+        problem['max_tip_speed'] = parameters['max_tip_speed']
+        problem['turbine_class'] = -1  # Sets blade mass based on user input, not auto-determined
+        _tcc_problems[key] = problem
+    return _tcc_problems[key]
+
+
+def import_wisdem():
+    """
+    Imports the parts of WISDEM and OpenMDAO that calculate the scaling
+    tables. They are optional dependencies of LandBOSSE.
+
+    Returns
+    -------
+    class, class, module
+        aep_csm, nrel_csm_2015 and openmdao.api
+    """
+    try:
+        import openmdao.api as om
+        from wisdem.nrelcsm.nrel_csm import aep_csm
+        from wisdem.turbine_costsse.nrel_csm_tcc_2015 import nrel_csm_2015
+    except ImportError as error:
+        raise ImportError('Turbine scaling tables need WISDEM. Install it with "pip install wisdem".') from error
+    return aep_csm, nrel_csm_2015, om
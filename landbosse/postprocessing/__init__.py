@@ -0,0 +1,4 @@
+from .CraneChoice import extract_crane_choice, pivot_crane_selection
+from .Lcoe import LcoeCalculator
+from .TurbineScaling import TurbineScalingTableBuilder
+from .Surrogate import CostSurrogate
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from landbosse.model import CostRecords, DetailRecords, CraneSelectionRecords
+from landbosse.excelio import XlsxManagerRunner
+
+
+def fake_cost_records(extended_project_list, module_costs):
+    """
+    Makes the costs of the rows of an extended project list without
+    running LandBOSSE.
+
+    Parameters
+    ----------
+    extended_project_list : pd.DataFrame
+        The projects, with 'Project ID with serial'.
+
+    module_costs : dict
+        For each module, a function of the row of a project that returns
+        its cost in USD.
+
+    Returns
+    -------
+    CostRecords
+        One 'Materials' cost for each module of each project.
+    """
+    costs = []
+    for _, project_parameters in extended_project_list.iterrows():
+        for module, module_cost in module_costs.items():
+            costs.append(CostRecords.from_costs(
+                project_id_with_serial=project_parameters['Project ID with serial'],
+                module=module,
+                operation_id=module,
+                type_of_cost=['Materials'],
+                raw_cost=[module_cost(project_parameters)],
+                total_or_turbine=True,
+                turbine_rating_MW=1.5,
+                num_turbines=1,
+                rotor_diameter_m=77
+            ))
+    return CostRecords.concatenate(costs)
+
+
+def fake_crane_selection_records(extended_project_list, crane_name):
+    """
+    Makes the crane selection of the rows of an extended project list
+    without running LandBOSSE.
+
+    Parameters
+    ----------
+    extended_project_list : pd.DataFrame
+        The projects, with 'Project ID with serial'.
+
+    crane_name : function
+        A function of the row of a project that returns the name of the
+        crane of its 'Top' operation.
+
+    Returns
+    -------
+    CraneSelectionRecords
+        One crane for each project.
+    """
+    project_ids_with_serial = extended_project_list['Project ID with serial'].to_numpy(dtype=object)
+    count = len(project_ids_with_serial)
+    return CraneSelectionRecords({
+        'project_id_with_serial': project_ids_with_serial,
+        'operation': np.full(count, 'Top', dtype=object),
+        'crane_name': np.array([crane_name(project_parameters) for _, project_parameters in extended_project_list.iterrows()],
+                               dtype=object),
+        'boom_system': np.full(count, 'SL2', dtype=object),
+        'wind_multiplier': np.ones(count),
+        'operation_time_all_turbines_hrs': np.full(count, 10.0),
+        'total_cost_usd': np.full(count, 100.0),
+        'number_of_equipment': np.ones(count),
+    })
+
+
+class FakeManagerRunner(XlsxManagerRunner):
+    """
+    Instead of running LandBOSSE, this runner makes the costs, and
+    optionally the crane selection, of each project with functions of the
+    row of the project, so that drivers such as AdaptiveSweep and
+    SensitivityAnalysis can be tested quickly. It is used in the following
+    manner:
+
+    runner = FakeManagerRunner(
+        module_costs={'ErectionCost': lambda project_parameters: 2 * project_parameters['Hub height m']},
+        crane_name=lambda project_parameters: 'LR1300'
+    )
+    """
+
+    def __init__(self, module_costs, crane_name=None, **kwargs):
+        """
+        Parameters
+        ----------
+        module_costs : dict
+            For each module, a function of the row of a project that
+            returns its cost in USD.
+
+        crane_name : function
+            A function of the row of a project that returns the name of
+            the crane of its 'Top' operation. If None, no cranes are
+            selected.
+
+        kwargs
+            The arguments of XlsxManagerRunner.
+        """
+        super().__init__(**kwargs)
+        self.module_costs = module_costs
+        self.crane_name = crane_name
+
+    def run_extended_project_list(self, extended_project_list_chunks, enable_cost_and_scaling_modifications=False):
+        extended_project_list = pd.concat(extended_project_list_chunks)
+        if self.crane_name is None:
+            crane_selection = CraneSelectionRecords.concatenate([])
+        else:
+            crane_selection = fake_crane_selection_records(extended_project_list, self.crane_name)
+        return {
+            'details_list': DetailRecords.concatenate([]),
+            'module_type_operation_list': fake_cost_records(extended_project_list, self.module_costs),
+            'crane_selection_list': crane_selection,
+            'extended_project_list': extended_project_list,
+        }
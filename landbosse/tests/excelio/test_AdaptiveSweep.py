@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio.AdaptiveSweep import AdaptiveSweep
+from ..FakeManagerRunner import FakeManagerRunner
+
+
+def tall(project_parameters):
+    return project_parameters['project list/x/Hub height m'] > 93
+
+
+class TestAdaptiveSweep(TestCase):
+
+    def make_sweep(self, run_budget):
+        """
+        Instead of running LandBOSSE, the runner costs 100 USD below a hub
+        height of 93 m and 200 USD above, with a bigger crane above.
+        """
+        runner = FakeManagerRunner(
+            module_costs={'ErectionCost': lambda project_parameters: 200.0 if tall(project_parameters) else 100.0},
+            crane_name=lambda project_parameters: 'LR1600' if tall(project_parameters) else 'LR1300',
+            file_ops=XlsxFileOperations()
+        )
+        return AdaptiveSweep(
+            manager_runner=runner,
+            project_id='project1',
+            axes={'project list/x/Hub height m': (80, 120), 'project list/x/Rotor diameter m': (70, 90)},
+            tolerance=0.01,
+            run_budget=run_budget,
+            max_depth=4,
+            project_parameters=pd.Series({'Project ID': 'project1', 'Hub height m': 80, 'Rotor diameter m': 77})
+        )
+
+    def test_runs_concentrate_at_the_step(self):
+        """
+        After the coarse grid, every run should be in a cell across the
+        step in cost, and the budget should not be exceeded. The rotor
+        diameter does not change the cost, so it should not be refined.
+        """
+        points = self.make_sweep(run_budget=60).run()['points']
+        hub_heights = points['project list/x/Hub height m']
+        refined = hub_heights[points['Iteration'] > 0]
+
+        self.assertLessEqual(len(points), 60)
+        self.assertEqual((points['Iteration'] == 0).sum(), 9)
+        self.assertTrue(refined.between(90, 100).all())
+        self.assertEqual(set(points['project list/x/Rotor diameter m']), {70, 80, 90})
+        self.assertTrue(points['Project ID with serial'].is_unique)
+        self.assertEqual(points['Total BOS cost USD'].max(), 200)
+
+        # The step is located to within the finest cells.
+        below = hub_heights[points['Total BOS cost USD'] == 100].max()
+        above = hub_heights[points['Total BOS cost USD'] == 200].min()
+        self.assertLessEqual(above - below, 20 / 2 ** 4)
+
+    def test_coarse_grid_must_fit_the_budget(self):
+        with self.assertRaises(ValueError):
+            self.make_sweep(run_budget=8)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio.GridSearchTree import GridSearchTree
+
+
+class TestGridSearchTree(TestCase):
+
+    def setUp(self):
+        """
+        Two axes like project1 in the docstring of
+        XlsxReader.create_parametric_value_list(), one with a range and one
+        with a value list.
+        """
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'project1', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 12, 'Step': 6, 'Value list': None},
+            {'Project ID': 'project1', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': None, 'Max': None, 'Step': None, 'Value list': '0, 6, 12, 18'},
+        ])
+        self.expected = np.array([[alpha, beta] for alpha in [0, 6, 12] for beta in [0, 6, 12, 18]], dtype=float)
+
+    def test_grid_dataframe(self):
+        """
+        The last axis should change fastest, as in a depth first traversal
+        of the grid.
+        """
+        grid = GridSearchTree(self.parametric_list).grid_dataframe()
+        self.assertEqual(list(grid.columns), ['alpha/fizz/buzz', 'beta/foo/bar'])
+        np.testing.assert_array_equal(grid.to_numpy(), self.expected)
+
+    def test_iter_grid_chunks(self):
+        """
+        The chunks should make the same grid, in order, with at most
+        chunk_size points each.
+        """
+        grid_search_tree = GridSearchTree(self.parametric_list)
+        chunks = list(grid_search_tree.iter_grid_chunks(chunk_size=5))
+        self.assertEqual(grid_search_tree.grid_size(), 12)
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 5, 2])
+        np.testing.assert_array_equal(pd.concat(chunks).to_numpy(), self.expected)
+
+    def test_build_grid_tree_and_return_grid(self):
+        """
+        The list of grid points should match the grid.
+        """
+        grid = GridSearchTree(self.parametric_list).build_grid_tree_and_return_grid()
+        self.assertEqual(len(grid), 12)
+        self.assertEqual(grid[5], [
+            {'cell_specification': 'alpha/fizz/buzz', 'value': 6},
+            {'cell_specification': 'beta/foo/bar', 'value': 6},
+        ])
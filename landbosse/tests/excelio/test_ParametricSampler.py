@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import XlsxReader
+from landbosse.excelio.ParametricSampler import ParametricSampler
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestParametricSampler(TestCase):
+
+    def make_parametric_list(self, sampling, samples=8, seed=42):
+        return pd.DataFrame([
+            {'Project ID': 'project1', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 10, 'Max': 20, 'Step': None, 'Value list': None, 'Sampling': sampling, 'Samples': samples, 'Seed': seed},
+            {'Project ID': 'project1', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': None, 'Max': None, 'Step': None, 'Value list': '1, 2, 3, 4'},
+        ])
+
+    def test_samples_are_within_the_axes(self):
+        """
+        Every method should make the number of samples asked for, within
+        the range or value list of each axis, and the same samples for the
+        same seed.
+        """
+        for sampling in ParametricSampler.sampling_methods:
+            samples = ParametricSampler(self.make_parametric_list(sampling)).grid_dataframe()
+            again = ParametricSampler(self.make_parametric_list(sampling)).grid_dataframe()
+            self.assertEqual(list(samples.columns), ['alpha/fizz/buzz', 'beta/foo/bar'])
+            self.assertEqual(len(samples), 8)
+            self.assertTrue(samples['alpha/fizz/buzz'].between(10, 20).all())
+            self.assertTrue(samples['beta/foo/bar'].isin([1, 2, 3, 4]).all())
+            pd.testing.assert_frame_equal(samples, again)
+
+    def test_latin_hypercube_stratifies_each_axis(self):
+        """
+        Each of the four values of the value list, and each quarter of the
+        range, should be sampled exactly twice in eight samples.
+        """
+        samples = ParametricSampler(self.make_parametric_list('Latin hypercube')).grid_dataframe()
+        self.assertEqual(sorted(samples['beta/foo/bar'].value_counts()), [2, 2, 2, 2])
+        quarters = np.floor((samples['alpha/fizz/buzz'] - 10) / 2.5)
+        self.assertEqual(sorted(quarters.value_counts()), [2, 2, 2, 2])
+
+    def test_chunks_match_all_samples(self):
+        sampler = ParametricSampler(self.make_parametric_list('sobol'))
+        pd.testing.assert_frame_equal(pd.concat(sampler.iter_grid_chunks(chunk_size=3), ignore_index=True),
+                                      sampler.grid_dataframe())
+
+    def test_parametric_value_list_has_serial_numbers(self):
+        parametric_value_list = XlsxReader().create_parametric_value_list(self.make_parametric_list('random', samples=12))
+        self.assertEqual(list(parametric_value_list['Project ID with serial'].iloc[[0, 11]]), ['project1_00', 'project1_11'])
+
+    def test_invalid_sampling(self):
+        with self.assertRaises(XlsxOperationException):
+            ParametricSampler(self.make_parametric_list('grid'))
+        with self.assertRaises(XlsxOperationException):
+            ParametricSampler(self.make_parametric_list('random', samples=0))
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+
+import pandas as pd
+
+from landbosse.model import CostRecords, DetailRecords
+from landbosse.excelio import ParquetGenerator
+from .test_ResultSink import make_project_records
+
+try:
+    import pyarrow
+    pyarrow_installed = True
+except ImportError:
+    pyarrow_installed = False
+
+
+@skipUnless(pyarrow_installed, 'pyarrow is not installed')
+class TestParquetGenerator(TestCase):
+
+    def setUp(self):
+        records = [make_project_records(name) for name in ['Project_1', 'Project_1_2', 'Project_2']]
+        self.costs = CostRecords.concatenate(r[0] for r in records)
+        self.details = DetailRecords.concatenate(r[1] for r in records)
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': ['Project_1', 'Project_1', 'Project_2'],
+            'Project ID with serial': ['Project_1', 'Project_1_2', None],
+            'New Switchyard (y/n)': ['y', 1, 'n'],
+        })
+
+    def test_partitioned_datasets(self):
+        """
+        The costs should be partitioned by the Project ID without serial,
+        readable one project at a time, and joinable to the extended
+        project list for every project.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            ParquetGenerator(file_ops=None).write_results(self.costs, self.details, self.extended_project_list, output_dir)
+
+            self.assertEqual(sorted(os.listdir(os.path.join(output_dir, 'landbosse-costs'))),
+                             ['Project ID=Project_1', 'Project ID=Project_2'])
+            project_1_costs = pd.read_parquet(os.path.join(output_dir, 'landbosse-costs'), filters=[('Project ID', '=', 'Project_1')])
+            self.assertEqual(len(project_1_costs), 4)
+
+            details = pd.read_parquet(os.path.join(output_dir, 'landbosse-details'))
+            self.assertEqual(len(details), len(self.details))
+
+            extended_project_list = pd.read_parquet(os.path.join(output_dir, 'extended_project_list.parquet'))
+            joined = pd.read_parquet(os.path.join(output_dir, 'landbosse-costs')).drop(columns=['Project ID']) \
+                .merge(extended_project_list, on='Project ID with serial')
+            self.assertEqual(len(joined), len(self.costs))
+
+    def test_rewrite(self):
+        """
+        Writing the results again to the same directory should replace
+        the datasets, not add to them.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            parquet_generator = ParquetGenerator(file_ops=None)
+            parquet_generator.write_results(self.costs, self.details, self.extended_project_list, output_dir)
+            parquet_generator.write_results(self.costs, self.details, self.extended_project_list, output_dir)
+            self.assertEqual(len(pd.read_parquet(os.path.join(output_dir, 'landbosse-costs'))), len(self.costs))
+            self.assertEqual(len(pd.read_parquet(os.path.join(output_dir, 'landbosse-details'))), len(self.details))
+
+            parquet_generator.write_results(self.costs, DetailRecords.concatenate([]), self.extended_project_list, output_dir)
+            self.assertFalse(os.path.exists(os.path.join(output_dir, 'landbosse-details')))
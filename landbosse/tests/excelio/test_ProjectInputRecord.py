@@ -0,0 +1,122 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio.ProjectInputRecord import ProjectInputRecord
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestProjectInputRecord(TestCase):
+
+    def setUp(self):
+        """
+        A row of the project list like those of the project input template.
+        """
+        self.project_parameters = pd.Series({
+            'Project ID': 'ge15_public',
+            'Project data file': 'ge15_public',
+            'Total project construction time (months)': 9,
+            'Turbine rating MW': 1.5,
+            'Hub height m': 80,
+            'Rotor diameter m': 77,
+            'Turbine spacing (times rotor diameter)': 4,
+            'Row spacing (times rotor diameter)': 10,
+            'Number of turbines': 100,
+            'Breakpoint between base and topping (percent)': 0.8,
+            'Fuel cost USD per gal': 1.5,
+            'Rate of deliveries (turbines per week)': 10,
+            'Wind shear exponent': 0.2,
+            'Foundation depth m': 2.36,
+            'Rated Thrust (N)': 589000,
+            'Bearing Pressure (n/m2)': 191521,
+            '50-year Gust Velocity (m/s)': 59.5,
+            'Line Frequency (Hz)': 60,
+            'Flag for user-defined home run trench length (0 = no; 1 = yes)': 0,
+            'Combined Homerun Trench Length to Substation (km)': 50,
+            'Non-Erection Wind Delay Critical Height (m)': 10,
+            'Non-Erection Wind Delay Critical Speed (m/s)': 15,
+            'Distance to interconnect (miles)': 5,
+            'Interconnect Voltage (kV)': 130,
+            'New Switchyard (y/n)': 'y',
+            'Road length adder (m)': 5000,
+            'Road Quality (0-1)': 0.6,
+            'Percent of roads that will be constructed': 0.33,
+            'Road width (ft)': 20,
+            'Road thickness (in)': 8,
+            'Calculate road cost for distributed wind? (y/n)': 'n',
+            'Site prep area for Distributed wind (m2)': 0,
+            'Crane width (m)': 12.2,
+            'Number of highway permits': 10,
+            'Number of access roads': 2,
+            'Overtime multiplier': 1.4,
+            'Allow same flag': 'n',
+            'Override total management cost for distributed (0 does not override)': 0,
+            'Markup contingency': 0.03,
+            'Markup warranty management': 0.0002,
+            'Markup sales and use tax': 0,
+            'Markup overhead': 0.05,
+            'Markup profit margin': 0.05,
+            'Labor cost multiplier': 1,
+            'Crane breakdown fraction': 0,
+        })
+
+    def test_master_input_dict(self):
+        """
+        The inputs should have their master input dictionary keys, with
+        the calculated inputs and the markups, and flags as booleans.
+        """
+        input_dict = ProjectInputRecord.from_project_parameters(self.project_parameters).to_master_input_dict()
+        self.assertEqual(input_dict['project_id'], 'ge15_public')
+        self.assertEqual(input_dict['num_turbines'], 100)
+        self.assertEqual(input_dict['project_size_megawatts'], 150)
+        self.assertEqual(input_dict['plant_capacity_MW'], 150)
+        self.assertEqual(input_dict['trench_len_to_substation_km'], 50)
+        self.assertIs(input_dict['new_switchyard'], True)
+        self.assertIs(input_dict['road_distributed_wind'], False)
+        self.assertEqual(input_dict['markup_overhead'], 0.05)
+        self.assertNotIn('override_total_management_cost', input_dict)
+        self.assertNotIn('development_labor_cost_usd', input_dict)
+        self.assertNotIn('labor_cost_multiplier', input_dict)
+
+    def test_override_total_management_cost(self):
+        """
+        With an override, the markups are neither needed nor given.
+        """
+        project_parameters = self.project_parameters.drop(['Markup contingency', 'Markup overhead'])
+        project_parameters['Override total management cost for distributed (0 does not override)'] = 1519250
+        project_parameters['Development labor cost USD'] = 10000
+        input_dict = ProjectInputRecord.from_project_parameters(project_parameters).to_master_input_dict()
+        self.assertEqual(input_dict['override_total_management_cost'], 1519250)
+        self.assertEqual(input_dict['development_labor_cost_usd'], 10000)
+        self.assertNotIn('markup_profit_margin', input_dict)
+
+    def test_invalid_values(self):
+        """
+        Every invalid value should be reported at once.
+        """
+        project_parameters = self.project_parameters.copy()
+        project_parameters['Number of turbines'] = 2.5
+        project_parameters['Road Quality (0-1)'] = 1.5
+        project_parameters['New Switchyard (y/n)'] = 'yes'
+        with self.assertRaises(XlsxOperationException) as context:
+            ProjectInputRecord.from_project_parameters(project_parameters)
+        message = str(context.exception)
+        for column in ['Number of turbines', 'Road Quality (0-1)', 'New Switchyard (y/n)']:
+            self.assertIn(column, message)
+
+    def test_missing_column(self):
+        with self.assertRaises(XlsxOperationException):
+            ProjectInputRecord.from_project_parameters(self.project_parameters.drop('Hub height m'))
+
+    def test_extended_project_list(self):
+        """
+        The records of a dataframe should match those of its rows.
+        """
+        extended_project_list = pd.DataFrame([self.project_parameters] * 3)
+        extended_project_list['Hub height m'] = [80, 90, 100]
+        records = ProjectInputRecord.from_extended_project_list(extended_project_list)
+        self.assertEqual([record.hub_height_meters for record in records], [80, 90, 100])
+        for record, (_, project_parameters) in zip(records, extended_project_list.iterrows()):
+            self.assertEqual(record.to_master_input_dict(),
+                             ProjectInputRecord.from_project_parameters(project_parameters).to_master_input_dict())
+        self.assertIs(type(records[0].hub_height_meters), int)
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase, skipUnless
+
+import pandas as pd
+
+from landbosse.model import CostRecords, DetailRecordsBuilder
+from landbosse.excelio import CsvGenerator, CsvResultSink, SqliteResultSink, DuckDbResultSink
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+def make_project_records(project_id_with_serial):
+    costs = CostRecords.from_costs(
+        project_id_with_serial=project_id_with_serial,
+        module='SubstationCost',
+        operation_id='Substation',
+        type_of_cost=['Materials', 'Labor'],
+        raw_cost=[1000.0, 2000.0],
+        total_or_turbine=True,
+        turbine_rating_MW=1.5,
+        num_turbines=10,
+        rotor_diameter_m=77
+    )
+    details = DetailRecordsBuilder()
+    details.add_number('Road width', 6, unit='m')
+    details.add_text('Cables', '[1, 2]', row_type='list')
+    return costs, details.build(project_id_with_serial, 'SubstationCost')
+
+
+class TestCsvResultSink(TestCase):
+
+    def test_streamed_csv_matches_in_memory_csv(self):
+        """
+        Writing projects one at a time in small batches should make the
+        same .csv files as writing all the records at the end of a run.
+        """
+        records = [make_project_records(f'Project_{i}') for i in range(5)]
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            with CsvResultSink(output_dir, batch_rows=3) as sink:
+                for costs, details in records:
+                    sink.write(costs, details)
+
+            self.assertEqual(sink.costs_rows_written, 10)
+            self.assertEqual(sink.details_rows_written, 10)
+            streamed_costs = pd.read_csv(os.path.join(output_dir, 'landbosse-costs.csv'))
+            streamed_details = pd.read_csv(os.path.join(output_dir, 'landbosse-details.csv'))
+
+        csv_generator = CsvGenerator(file_ops=None)
+        expected_costs = csv_generator.create_costs_dataframe(CostRecords.concatenate(r[0] for r in records))
+        self.assertEqual(list(streamed_costs.columns), list(expected_costs.columns))
+        self.assertEqual(len(streamed_costs), len(expected_costs))
+        self.assertEqual(list(streamed_costs['Project ID with serial']), list(expected_costs['Project ID with serial']))
+        self.assertEqual(list(streamed_details['Non-numeric value'].dropna()), ['[1, 2]'] * 5)
+
+
+class TestSqliteResultSink(TestCase):
+
+    def test_results_and_extended_project_list_are_joined(self):
+        """
+        The costs and details should be inserted in batches, with NULL for
+        missing values, and the views should join the extended project
+        list onto them.
+        """
+        extended_project_list = pd.DataFrame({
+            'Project ID': ['Project', 'Project'],
+            'Project ID with serial': ['Project_0', 'Project_1'],
+            'Number of turbines': [10, 10],
+            'Road width': [6, 'wide'],
+        })
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            with SqliteResultSink(output_dir, batch_rows=3) as sink:
+                for i in range(3):
+                    sink.write(*make_project_records(f'Project_{i}'))
+                sink.write_extended_project_list(extended_project_list)
+
+            connection = sqlite3.connect(sink.database_path)
+            costs = pd.read_sql('SELECT * FROM landbosse_costs', connection)
+            details = pd.read_sql('SELECT * FROM landbosse_details', connection)
+            extended_costs = pd.read_sql('SELECT * FROM extended_landbosse_costs ORDER BY "Project ID with serial"', connection)
+            indexes = pd.read_sql("SELECT name FROM sqlite_master WHERE type = 'index'", connection)
+            connection.close()
+
+        self.assertEqual(len(costs), 6)
+        self.assertEqual(list(details['Numeric value'].isnull()), [False, True] * 3)
+        self.assertEqual(list(details['Non-numeric value'].isnull()), [True, False] * 3)
+        self.assertEqual(list(extended_costs['Project ID with serial']), ['Project_0'] * 2 + ['Project_1'] * 2)
+        self.assertEqual(list(extended_costs['Road width']), ['6', '6', 'wide', 'wide'])
+        self.assertEqual(set(indexes['name']), {'landbosse_costs_index', 'landbosse_details_index', 'extended_project_list_index'})
+
+    def test_extended_project_list_in_chunks(self):
+        """
+        Chunks of the extended project list should be appended to the
+        table and to the .csv file, with the columns and types of the
+        first chunk.
+        """
+        chunks = [
+            pd.DataFrame({'Project ID': ['Project'], 'Project ID with serial': ['Project_0'], 'Number of turbines': [10]}),
+            pd.DataFrame({'Project ID': ['Project'], 'Number of turbines': [12.5], 'Project ID with serial': ['Project_1']}),
+        ]
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            extended_project_list_path = os.path.join(output_dir, 'extended_project_list.csv')
+            with SqliteResultSink(output_dir, extended_project_list_path=extended_project_list_path) as sink:
+                for chunk in chunks:
+                    sink.write_extended_project_list(chunk)
+
+            connection = sqlite3.connect(sink.database_path)
+            extended_project_list = pd.read_sql('SELECT * FROM extended_project_list', connection)
+            connection.close()
+            extended_project_list_csv = pd.read_csv(extended_project_list_path)
+
+        for result in (extended_project_list, extended_project_list_csv):
+            self.assertEqual(list(result.columns), ['Project ID', 'Project ID with serial', 'Number of turbines'])
+            self.assertEqual(list(result['Project ID with serial']), ['Project_0', 'Project_1'])
+            self.assertEqual(list(result['Number of turbines']), [10.0, 12.5])
+
+    def test_later_chunks_with_blanks_and_text(self):
+        """
+        A blank cell in a boolean column of a later chunk should be NULL,
+        and text in a numeric column of a later chunk should turn that
+        column into text.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            with SqliteResultSink(output_dir) as sink:
+                write_mixed_chunks(sink)
+
+            connection = sqlite3.connect(sink.database_path)
+            extended_project_list = connection.execute(
+                'SELECT "Flag", "Rating" FROM extended_project_list ORDER BY "Project ID with serial"').fetchall()
+            connection.close()
+
+        self.assertEqual(extended_project_list, [(1, 1.5), (0, 2.0), (None, 'unknown')])
+
+
+@skipUnless(duckdb, 'duckdb is not installed')
+class TestDuckDbResultSink(TestCase):
+    def test_later_chunks_with_blanks_and_text(self):
+        """
+        A blank cell in a boolean column of a later chunk should be NULL,
+        and text in a numeric column of a later chunk should change the
+        type of that column to text, also in the views.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            with DuckDbResultSink(output_dir) as sink:
+                write_mixed_chunks(sink)
+                sink.write(*make_project_records('Project_0'))
+
+            connection = duckdb.connect(sink.database_path)
+            extended_project_list = connection.execute(
+                'SELECT "Flag", "Rating" FROM extended_project_list ORDER BY "Project ID with serial"').fetchall()
+            extended_costs = connection.execute('SELECT DISTINCT "Rating" FROM extended_landbosse_costs').fetchall()
+            connection.close()
+
+        self.assertEqual(extended_project_list, [(1, '1.5'), (0, '2.0'), (None, 'unknown')])
+        self.assertEqual(extended_costs, [('1.5',)])
+
+
+def write_mixed_chunks(sink):
+    """
+    Writes two chunks of an extended project list. In the second chunk,
+    the boolean column Flag has a blank cell and the numeric column Rating
+    has text.
+    """
+    sink.write_extended_project_list(pd.DataFrame({
+        'Project ID': ['Project', 'Project'],
+        'Project ID with serial': ['Project_0', 'Project_1'],
+        'Flag': [True, False],
+        'Rating': [1.5, 2.0],
+    }))
+    sink.write_extended_project_list(pd.DataFrame({
+        'Project ID': ['Project'],
+        'Project ID with serial': ['Project_2'],
+        'Flag': [float('nan')],
+        'Rating': ['unknown'],
+    }))
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import CostRecords
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio.SensitivityAnalysis import SensitivityAnalysis, _module_costs
+from ..FakeManagerRunner import FakeManagerRunner, fake_cost_records
+
+
+def linear_cost_runner(**kwargs):
+    """
+    Instead of running LandBOSSE, the erection cost is 4000 * a + 1000 * b
+    and the foundation cost is always 500.
+    """
+    return FakeManagerRunner(
+        module_costs={
+            'ErectionCost': lambda project_parameters: 4000 * project_parameters['x/y/a'] + 1000 * project_parameters['x/y/b'],
+            'FoundationCost': lambda project_parameters: 500.0,
+        },
+        file_ops=XlsxFileOperations(),
+        **kwargs
+    )
+
+
+class TestSensitivityAnalysis(TestCase):
+
+    def analyze(self, method, samples, levels=4, factors=None, manager_runner=None):
+        analysis = SensitivityAnalysis(
+            manager_runner=manager_runner or linear_cost_runner(chunk_size=50),
+            project_id='project1',
+            factors=factors or {'x/y/a': (0, 1), 'x/y/b': (0, 1)},
+            method=method,
+            samples=samples,
+            levels=levels,
+            seed=1,
+            project_parameters=pd.Series({'Project ID': 'project1'})
+        )
+        final_result = analysis.run()
+        return final_result, final_result['sensitivity'].set_index(['Module', 'Factor'])
+
+    def test_sobol(self):
+        """
+        For a + b / 4, a explains 16/17 of the variance and b 1/17. The
+        foundation cost does not vary, so its indices are 0.
+        """
+        final_result, sensitivity = self.analyze('sobol', 256)
+        self.assertEqual(len(final_result['extended_project_list']), 256 * 4)
+        for module in ['ErectionCost', 'Total']:
+            self.assertAlmostEqual(sensitivity.loc[(module, 'x/y/a'), 'First order'], 16 / 17, delta=0.03)
+            self.assertAlmostEqual(sensitivity.loc[(module, 'x/y/a'), 'Total order'], 16 / 17, delta=0.03)
+            self.assertAlmostEqual(sensitivity.loc[(module, 'x/y/b'), 'First order'], 1 / 17, delta=0.03)
+            self.assertAlmostEqual(sensitivity.loc[(module, 'x/y/b'), 'Total order'], 1 / 17, delta=0.03)
+        self.assertTrue((sensitivity.loc['FoundationCost'] == 0).all().all())
+
+    def test_morris(self):
+        """
+        The elementary effects of a linear cost are its slopes over the
+        range of each factor.
+        """
+        final_result, sensitivity = self.analyze('morris', 10)
+        self.assertEqual(len(final_result['extended_project_list']), 10 * 3)
+        np.testing.assert_allclose(sensitivity.loc['ErectionCost', 'Mu'], [4000, 1000])
+        np.testing.assert_allclose(sensitivity.loc['ErectionCost', 'Mu star'], [4000, 1000])
+        np.testing.assert_allclose(sensitivity.loc['ErectionCost', 'Sigma'], [0, 0], atol=1e-9)
+        np.testing.assert_allclose(sensitivity.loc['FoundationCost', 'Mu star'], [0, 0])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            SensitivityAnalysis(linear_cost_runner(), 'project1', {'x/y/a': (0, 1)}, method='fast')
+
+    def test_design_stays_within_the_ranges(self):
+        """
+        Every run of either design should have values between the Min and
+        Max of each factor, for any even number of levels.
+        """
+        factors = {'x/y/a': (10, 20), 'x/y/b': (-1, 1)}
+        runs = [self.analyze('sobol', 16, factors=factors)[0]['extended_project_list']]
+        runs += [self.analyze('morris', 20, levels=levels, factors=factors)[0]['extended_project_list']
+                 for levels in [2, 4, 6]]
+        for extended_project_list in runs:
+            for cell_specification, (low, high) in factors.items():
+                self.assertTrue(extended_project_list[cell_specification].between(low, high).all())
+
+    def test_odd_levels(self):
+        with self.assertRaises(ValueError):
+            SensitivityAnalysis(linear_cost_runner(), 'project1', {'x/y/a': (0, 1)}, method='morris', levels=3)
+
+    def test_missing_runs(self):
+        """
+        A run without costs should be an error rather than a cost of 0.
+        """
+        class MissingRunRunner(FakeManagerRunner):
+            def run_extended_project_list(self, extended_project_list_chunks, enable_cost_and_scaling_modifications=False):
+                final_result = super().run_extended_project_list(extended_project_list_chunks)
+                final_result['module_type_operation_list'] = \
+                    fake_cost_records(final_result['extended_project_list'].iloc[1:], self.module_costs)
+                return final_result
+
+        manager_runner = MissingRunRunner(module_costs={'ErectionCost': lambda project_parameters: 1.0})
+        with self.assertRaises(ValueError):
+            self.analyze('sobol', 4, manager_runner=manager_runner)
+
+    def test_missing_module_costs(self):
+        """
+        The cost of a module that a project has no costs for should be NaN,
+        and so should its total.
+        """
+        both = pd.DataFrame({'Project ID with serial': ['project1_0']})
+        erection_only = pd.DataFrame({'Project ID with serial': ['project1_1']})
+        module_costs = _module_costs(CostRecords.concatenate([
+            fake_cost_records(both, {'ErectionCost': lambda row: 1.0, 'FoundationCost': lambda row: 2.0}),
+            fake_cost_records(erection_only, {'ErectionCost': lambda row: 1.0}),
+        ]))
+        self.assertEqual(module_costs.loc['project1_0', 'Total'], 3.0)
+        self.assertTrue(np.isnan(module_costs.loc['project1_1', 'FoundationCost']))
+        self.assertTrue(np.isnan(module_costs.loc['project1_1', 'Total']))
@@ -0,0 +1,45 @@
+import os
+import tempfile
+from unittest import TestCase, mock, skipUnless
+
+from landbosse.excelio import XlsxFileOperations, XlsxGenerator
+from .test_ResultSink import make_project_records
+
+try:
+    import openpyxl
+    openpyxl_installed = True
+except ImportError:
+    openpyxl_installed = False
+
+
+@skipUnless(openpyxl_installed, 'openpyxl is not installed')
+class TestXlsxGeneratorDetails(TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        environ = mock.patch.dict(os.environ, {'LANDBOSSE_OUTPUT_DIR': self.output_dir.name})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.addCleanup(self.output_dir.cleanup)
+
+    def test_details_batches_are_sharded_across_sheets(self):
+        """
+        Details written in batches should continue on details_2, details_3
+        and so on when a sheet is full, with numbers as numbers and blanks
+        where a row has no number or no text.
+        """
+        batches = [make_project_records(f'Project_{i}')[1] for i in range(3)]
+        file_ops = XlsxFileOperations()
+
+        with XlsxGenerator('landbosse-output', file_ops, constant_memory=True) as xlsx:
+            xlsx.max_rows_per_sheet = 3  # The header and two rows
+            xlsx.tab_details(rows=iter(batches))
+
+        workbook = openpyxl.load_workbook(xlsx.output_xlsx_path, read_only=True)
+        self.assertEqual(workbook.sheetnames, ['details', 'details_2', 'details_3'])
+        for sheet_number, sheet_name in enumerate(workbook.sheetnames):
+            rows = list(workbook[sheet_name].iter_rows(values_only=True))
+            self.assertEqual(rows[0][0], 'Project ID with serial')
+            self.assertEqual(rows[1], (f'Project_{sheet_number}', 'SubstationCost', 'variable', 'Road width', 'm', 6, None))
+            self.assertEqual(rows[2], (f'Project_{sheet_number}', 'SubstationCost', 'list', 'Cables', None, None, '[1, 2]'))
+        workbook.close()
@@ -0,0 +1,189 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import XlsxReader
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestXlsxReaderParametrics(TestCase):
+
+    def setUp(self):
+        """
+        The project and parametric lists in the docstrings of
+        XlsxReader.create_parametric_value_list() and
+        XlsxReader.outer_join_projects_to_parametric_values()
+        """
+        self.project_list = pd.DataFrame({
+            'Project ID': ['project1', 'project2', 'project3'],
+            'Project data file': ['project1_data', 'project2_data', 'project3_data'],
+            'Total project construction time months': [9, 9, 9],
+        })
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'project1', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 12, 'Step': 6},
+            {'Project ID': 'project1', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': 0, 'Max': 12, 'Step': 6},
+            {'Project ID': 'project2', 'Dataframe name': 'gamma', 'Row name': 'dogs', 'Column name': 'cats',
+             'Min': 21, 'Max': 27, 'Step': 3},
+        ])
+
+    def test_iter_extended_project_list_matches_outer_join(self):
+        """
+        For any chunk size, the chunks should concatenate to the outer join
+        of the project list and the whole parametric value list.
+        """
+        xlsx_reader = XlsxReader()
+        parametric_value_list = xlsx_reader.create_parametric_value_list(self.parametric_list)
+        expected = xlsx_reader.outer_join_projects_to_parametric_values(self.project_list, parametric_value_list)
+        self.assertEqual(list(expected['Project ID with serial'].iloc[[0, 8, 9]]), ['project1_00', 'project1_08', 'project2_09'])
+
+        for chunk_size in [1, 4, 9, 100]:
+            chunks = list(xlsx_reader.iter_extended_project_list(self.project_list, self.parametric_list, chunk_size))
+            self.assertTrue(all(len(chunk) <= chunk_size for chunk in chunks))
+            pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_dtype=False)
+
+    def test_iter_extended_project_list_without_parametrics(self):
+        """
+        Without a parametric list, every project should have one row and
+        no serial number.
+        """
+        chunks = list(XlsxReader().iter_extended_project_list(self.project_list, pd.DataFrame(), chunk_size=2))
+        extended_project_list = pd.concat(chunks)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(list(extended_project_list['Project ID']), ['project1', 'project2', 'project3'])
+        self.assertTrue(extended_project_list['Project ID with serial'].isnull().all())
+
+
+class TestXlsxReaderCellModifications(TestCase):
+
+    def setUp(self):
+        self.project_data_dataframes = {
+            'crew_price': pd.DataFrame({
+                'Crew type ID': ['Operator', 'Oiler', 'Operator'],
+                'Hourly rate USD per hour': [100.0, 50.0, 100.0],
+            }),
+        }
+        self.project_parameters = pd.Series({
+            'Project ID': 'project1',
+            'Hub height m': 80,
+            'crew_price/Operator/Hourly rate USD per hour': 120.0,
+            'project list/x/Hub height m': 90,
+            'crew_price/Oiler/Hourly rate USD per hour': float('nan'),
+        })
+
+    def test_modifications(self):
+        """
+        Every row named by a cell specification should change, and values
+        that are NaN should not change anything.
+        """
+        XlsxReader().modify_project_data_and_project_list(self.project_data_dataframes, self.project_parameters,
+                                                         'project1_data')
+        self.assertEqual(list(self.project_data_dataframes['crew_price']['Hourly rate USD per hour']), [120.0, 50.0, 120.0])
+        self.assertEqual(self.project_parameters['Hub height m'], 90)
+
+    def test_cells_are_located_once_per_project_data_file(self):
+        """
+        The positions found for the first project should be used for the
+        next project with the same project data file.
+        """
+        xlsx_reader = XlsxReader()
+        xlsx_reader.modify_project_data_and_project_list(self.project_data_dataframes, self.project_parameters.copy(),
+                                                         'project1_data')
+        self.assertEqual(len(xlsx_reader._cell_positions), 1)
+
+        project_data_dataframes = {'crew_price': self.project_data_dataframes['crew_price'].copy()}
+        project_parameters = self.project_parameters.copy()
+        project_parameters['crew_price/Operator/Hourly rate USD per hour'] = 130.0
+        xlsx_reader.modify_project_data_and_project_list(project_data_dataframes, project_parameters, 'project1_data')
+        self.assertEqual(len(xlsx_reader._cell_positions), 1)
+        self.assertEqual(list(project_data_dataframes['crew_price']['Hourly rate USD per hour']), [130.0, 50.0, 130.0])
+
+    def test_missing_cells(self):
+        for cell_specification in ['crew_price/Welder/Hourly rate USD per hour', 'crew_price/Operator/Daily rate',
+                                   'crane_specs/Operator/Hourly rate USD per hour', 'project list/x/Rotor diameter m']:
+            project_parameters = pd.Series({'Project ID': 'project1', cell_specification: 1.0})
+            with self.assertRaises(XlsxOperationException):
+                XlsxReader().modify_project_data_and_project_list(self.project_data_dataframes, project_parameters)
+
+    def test_project_list_modifications(self):
+        """
+        Project list cell specifications should be applied to every row of
+        an extended project list at once, and match the modifications made
+        one row at a time.
+        """
+        extended_project_list = pd.DataFrame([self.project_parameters] * 3).reset_index(drop=True)
+        extended_project_list['project list/x/Hub height m'] = [90, None, 110]
+        modified_project_list = XlsxReader().modify_project_list(extended_project_list)
+        self.assertEqual(list(modified_project_list['Hub height m']), [90, 80, 110])
+        self.assertEqual(list(extended_project_list['Hub height m']), [80, 80, 80])
+
+        for _, project_parameters in extended_project_list.iterrows():
+            XlsxReader().modify_project_data_and_project_list(self.project_data_dataframes, project_parameters)
+            self.assertEqual(project_parameters['Hub height m'], modified_project_list.loc[project_parameters.name, 'Hub height m'])
+
+    def test_project_list_modifications_in_chunks(self):
+        """
+        Modifying an extended project list in chunks should give the same
+        values and types as modifying all of it, also for chunks whose
+        rows are not modified.
+        """
+        extended_project_list = pd.DataFrame([self.project_parameters] * 4).reset_index(drop=True)
+        extended_project_list['project list/x/Hub height m'] = [None, None, 110, None]
+        modified_project_list = XlsxReader().modify_project_list(extended_project_list)
+        for rows in (slice(0, 2), slice(2, 4)):
+            modified_chunk = XlsxReader().modify_project_list(extended_project_list.iloc[rows])
+            pd.testing.assert_frame_equal(modified_chunk, modified_project_list.iloc[rows])
+
+    def test_missing_project_list_column(self):
+        extended_project_list = pd.DataFrame({'Project ID': ['project1', 'project2'],
+                                              'project list/x/Rotor diameter m': [None, 100.0]})
+        with self.assertRaises(XlsxOperationException):
+            XlsxReader().modify_project_list(extended_project_list)
+
+        # Without values, the cell specification changes nothing.
+        extended_project_list['project list/x/Rotor diameter m'] = None
+        pd.testing.assert_frame_equal(XlsxReader().modify_project_list(extended_project_list), extended_project_list)
+
+
+class TestXlsxReaderCostAndScalingModifications(TestCase):
+
+    def test_extended_project_list_matches_project_parameters(self):
+        """
+        The modifications of a whole extended project list should be those
+        of each row, on both sides of the 20 MW and 40 MW breakpoints.
+        """
+        extended_project_list = pd.DataFrame({
+            'Number of turbines': [5, 20, 100],
+            'Turbine rating MW': [1.5, 1.5, 2.5],
+            'Hub height m': [80, 90, 100],
+            'Flag for user-defined home run trench length (0 = no; 1 = yes)': [0, 1, 1],
+            'Combined Homerun Trench Length to Substation (km)': [1.0, 1.0, 1.0],
+        })
+        xlsx_reader = XlsxReader()
+        expected = []
+        for _, project_parameters in extended_project_list.iterrows():
+            xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+            expected.append(project_parameters)
+        xlsx_reader.apply_cost_and_scaling_modifications_to_extended_project_list(extended_project_list)
+        pd.testing.assert_frame_equal(extended_project_list, pd.DataFrame(expected), check_dtype=False)
+        self.assertEqual(list(extended_project_list['New Switchyard (y/n)']), ['n', 'n', 'y'])
+
+
+class TestXlsxReaderLaborMultiplier(TestCase):
+
+    def test_labor_multiplier(self):
+        """
+        Only labor rates in rsmeans should be multiplied, and both rates in
+        crew_price.
+        """
+        project_data_dict = {
+            'crew_price': pd.DataFrame({'Labor type ID': ['Operator'], 'Hourly rate USD per hour': [100.0],
+                                        'Per diem USD per day': [10.0]}),
+            'rsmeans': pd.DataFrame({'Module': ['Foundations'] * 3, 'Type of cost': ['Labor', 'Equipment', None],
+                                     'Rate USD per unit': [10.0, 20.0, 30.0], 'Units': ['day'] * 3}),
+        }
+        XlsxReader().apply_labor_multiplier_to_project_data_dict(project_data_dict, 1.5)
+        self.assertEqual(project_data_dict['crew_price'].iloc[0, 1:].tolist(), [150.0, 15.0])
+        self.assertEqual(list(project_data_dict['rsmeans']['Rate USD per unit']), [15.0, 20.0, 30.0])
+        self.assertEqual(project_data_dict['rsmeans'].columns[-1], 'Rate USD per unit')
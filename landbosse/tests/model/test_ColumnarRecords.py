@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import DetailRecords, DetailRecordsBuilder
+
+
+class TestDetailRecordsBuilder(TestCase):
+
+    def setUp(self):
+        self.cost_df = pd.DataFrame([
+            ['Labor', 1000.25, 'Erection'],
+            ['Materials', 2000.0, 'Erection'],
+        ], columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+
+    def test_numbers_and_text_go_in_typed_columns(self):
+        """
+        Numbers should be stored only in numeric_value and text only in
+        non_numeric_value, without any type detection.
+        """
+        details = DetailRecordsBuilder()
+        details.add_number('Road width', 6, unit='m')
+        details.add_text('Cables', '[1, 2]', row_type='list')
+        records = details.build('Project_1', 'SitePreparationCost')
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records['numeric_value'][0], 6.0)
+        self.assertIsNone(records['non_numeric_value'][0])
+        self.assertTrue(np.isnan(records['numeric_value'][1]))
+        self.assertEqual(records['non_numeric_value'][1], '[1, 2]')
+        self.assertEqual(list(records['type']), ['variable', 'list'])
+        self.assertEqual(list(records['project_id_with_serial']), ['Project_1', 'Project_1'])
+
+    def test_cost_dataframe_rows(self):
+        """
+        Each row of a cost dataframe should become one detail row with the
+        cost rounded up in the text and unrounded in the numeric value.
+        """
+        details = DetailRecordsBuilder()
+        details.add_cost_dataframe(self.cost_df)
+        records = details.build('Project_1', 'ErectionCost')
+
+        self.assertEqual(list(records['non_numeric_value']),
+                         ['Labor <--> Erection <--> 1001', 'Materials <--> Erection <--> 2000'])
+        self.assertEqual(list(records['numeric_value']), [1000.25, 2000.0])
+        self.assertEqual(list(records['type']), ['dataframe', 'dataframe'])
+
+    def test_concatenate(self):
+        """
+        Records of several projects should concatenate in order, skipping
+        empty records.
+        """
+        first = DetailRecordsBuilder()
+        first.add_number('a', 1)
+        second = DetailRecordsBuilder()
+        second.add_cost_dataframe(self.cost_df)
+        records = DetailRecords.concatenate([
+            first.build('Project_1', 'FoundationCost'),
+            DetailRecordsBuilder().build('Project_2', 'FoundationCost'),
+            second.build('Project_3', 'FoundationCost'),
+        ])
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(list(records['project_id_with_serial']), ['Project_1', 'Project_3', 'Project_3'])
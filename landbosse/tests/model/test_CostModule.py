@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model.CostModule import CostTableBuilder
+
+
+class TestCostTableBuilder(TestCase):
+
+    def test_rows_and_dataframes(self):
+        """
+        Rows and dataframes should come out in the order they were added,
+        with the cost table columns, and the sum of a column should be the
+        same before and after the dataframe is built.
+        """
+        builder = CostTableBuilder()
+        builder.add_row('Labor', 100.0, 'Erection')
+        builder.add_row('Equipment rental', 50.0, 'Erection')
+        builder.add_dataframe(pd.DataFrame({
+            'Type of cost': ['Materials'],
+            'Cost USD': [25.0],
+            'Phase of construction': ['Foundations'],
+        }))
+        builder.add_row('Mobilization', 10.0, 'Erection')
+
+        self.assertEqual(len(builder), 4)
+        self.assertEqual(builder.column_sum('Cost USD'), 185.0)
+
+        df = builder.to_dataframe()
+        self.assertEqual(list(df.columns), ['Type of cost', 'Cost USD', 'Phase of construction'])
+        self.assertEqual(list(df['Type of cost']), ['Labor', 'Equipment rental', 'Materials', 'Mobilization'])
+        self.assertEqual(df['Cost USD'].sum(), 185.0)
+        self.assertEqual(builder.column_sum('Cost USD'), 185.0)
+
+    def test_other_columns(self):
+        """
+        A builder can make any columns. Dataframes with different columns
+        are joined on the union of their columns.
+        """
+        builder = CostTableBuilder(columns=['Operation', 'Time hours'], sort=True)
+        builder.add_row('Offload', 2.0)
+        builder.add_dataframe(pd.DataFrame({'Operation': ['Top'], 'Time hours': [3.0], 'Crane': ['LR1500']}))
+
+        self.assertEqual(builder.column_sum('Time hours'), 5.0)
+        df = builder.to_dataframe()
+        self.assertEqual(list(df.columns), ['Crane', 'Operation', 'Time hours'])
+        self.assertTrue(pd.isnull(df['Crane'].iloc[0]))
+
+    def test_empty(self):
+        builder = CostTableBuilder()
+        self.assertEqual(builder.column_sum('Cost USD'), 0)
+        df = builder.to_dataframe()
+        self.assertEqual(len(df), 0)
+        self.assertEqual(list(df.columns), ['Type of cost', 'Cost USD', 'Phase of construction'])
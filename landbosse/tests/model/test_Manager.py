@@ -0,0 +1,79 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from landbosse.model import Manager, SubstationCost
+
+
+def execute_substation_only(manager, project_name):
+    """
+    Stands in for Manager.execute_landbosse() with only SubstationCost,
+    whose inputs are small enough to write out here.
+    """
+    manager.run_cost_module(SubstationCost, project_name)
+    return 0
+
+
+class TestManagerGradient(TestCase):
+
+    def setUp(self):
+        self.input_dict = dict()
+        self.input_dict['interconnect_voltage_kV'] = 100
+        self.input_dict['project_size_megawatts'] = 20
+        self.input_dict['turbine_rating_MW'] = 1
+        self.input_dict['num_turbines'] = 20
+        self.input_dict['rotor_diameter_m'] = 77
+        self.input_dict['hub_height_meters'] = 80
+
+    @patch.object(Manager, 'execute_landbosse', execute_substation_only)
+    def test_gradient(self):
+        """
+        The derivative by the interconnect voltage should match separate
+        runs, and the run with a changed hub height, which SubstationCost
+        does not read, should be restored from the base run.
+        """
+        output_dict = dict()
+        gradient = Manager(dict(self.input_dict), output_dict).execute_landbosse_gradient(
+            'Project_1', ['interconnect_voltage_kV', 'hub_height_meters'], relative_step=0.01)
+
+        base_output_dict = dict()
+        SubstationCost(input_dict=dict(self.input_dict), output_dict=base_output_dict, project_name='Project_1').run_module()
+        perturbed_input_dict = dict(self.input_dict, interconnect_voltage_kV=101)
+        perturbed_output_dict = dict()
+        SubstationCost(input_dict=perturbed_input_dict, output_dict=perturbed_output_dict, project_name='Project_1').run_module()
+        expected = (perturbed_output_dict['total_substation_cost']['Cost USD'].sum() -
+                    base_output_dict['total_substation_cost']['Cost USD'].sum())
+
+        jacobian = gradient['jacobian']
+        self.assertEqual(list(jacobian.index), ['SubstationCost', 'Total'])
+        self.assertAlmostEqual(jacobian.loc['SubstationCost', 'interconnect_voltage_kV'], expected)
+        self.assertEqual(jacobian.loc['Total', 'hub_height_meters'], 0)
+        self.assertEqual(gradient['steps']['hub_height_meters'], 0.8)
+        self.assertEqual(gradient['module_cache_hits'], 1)
+        self.assertFalse(gradient['crane_selection_changed'].any())
+        self.assertIn('total_substation_cost', output_dict)
+
+    @patch.object(Manager, 'execute_landbosse', execute_substation_only)
+    def test_gradient_by_turbine_rating(self):
+        """
+        The project size is calculated from the turbine rating, so the
+        derivative by the turbine rating should match a run at the
+        perturbed rating and project size.
+        """
+        gradient = Manager(dict(self.input_dict), dict()).execute_landbosse_gradient(
+            'Project_1', ['turbine_rating_MW'], relative_step=0.01)
+
+        costs = []
+        for turbine_rating_MW in [1, 1.01]:
+            input_dict = dict(self.input_dict, turbine_rating_MW=turbine_rating_MW,
+                              project_size_megawatts=20 * turbine_rating_MW)
+            output_dict = dict()
+            SubstationCost(input_dict=input_dict, output_dict=output_dict, project_name='Project_1').run_module()
+            costs.append(output_dict['total_substation_cost']['Cost USD'].sum())
+
+        derivative = gradient['jacobian'].loc['Total', 'turbine_rating_MW']
+        self.assertGreater(derivative, 0)
+        self.assertAlmostEqual(derivative, (costs[1] - costs[0]) / 0.01, delta=1e-6 * abs(derivative))
+
+    def test_calculated_inputs_cannot_be_differentiated_by(self):
+        with self.assertRaises(ValueError):
+            Manager(dict(self.input_dict), dict()).execute_landbosse_gradient('Project_1', ['project_size_megawatts'])
@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from landbosse.model import SubstationCost, ModuleOutputCache
+
+
+class TestModuleOutputCache(TestCase):
+
+    def setUp(self):
+        self.input_dict = dict()
+        self.input_dict['interconnect_voltage_kV'] = 1
+        self.input_dict['project_size_megawatts'] = 1
+        self.input_dict['turbine_rating_MW'] = 1
+        self.input_dict['num_turbines'] = 20
+        self.input_dict['rotor_diameter_m'] = 77
+        self.module_cache = ModuleOutputCache()
+
+    def test_unchanged_inputs_reuse_outputs(self):
+        """
+        The second run with the same inputs should be restored from the
+        cache, relabelled with the new project name.
+        """
+        first_output_dict = dict()
+        self.module_cache.run_module(SubstationCost, self.input_dict, first_output_dict, 'Project_1')
+        second_output_dict = dict()
+        result = self.module_cache.run_module(SubstationCost, self.input_dict, second_output_dict, 'Project_2')
+
+        self.assertEqual(result, (0, 0))
+        self.assertEqual(self.module_cache.hits, 1)
+        self.assertEqual(self.module_cache.misses, 1)
+        self.assertEqual(first_output_dict.keys(), second_output_dict.keys())
+        self.assertTrue(first_output_dict['total_substation_cost'].equals(second_output_dict['total_substation_cost']))
+        for row in second_output_dict['substation_module_type_operation']:
+            self.assertEqual(row['project_id_with_serial'], 'Project_2')
+
+    def test_changed_inputs_rerun_module(self):
+        """
+        Changing an input the module reads should run the module again.
+        """
+        first_output_dict = dict()
+        self.module_cache.run_module(SubstationCost, self.input_dict, first_output_dict, 'Project_1')
+        self.input_dict['interconnect_voltage_kV'] = 2
+        second_output_dict = dict()
+        self.module_cache.run_module(SubstationCost, self.input_dict, second_output_dict, 'Project_2')
+
+        self.assertEqual(self.module_cache.hits, 0)
+        self.assertEqual(self.module_cache.misses, 2)
+        self.assertFalse(first_output_dict['total_substation_cost'].equals(second_output_dict['total_substation_cost']))
+
+    def test_unrelated_inputs_do_not_rerun_module(self):
+        """
+        Changing an input the module does not read should not run it again.
+        """
+        self.module_cache.run_module(SubstationCost, self.input_dict, dict(), 'Project_1')
+        self.input_dict['hub_height_meters'] = 100
+        self.module_cache.run_module(SubstationCost, self.input_dict, dict(), 'Project_2')
+
+        self.assertEqual(self.module_cache.hits, 1)
@@ -52,4 +52,37 @@ class TestSubstationCost(TestCase):
                 if isinstance(value, pd.DataFrame):
                     print('\nNow printing DataFrame ->', key, ':\n', value)
                 else:
-                    print(key, ':', value)
\ No newline at end of file
+                    print(key, ':', value)
+
+
+class TestSubstationCostDetailLevel(TestCase):
+
+    def setUp(self):
+        self.input_dict = dict()
+        self.input_dict['interconnect_voltage_kV'] = 1
+        self.input_dict['project_size_megawatts'] = 1
+        self.input_dict['turbine_rating_MW'] = 1
+        self.input_dict['num_turbines'] = 1
+        self.input_dict['rotor_diameter_m'] = 77
+
+    def test_no_details_at_detail_level_none(self):
+        """
+        At the 'none' detail level, the module should calculate its costs
+        but not make its details.
+        """
+        self.input_dict['detail_level'] = 'none'
+        output_dict = dict()
+        result = SubstationCost(input_dict=self.input_dict, output_dict=output_dict, project_name='Project_1').run_module()
+        self.assertEqual(result, (0, 0))
+        self.assertIn('substation_module_type_operation', output_dict)
+        self.assertNotIn('substation_cost_csv', output_dict)
+
+    def test_details_at_detail_level_summary(self):
+        """
+        At the 'summary' detail level, the cost table should be in the
+        details.
+        """
+        self.input_dict['detail_level'] = 'summary'
+        output_dict = dict()
+        SubstationCost(input_dict=self.input_dict, output_dict=output_dict, project_name='Project_1').run_module()
+        self.assertEqual(len(output_dict['substation_cost_csv']), len(output_dict['total_substation_cost']))
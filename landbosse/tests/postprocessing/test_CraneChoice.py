@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.postprocessing import extract_crane_choice, pivot_crane_selection
+from landbosse.postprocessing.CraneChoice import CRANE_CHOICE, CRANE_DATA_OUTPUT, CRANE_COST_DETAILS
+
+
+def erection_details(project_id_with_serial, operations, hub_height):
+    rows = []
+    for operation, crew, boom, total_cost in operations:
+        concat = f'{crew}-{boom}-{operation}'
+        rows.extend([
+            (CRANE_CHOICE, np.nan, f'{crew} - {boom} - {operation}'),
+            (CRANE_DATA_OUTPUT, 1.5, f'{concat} - Wind multiplier - 1.5'),
+            (CRANE_DATA_OUTPUT, 40.0, f'{concat} - Operation time all turbines hrs - 40.0'),
+            (CRANE_DATA_OUTPUT, total_cost, f'{concat} - Total cost USD - {total_cost}'),
+            (CRANE_COST_DETAILS, total_cost, f'{concat} - Total cost USD - {total_cost}'),
+        ])
+    df = pd.DataFrame(rows, columns=['Variable name', 'Numeric value', 'Non-numeric value'])
+    df.insert(0, 'Module', 'ErectionCost')
+    df.insert(0, 'Project ID with serial', project_id_with_serial)
+    df['Hub height m'] = hub_height
+    return df
+
+
+class TestExtractCraneChoice(TestCase):
+
+    def test_crane_choices_of_all_projects(self):
+        """
+        Each project should get one row, with missing values for the
+        operations it does not have.
+        """
+        details = pd.concat([
+            erection_details('Project_1', [('Offload', 'LB 75', 'Hydraulic', 100.0), ('Top', 'LR1500', 'SL3F', 300.0)], 80),
+            erection_details('Project_2', [('Base', 'LR 11350', 'SL3F', 200.0), ('Offload', 'LB 75', 'Hydraulic', 110.0),
+                                           ('Top', 'LR1500', 'SL3F', 310.0)], 100),
+        ])
+        # Details of other modules are ignored.
+        details = pd.concat([details, pd.DataFrame({
+            'Project ID with serial': ['Project_3'],
+            'Module': ['FoundationCost'],
+            'Variable name': [CRANE_CHOICE],
+            'Numeric value': [np.nan],
+            'Non-numeric value': ['A - B - Top'],
+        })])
+
+        crane_choice = extract_crane_choice(details)
+
+        self.assertEqual(list(crane_choice['Project ID with serial']), ['Project_1', 'Project_2'])
+        self.assertEqual(list(crane_choice['Hub height m']), [80, 100])
+        self.assertEqual(list(crane_choice['Top crane choice']), ['LR1500 SL3F', 'LR1500 SL3F'])
+        self.assertEqual(list(crane_choice['Offload crane choice']), ['LB 75 Hydraulic', 'LB 75 Hydraulic'])
+        self.assertTrue(pd.isnull(crane_choice['Base crane choice'][0]))
+        self.assertEqual(crane_choice['Base crane choice'][1], 'LR 11350 SL3F')
+        self.assertEqual(list(crane_choice['Top total cost']), [300.0, 310.0])
+        self.assertTrue(np.isnan(crane_choice['Base total cost'][0]))
+        self.assertEqual(list(crane_choice['Offload wind multiplier']), [1.5, 1.5])
+        self.assertEqual(list(crane_choice['Base operation time all turbines (hours)'].fillna(0)), [0.0, 40.0])
+
+
+class TestPivotCraneSelection(TestCase):
+
+    def test_crane_selection_matches_details(self):
+        """
+        The crane selection output should give the same crane columns as
+        the details it summarizes.
+        """
+        operations = [('Base', 'LR 11350', 'SL3F', 200.0), ('Offload', 'LB 75', 'Hydraulic', 110.0), ('Top', 'LR1500', 'SL3F', 310.0)]
+        crane_selection = pd.DataFrame({
+            'Project ID with serial': 'Project_1',
+            'Operation': [operation[0] for operation in operations],
+            'Crane name': [operation[1] for operation in operations],
+            'Boom system': [operation[2] for operation in operations],
+            'Wind multiplier': 1.5,
+            'Operation time all turbines hrs': 40.0,
+            'Total cost USD': [operation[3] for operation in operations],
+            'Number of equipment': 1.0,
+        })
+
+        from_selection = pivot_crane_selection(crane_selection)
+        from_details = extract_crane_choice(erection_details('Project_1', operations, 80)).drop(columns=['Hub height m'])
+
+        pd.testing.assert_frame_equal(from_selection, from_details, check_dtype=False)
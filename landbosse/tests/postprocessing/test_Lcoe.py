@@ -0,0 +1,74 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import CostRecords
+from landbosse.postprocessing import LcoeCalculator
+
+
+def project_costs(project_id_with_serial, turbine_rating_MW, raw_cost):
+    return CostRecords.from_costs(
+        project_id_with_serial=project_id_with_serial,
+        module='SubstationCost',
+        operation_id='Substation',
+        type_of_cost=['Materials', 'Labor'],
+        raw_cost=raw_cost,
+        total_or_turbine=True,
+        turbine_rating_MW=turbine_rating_MW,
+        num_turbines=10,
+        rotor_diameter_m=100
+    )
+
+
+class TestLcoeCalculator(TestCase):
+
+    def setUp(self):
+        aep = pd.DataFrame({'Rating [kW]': [300.0, 3000.0], 'Rotor Diam [m]': [100.0, 100.0], 'AEP [kWh/yr]': [1e6, 1e7]})
+        tcc = pd.DataFrame({'Rating [kW]': [300.0, 3000.0], 'Rotor Diam [m]': [100.0, 100.0], 'TCC [USD/kW]': [1000.0, 800.0]})
+        self.lcoe_calculator = LcoeCalculator(aep, tcc, fcr=0.1, opex_usd_per_kw=50.0)
+
+    def test_lcoe_of_each_project(self):
+        """
+        The costs of each project should be summed and joined to the AEP
+        and TCC of its rating and rotor diameter. Projects not in the
+        tables are left out.
+        """
+        self.lcoe_calculator.add_costs(CostRecords.concatenate([
+            project_costs('Project_1', 3.0, [1e6, 2e6]),
+            project_costs('Project_2', 0.1 * 3, [1e5, 1e5]),
+        ]))
+        self.lcoe_calculator.add_costs(project_costs('Project_3', 2.0, [1e6, 1e6]))
+
+        lcoe = self.lcoe_calculator.lcoe()
+
+        self.assertEqual(list(lcoe['Project ID with serial']), ['Project_1', 'Project_2'])
+        self.assertEqual(list(lcoe['BOS Capex [USD]']), [3e6, 2e5])
+        # (BOS capex + turbine capex) * FCR + opex, over the AEP of all the turbines
+        expected_1 = ((3e6 + 800 * 3000 * 10) * 0.1 + 50 * 3000 * 10) / (1e7 * 10)
+        expected_2 = ((2e5 + 1000 * 300 * 10) * 0.1 + 50 * 300 * 10) / (1e6 * 10)
+        self.assertAlmostEqual(lcoe['LCOE [USD/kW]'][0], expected_1)
+        self.assertAlmostEqual(lcoe['LCOE [USD/kW]'][1], expected_2)
+
+    def test_duplicate_table_rows(self):
+        aep = pd.DataFrame({'Rating [kW]': [300.0, 300.0], 'Rotor Diam [m]': [100.0, 100.0], 'AEP [kWh/yr]': [1e6, 2e6]})
+        tcc = pd.DataFrame({'Rating [kW]': [300.0], 'Rotor Diam [m]': [100.0], 'TCC [USD/kW]': [1000.0]})
+        with self.assertRaises(ValueError):
+            LcoeCalculator(aep, tcc)
+
+    def test_scaling_tables_are_selected(self):
+        """
+        Scaling tables with rows for several wind speeds and blade mass
+        exponents should be narrowed to the ones chosen.
+        """
+        aep = pd.DataFrame({'Rating [kW]': 3000.0, 'Rotor Diam [m]': 100.0, 'Wind Speed [m/s]': [5.0, 6.0], 'AEP [kWh/yr]': [1e7, 2e7]})
+        tcc = pd.DataFrame({'Rating [kW]': 3000.0, 'Rotor Diam [m]': 100.0, 'Blade Mass Exp': [1.7, 1.7 + 0.1 * 3], 'TCC [USD/kW]': [800.0, 900.0]})
+        with tempfile.TemporaryDirectory() as directory:
+            aep.to_csv(os.path.join(directory, 'aep.csv'), index=False)
+            tcc.to_csv(os.path.join(directory, 'tcc.csv'), index=False)
+            lcoe_calculator = LcoeCalculator.from_csv(os.path.join(directory, 'aep.csv'), os.path.join(directory, 'tcc.csv'),
+                                                      wind_speed_m_per_s=6.0, blade_mass_exp=2.0)
+
+        self.assertEqual(list(lcoe_calculator.aep_tcc['AEP [kWh/yr]']), [2e7])
+        self.assertEqual(list(lcoe_calculator.aep_tcc['TCC [USD/kW]']), [900.0])
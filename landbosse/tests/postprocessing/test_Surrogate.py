@@ -0,0 +1,88 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import CsvGenerator
+from landbosse.postprocessing import CostSurrogate
+from ..FakeManagerRunner import fake_cost_records
+
+
+def sweep(hub_heights, rotor_diameters):
+    """
+    An extended project list and costs where the erection cost is
+    quadratic in hub height and the foundation cost is linear in rotor
+    diameter.
+    """
+    extended_project_list = pd.DataFrame({
+        'Project ID': 'project1',
+        'Project ID with serial': [f'project1_{serial:02d}' for serial in range(len(hub_heights))],
+        'Hub height m': hub_heights,
+        'Rotor diameter m': rotor_diameters,
+        'Number of turbines': 10,
+    })
+    costs = fake_cost_records(extended_project_list, {
+        'ErectionCost': lambda row: 1000 + 2 * row['Hub height m'] ** 2,
+        'FoundationCost': lambda row: 500 + 30 * row['Rotor diameter m'],
+    })
+    return extended_project_list, costs
+
+
+class TestCostSurrogate(TestCase):
+
+    def setUp(self):
+        hub_heights, rotor_diameters = np.meshgrid([80.0, 90.0, 100.0, 110.0], [70.0, 80.0, 90.0])
+        self.extended_project_list, self.costs = sweep(hub_heights.ravel(), rotor_diameters.ravel())
+        self.new_points = pd.DataFrame({'Hub height m': [85.0, 105.0], 'Rotor diameter m': [75.0, 88.0]})
+
+    def test_polynomial(self):
+        """
+        A quadratic surrogate should fit quadratic costs, with small
+        errors, on the columns that change in the sweep.
+        """
+        surrogate = CostSurrogate(degree=2)
+        surrogate.fit(self.extended_project_list, self.costs)
+        predicted = surrogate.predict(self.new_points)
+
+        self.assertEqual(surrogate.input_columns, ['Hub height m', 'Rotor diameter m'])
+        np.testing.assert_allclose(predicted['ErectionCost [USD]'], [1000 + 2 * 85 ** 2, 1000 + 2 * 105 ** 2])
+        np.testing.assert_allclose(predicted['FoundationCost [USD]'], [500 + 30 * 75, 500 + 30 * 88])
+        np.testing.assert_allclose(predicted['Total [USD]'],
+                                   predicted['ErectionCost [USD]'] + predicted['FoundationCost [USD]'])
+        self.assertTrue((predicted['Total error [USD]'] < 1e-6).all())
+
+    def test_linear_errors(self):
+        """
+        A linear surrogate cannot fit the quadratic erection cost, so its
+        errors should be larger than those of the foundation cost.
+        """
+        surrogate = CostSurrogate(degree=1)
+        surrogate.fit(self.extended_project_list, self.costs)
+        predicted = surrogate.predict(self.new_points)
+        self.assertTrue((predicted['ErectionCost error [USD]'] > 10).all())
+        self.assertTrue((predicted['FoundationCost error [USD]'] < 1e-6).all())
+
+    def test_save_load_and_csv(self):
+        """
+        A surrogate trained from the .csv files should predict the same
+        after it is saved and loaded.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            extended_project_list_csv = os.path.join(output_dir, 'extended_project_list.csv')
+            costs_csv = os.path.join(output_dir, 'landbosse-costs.csv')
+            self.extended_project_list.to_csv(extended_project_list_csv, index=False)
+            CsvGenerator(None).create_costs_dataframe(self.costs).to_csv(costs_csv, index=False)
+
+            surrogate = CostSurrogate.from_csv(extended_project_list_csv, costs_csv, degree=2)
+            surrogate.save(os.path.join(output_dir, 'surrogate.pkl'))
+            loaded = CostSurrogate.load(os.path.join(output_dir, 'surrogate.pkl'))
+
+        pd.testing.assert_frame_equal(loaded.predict(self.new_points), surrogate.predict(self.new_points))
+
+    def test_predict_needs_the_input_columns(self):
+        surrogate = CostSurrogate()
+        surrogate.fit(self.extended_project_list, self.costs)
+        with self.assertRaises(ValueError):
+            surrogate.predict(self.new_points[['Hub height m']])
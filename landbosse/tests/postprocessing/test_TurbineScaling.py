@@ -0,0 +1,73 @@
+import os
+import tempfile
+from concurrent import futures
+from unittest import TestCase, mock
+
+from landbosse.postprocessing import TurbineScalingTableBuilder
+from landbosse.postprocessing import TurbineScaling
+
+
+class TestTurbineScalingTableBuilder(TestCase):
+    """
+    The points are calculated by a stub of calculate_scaling_points(), on
+    threads rather than processes, so that the stub sees which points are
+    calculated and WISDEM is not needed.
+    """
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temporary_directory.name, 'turbine-scaling-cache.csv')
+        self.calculated = []
+
+        def calculate_scaling_points(tasks):
+            self.calculated.extend(task[:4] for task in tasks)
+            return [rating + diameter + value + parameters['max_Cp'] for _, rating, diameter, value, parameters in tasks]
+
+        patches = [
+            mock.patch.object(TurbineScaling, 'calculate_scaling_points', calculate_scaling_points),
+            mock.patch.object(TurbineScaling.futures, 'ProcessPoolExecutor', futures.ThreadPoolExecutor),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def builder(self, machine_rating_kw=(1000, 2000), **turbine_parameters):
+        return TurbineScalingTableBuilder(self.cache_path, machine_rating_kw=machine_rating_kw, rotor_diameter_m=[100],
+                                          blade_mass_exp=[2.0, 2.2], wind_speed_m_per_s=[7.0], max_workers=2,
+                                          **turbine_parameters)
+
+    def test_first_build(self):
+        aep, tcc = self.builder().build()
+        self.assertEqual(len(self.calculated), 6)
+        self.assertTrue(os.path.exists(self.cache_path))
+        self.assertEqual(list(aep.columns), ['Rating [kW]', 'Rotor Diam [m]', 'Wind Speed [m/s]', 'AEP [kWh/yr]'])
+        self.assertEqual(list(tcc.columns), ['Rating [kW]', 'Rotor Diam [m]', 'Blade Mass Exp', 'TCC [USD/kW]'])
+        self.assertEqual(list(aep['AEP [kWh/yr]'].round(6)), [1107.49, 2107.49])
+        self.assertEqual(list(tcc['TCC [USD/kW]'].round(6)), [1102.49, 1102.69, 2102.49, 2102.69])
+
+    def test_rerun_calculates_nothing(self):
+        first_aep, first_tcc = self.builder().build()
+        self.calculated.clear()
+        aep, tcc = self.builder().build()
+        self.assertEqual(self.calculated, [])
+        self.assertTrue(aep.equals(first_aep))
+        self.assertTrue(tcc.equals(first_tcc))
+
+    def test_larger_grid_calculates_new_points(self):
+        self.builder().build()
+        self.calculated.clear()
+        aep, tcc = self.builder(machine_rating_kw=[1000, 2000, 3000]).build()
+        self.assertEqual(sorted(self.calculated), [('aep', 3000.0, 100.0, 7.0),
+                                                   ('tcc', 3000.0, 100.0, 2.0), ('tcc', 3000.0, 100.0, 2.2)])
+        self.assertEqual(len(aep), 3)
+        self.assertEqual(len(tcc), 6)
+
+    def test_changed_parameters_invalidate_cache(self):
+        self.builder().build()
+        self.calculated.clear()
+        aep, _ = self.builder(max_Cp=0.45).build()
+        self.assertEqual(len(self.calculated), 6)
+        self.assertEqual(list(aep['AEP [kWh/yr]'].round(6)), [1107.45, 2107.45])
@@ -8,6 +8,12 @@ from landbosse.excelio import XlsxParallelManagerRunner
 from landbosse.excelio import XlsxGenerator
 from landbosse.excelio import XlsxValidator
 from landbosse.excelio import CsvGenerator
+from landbosse.excelio import ParquetGenerator
+from landbosse.excelio import CsvResultSink
+from landbosse.excelio import SqliteResultSink
+from landbosse.excelio import DuckDbResultSink
+from landbosse.excelio import ParquetResultSink
+from landbosse.postprocessing import LcoeCalculator
 
 # LandBOSSE, small utility functions
 from landbosse.excelio import XlsxFileOperations
@@ -30,7 +36,45 @@ if __name__ == '__main__':
     # processes.
 
     run_parallel = True
-    manager_runner = XlsxParallelManagerRunner(file_ops) if run_parallel else XlsxSerialManagerRunner(file_ops)
+
+    # If run_incremental is True, the runner orders parametric projects so
+    # that consecutive projects differ in as few values as possible and only
+    # reruns the cost modules whose inputs changed. Outputs of the other
+    # modules are reused from the previous projects.
+    run_incremental = False
+
+    # detail_level sets how much of landbosse-details.csv is made: 'full'
+    # for everything, 'summary' for the scalar variables and cost tables of
+    # each module, or 'none' for no details at all. Cost sweeps that only
+    # need landbosse-costs.csv run faster with 'none'.
+    detail_level = 'full'
+
+    # If stream_results is True, the costs and details of each project are
+    # written to landbosse-costs and landbosse-details as soon as the project
+    # has run, instead of being held in memory until the end of the run.
+    # This bounds memory use for large parametric sweeps. stream_format is
+    # 'csv', 'parquet' (which needs pyarrow), 'sqlite' or 'duckdb' (which
+    # needs duckdb). The database formats also get the extended project list
+    # and views that join it onto the costs and details. The .xlsx output
+    # and validation need the results in memory, so they are skipped when
+    # streaming.
+    stream_results = False
+    stream_format = 'csv'
+
+    # If write_parquet is True, the costs and details are also written as
+    # Parquet datasets partitioned by Project ID and Module, along with
+    # extended_project_list.parquet. This needs pyarrow.
+    write_parquet = False
+
+    # If xlsx_details is True, the details are also written to the details
+    # tab of landbosse-output.xlsx. Details that do not fit on one Excel
+    # sheet continue on the details_2, details_3, ... tabs.
+    xlsx_details = False
+
+    # If calculate_lcoe is True, the LCOE of each project is calculated from
+    # its BOS costs as it runs, with the AEP and TCC tables in aep.csv and
+    # tcc.csv in the input folder, and written to landbosse-lcoe.csv.
+    calculate_lcoe = False
 
     # project_xlsx is the absolute path of the project_list.xlsx
     projects_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_list.xlsx')
@@ -41,13 +85,60 @@ if __name__ == '__main__':
     # Switch to either validation or non validation producing code.
     input_path, output_path, validation_enabled, enable_scaling_study = file_ops.get_input_output_paths_from_argv_or_env()
 
-    # final_result aggregates all the results from all the projects.
-    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study)
+    if stream_results and validation_enabled:
+        print('Validation needs the results in memory. Not streaming results.')
+        stream_results = False
 
-    # Write the extended_project_list, which has all the parametric values.
+    # The extended_project_list, which has all the parametric values. When
+    # streaming, it is written as the projects are prepared.
     extended_project_list_path = os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv')
+
+    if stream_results and stream_format == 'parquet':
+        result_sink = ParquetResultSink(file_ops.landbosse_output_dir(), extended_project_list_path=extended_project_list_path)
+    elif stream_results and stream_format == 'sqlite':
+        result_sink = SqliteResultSink(file_ops.landbosse_output_dir(), extended_project_list_path=extended_project_list_path)
+    elif stream_results and stream_format == 'duckdb':
+        result_sink = DuckDbResultSink(file_ops.landbosse_output_dir(), extended_project_list_path=extended_project_list_path)
+    elif stream_results:
+        result_sink = CsvResultSink(file_ops.landbosse_output_dir(), extended_project_list_path=extended_project_list_path)
+    else:
+        result_sink = None
+
+    if calculate_lcoe:
+        lcoe_calculator = LcoeCalculator.from_csv(
+            aep_csv=os.path.join(file_ops.landbosse_input_dir(), 'aep.csv'),
+            tcc_csv=os.path.join(file_ops.landbosse_input_dir(), 'tcc.csv')
+        )
+    else:
+        lcoe_calculator = None
+
+    if run_parallel:
+        manager_runner = XlsxParallelManagerRunner(file_ops, incremental=run_incremental, detail_level=detail_level,
+                                                   result_sink=result_sink, lcoe_calculator=lcoe_calculator)
+    else:
+        manager_runner = XlsxSerialManagerRunner(file_ops, incremental=run_incremental, detail_level=detail_level,
+                                                 result_sink=result_sink, lcoe_calculator=lcoe_calculator)
+
+    # final_result aggregates all the results from all the projects. When
+    # streaming, its costs, details and extended project list are empty.
+    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study)
+
+    # Write the extended_project_list, unless it was streamed.
     extended_project_list = final_result['extended_project_list']
-    extended_project_list.to_csv(extended_project_list_path, index=False)
+    if result_sink is None:
+        extended_project_list.to_csv(extended_project_list_path, index=False)
+
+    # Write the crane chosen for each operation of each project. This is
+    # written even when streaming, as it is only a few rows per project.
+    crane_selection = CsvGenerator(file_ops).create_crane_selection_dataframe(final_result['crane_selection_list'])
+    crane_selection.to_csv(os.path.join(file_ops.landbosse_output_dir(), 'landbosse-crane-selection.csv'), index=False)
+
+    if lcoe_calculator is not None:
+        final_result['lcoe'].to_csv(os.path.join(file_ops.landbosse_output_dir(), 'landbosse-lcoe.csv'), index=False)
+
+    if result_sink is not None:
+        result_sink.close()
+        print(f'Wrote {result_sink.costs_rows_written} cost rows and {result_sink.details_rows_written} detail rows')
 
     # Run validation or not depending on whether validation was enabled.
     if validation_enabled:
@@ -76,24 +167,33 @@ if __name__ == '__main__':
     # worksheet to the output .xlsx. Also, copy file input structure.
     print('Writing final output folder')
 
-    max_number_of_excel_rows = 1048576
-    if len(final_result['details_list']) > max_number_of_excel_rows:
-        print('WARNING: Details sheet in .xlsx has too many rows for Excel. Please use landbosse-details.csv instead.')
-        print('Writing .xlsx file for backwards compatability.')
-
-    with XlsxGenerator('landbosse-output', file_ops) as xlsx:
-        xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
+    if not stream_results:
+        with XlsxGenerator('landbosse-output', file_ops, constant_memory=True) as xlsx:
+            xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
+            if xlsx_details and detail_level != 'none':
+                xlsx.tab_details(rows=final_result['details_list'])
     file_ops.copy_input_data()
 
-    # Always write .csv versions of the output
-    csv_generator = CsvGenerator(file_ops)
-
-    costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
-    details = csv_generator.create_details_dataframe(final_result['details_list'])
-    costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
-    details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
-    costs.to_csv(costs_csv_filename, index=False)
-    details.to_csv(details_csv_filename, index=False)
+    # Write .csv versions of the output, unless they were streamed.
+    if not stream_results:
+        csv_generator = CsvGenerator(file_ops)
+
+        costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
+        costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
+        costs.to_csv(costs_csv_filename, index=False)
+
+        if detail_level != 'none':
+            details = csv_generator.create_details_dataframe(final_result['details_list'])
+            details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
+            details.to_csv(details_csv_filename, index=False)
+
+        if write_parquet:
+            parquet_generator = ParquetGenerator(file_ops)
+            parquet_generator.write_results(
+                costs=final_result['module_type_operation_list'],
+                details=final_result['details_list'],
+                extended_project_list=extended_project_list
+            )
 
     # Print end timestamp
     print(f'>>>>>>>> End run {datetime.now()} <<<<<<<<<<')
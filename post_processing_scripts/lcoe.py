@@ -1,45 +1,24 @@
 import pandas as pd
 
-if __name__ == '__main__':
-    # Select every row from the AEP and TCC files
-    aep = pd.read_csv('aep.csv')
-    tcc = pd.read_csv('tcc.csv')
-
-    # Select every row from the LandBOSSE output.
-    # Only select the needed columns, convert MW to kW and rename the columns
-    # to be consistent with the AEP and TCC data.
-    bos = pd.read_excel('landbosse-output.xlsx', 'costs_by_module_type_operation')
-    bos = bos[['Number of turbines', 'Turbine rating MW', 'Rotor diameter m', 'Cost per project']]
-    bos['Rating [kW]'] = bos['Turbine rating MW'] * 1000
-    bos.rename(columns={'Rotor diameter m': 'Rotor Diam [m]', 'Cost per project': 'BOS Capex [USD]'}, inplace=True)
-    bos.drop(columns=['Turbine rating MW'], inplace=True)
-
-    # Aggregate and sum BOS costs
-    bos_sum = bos.groupby(['Rating [kW]', 'Rotor Diam [m]', 'Number of turbines']).sum().reset_index()
-
-    # Inner join AEP and TCC. Taken together, Rating [kW] and Rotor Diam [m]
-    # are the key.
-    aep_tcc = aep.merge(tcc, on=['Rating [kW]', 'Rotor Diam [m]'])
+from landbosse.postprocessing import LcoeCalculator
 
-    # Then join in the BOS sum data, again using Rating [kW] and
-    # Rotor Diam [m] as keys. This dataframe will eventually have the
-    # LCOE as a column.
-    lcoe = aep_tcc.merge(bos_sum, on=['Rating [kW]', 'Rotor Diam [m]'])
-
-    # Create columns for FCR and Opex USD/kW
-    lcoe['FCR'] = 0.079
-    lcoe['Opex [USD/kW]'] = 52.0
-
-    # Now calculate LCOE and save the intermediate columns
-    lcoe['Total Opex [USD]'] = lcoe['Opex [USD/kW]'] * lcoe['Rating [kW]'] * lcoe['Number of turbines']
-    lcoe['Turbine Capex [USD]'] = lcoe['TCC [USD/kW]'] * lcoe['Rating [kW]'] * lcoe['Number of turbines']
-    capex_times_fcr = (lcoe['BOS Capex [USD]'] + lcoe['Turbine Capex [USD]']) * lcoe['FCR']
-    aep_all_turbines = lcoe['AEP [kWh/yr]'] * lcoe['Number of turbines']
-    lcoe['LCOE [USD/kW]'] = (capex_times_fcr + lcoe['Total Opex [USD]']) / aep_all_turbines
-
-    # Output an Excel spreadsheet with the results.
-    with pd.ExcelWriter('lcoe_analysis.xlsx', mode='w') as writer:
-        lcoe.to_excel(writer, sheet_name='LCOE', index=False)
-        bos.to_excel(writer, sheet_name='BOS', index=False)
-        aep.to_excel(writer, sheet_name='AEP', index=False)
-        tcc.to_excel(writer, sheet_name='TCC', index=False)
+if __name__ == '__main__':
+    # Read the AEP and TCC files. The calculator joins them and indexes them
+    # by Rating [kW] and Rotor Diam [m].
+    lcoe_calculator = LcoeCalculator.from_csv('aep.csv', 'tcc.csv', fcr=0.079, opex_usd_per_kw=52.0)
+
+    # Sum the BOS costs of each project in the LandBOSSE output. main.py can
+    # also calculate the LCOE during the run with its calculate_lcoe option.
+    costs = pd.read_csv('landbosse-costs.csv')
+    lcoe_calculator.add_project_costs(
+        project_id_with_serial=costs['Project ID with serial'],
+        num_turbines=costs['Number of turbines'],
+        turbine_rating_MW=costs['Turbine rating MW'],
+        rotor_diameter_m=costs['Rotor diameter m'],
+        cost_per_project=costs['Cost per project']
+    )
+
+    # Calculate LCOE and save the intermediate columns
+    lcoe = lcoe_calculator.lcoe()
+    lcoe.to_csv('lcoe_analysis.csv', index=False)
+    lcoe_calculator.bos_capex().to_csv('lcoe_bos_capex.csv', index=False)
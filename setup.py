@@ -30,6 +30,10 @@ setuptools.setup(
         'xlrd',
         'pytest'
     ],
+    extras_require={
+        'duckdb': ['duckdb'],
+        'parquet': ['pyarrow'],
+    },
     command_options={
             'build_sphinx': {
                 'project': ('setup.py', name),